@@ -0,0 +1,312 @@
+"""Headless benchmarks for the card canvas.
+
+Builds canvases of increasing size with synthetic card images and prints the
+results as JSON, so runs can be saved and compared over time:
+
+    just bench --output bench-$(git rev-parse --short HEAD).json
+"""
+
+import argparse
+import atexit
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Run without a display, and never touch the real user's settings or decks
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+_BENCH_HOME = Path(tempfile.mkdtemp(prefix="tarot-canvas-bench-"))
+atexit.register(shutil.rmtree, str(_BENCH_HOME), ignore_errors=True)
+os.environ["HOME"] = str(_BENCH_HOME)
+os.environ["XDG_CONFIG_HOME"] = str(_BENCH_HOME / ".config")
+os.environ["XDG_DATA_HOME"] = str(_BENCH_HOME / ".local" / "share")
+
+from PyQt6.QtCore import (  # noqa: E402
+    QT_VERSION_STR,
+    QEvent,
+    QEventLoop,
+    QObject,
+    QPointF,
+    QSettings,
+    Qt,
+    QTimer,
+)
+from PyQt6.QtGui import QColor, QImage, QPainter  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QGraphicsScene  # noqa: E402
+
+DEFAULT_SIZES = (10, 100, 1000, 5000)
+
+# Distinct card faces; cards beyond this share images, as they do in a real deck
+CARD_FACES = 78
+CARD_SIZE = (300, 500)
+
+FRAME_SIZE = (1280, 800)
+
+
+def make_cards(directory):
+    """Write synthetic card images and return card dictionaries pointing at them"""
+    cards = []
+    for index in range(CARD_FACES):
+        image = QImage(*CARD_SIZE, QImage.Format.Format_RGB32)
+        image.fill(QColor.fromHsv(index * 360 // CARD_FACES, 120, 200))
+        painter = QPainter(image)
+        painter.drawText(image.rect().adjusted(20, 20, -20, -20), 0, f"Card {index}")
+        painter.end()
+
+        path = directory / f"{index:02d}.png"
+        image.save(str(path))
+        cards.append({"name": f"Card {index}", "image": str(path)})
+    return cards
+
+
+def rss_bytes():
+    """Get the resident set size of this process, or None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def run_event_loop(seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(round(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def summarize(samples):
+    """Describe timings (in seconds) in milliseconds"""
+    return {
+        "median_ms": statistics.median(samples) * 1000,
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "min_ms": min(samples) * 1000,
+        "max_ms": max(samples) * 1000,
+    }
+
+
+class PaintCounter(QObject):
+    """Count paint events delivered to a widget"""
+
+    def __init__(self, widget):
+        super().__init__(widget)
+        self.count = 0
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            self.count += 1
+        return False
+
+
+def build_canvas(cards, count):
+    """Create a canvas tab holding `count` cards, added the way a deal adds them"""
+    from tarot_canvas.ui.canvas import CardAddCommand, arrange_items_in_grid
+    from tarot_canvas.ui.tabs.canvas_tab import CanvasTab
+
+    tab = CanvasTab()
+    items = [
+        tab.create_card_item(dict(cards[index % len(cards)]), autostart=False)
+        for index in range(count)
+    ]
+    arrange_items_in_grid(items, QPointF(0, 0))
+
+    tab.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+    try:
+        tab.undo_stack.push(CardAddCommand(tab.scene, items, f"Add {count} Cards"))
+    finally:
+        tab.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+    return tab, items
+
+
+def bench_construction(cards, count, repeats):
+    """Time building the canvas and measure the memory each card holds"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        tab, _items = build_canvas(cards, count)
+        times.append(time.perf_counter() - start)
+        teardown(tab)
+
+    rss_before = rss_bytes()
+    tracemalloc.start()
+    tab, items = build_canvas(cards, count)
+    python_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    rss_after = rss_bytes()
+
+    memory = {"python_bytes_per_card": python_bytes / count}
+    if rss_before is not None:
+        memory["rss_bytes_per_card"] = max(0, rss_after - rss_before) / count
+    return tab, items, summarize(times), memory
+
+
+def bench_render(tab, frames, fit_all):
+    """Time rendering the view into an image the size of a typical window"""
+    view = tab.view
+    view.resize(*FRAME_SIZE)
+    view.resetTransform()
+    if fit_all:
+        view.fitInView(tab.scene.itemsBoundingRect(), Qt.AspectRatioMode.KeepAspectRatio)
+    else:
+        view.centerOn(0, 0)
+    view.finish_interaction()
+
+    image = QImage(*FRAME_SIZE, QImage.Format.Format_ARGB32_Premultiplied)
+    times = []
+    for _ in range(frames + 1):
+        image.fill(0)
+        painter = QPainter(image)
+        start = time.perf_counter()
+        view.render(painter)
+        painter.end()
+        times.append(time.perf_counter() - start)
+    # The first frame fills caches, so it is reported separately
+    return {"first_frame_ms": times[0] * 1000, **summarize(times[1:])}
+
+
+def bench_arrangement(tab, items, repeats):
+    """Time alignment and circle arrangement, including their undo snapshots"""
+    from tarot_canvas.ui.canvas import (
+        align_items_horizontally,
+        arrange_items_in_circle,
+        arrange_items_in_grid,
+    )
+
+    results = {}
+    for name, arrange, args in (
+        ("align_left", align_items_horizontally, ("left",)),
+        ("arrange_circle", arrange_items_in_circle, ()),
+    ):
+        times = []
+        for _ in range(repeats):
+            # Start each run from a layout the arrangement actually changes
+            arrange_items_in_grid(items, QPointF(0, 0))
+            start = time.perf_counter()
+            tab.push_layout_change(name, items, arrange, *args)
+            QApplication.processEvents()
+            times.append(time.perf_counter() - start)
+        results[name] = summarize(times)
+    return results
+
+
+def bench_animation(tab, items, seconds):
+    """Measure CPU spent while every card wobbles, against the same canvas at rest"""
+    tab.resize(*FRAME_SIZE)
+    tab.show()
+    tab.view.fitInView(tab.scene.itemsBoundingRect(), Qt.AspectRatioMode.KeepAspectRatio)
+    tab.view.finish_interaction()
+    counter = PaintCounter(tab.view.viewport())
+
+    def measure():
+        counter.count = 0
+        cpu, wall = time.process_time(), time.perf_counter()
+        run_event_loop(seconds)
+        wall = time.perf_counter() - wall
+        return {
+            "cpu_fraction": (time.process_time() - cpu) / wall,
+            "frames_per_second": counter.count / wall,
+        }
+
+    idle = measure()
+    for item in items:
+        item.start_animations()
+    animating = measure()
+    for item in items:
+        item.rotation_anim.stop()
+        item.update_cache_mode()
+    tab.hide()
+
+    return {
+        "seconds": seconds,
+        "idle": idle,
+        "animating": animating,
+        "cpu_fraction_per_card": (animating["cpu_fraction"] - idle["cpu_fraction"]) / len(items),
+    }
+
+
+def teardown(tab):
+    tab.undo_stack.clear()
+    tab.scene.clear()
+    tab.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    QApplication.processEvents()
+
+
+def run(sizes, frames, repeats, animation_seconds, rendering_mode):
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841
+    QSettings("ArcanaLand", "TarotCanvas").setValue("canvas/rendering_mode", rendering_mode)
+
+    with tempfile.TemporaryDirectory(prefix="tarot-canvas-cards-") as card_dir:
+        cards = make_cards(Path(card_dir))
+
+        results = []
+        for count in sizes:
+            print(f"Benchmarking {count} cards", file=sys.stderr)
+            tab, items, construction, memory = bench_construction(cards, count, repeats)
+            results.append(
+                {
+                    "cards": count,
+                    "construction": construction,
+                    "memory": memory,
+                    "render_fit_all": bench_render(tab, frames, fit_all=True),
+                    "render_actual_size": bench_render(tab, frames, fit_all=False),
+                    "arrangement": bench_arrangement(tab, items, repeats),
+                    "animation": bench_animation(tab, items, animation_seconds),
+                }
+            )
+            teardown(tab)
+
+    return {
+        "benchmark": "canvas",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "platform": platform.platform(),
+        "qpa_platform": QApplication.platformName(),
+        "rendering_mode": rendering_mode,
+        "frame_size": list(FRAME_SIZE),
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Tarot Canvas card canvas")
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=list(DEFAULT_SIZES),
+        help="comma separated card counts (default: %(default)s)",
+    )
+    parser.add_argument("--frames", type=int, default=30, help="frames rendered per measurement")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per timed operation")
+    parser.add_argument(
+        "--animation-seconds", type=float, default=2.0, help="wall-clock time per animation run"
+    )
+    parser.add_argument(
+        "--rendering-mode", choices=["Performance", "Quality"], default="Performance"
+    )
+    parser.add_argument("--output", help="write JSON here instead of standard output")
+    args = parser.parse_args(argv)
+
+    # The application reports progress with print(), which must not end up in the JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run(
+            args.sizes, args.frames, args.repeats, args.animation_seconds, args.rendering_mode
+        )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+        print(f"Wrote results to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,8 +20,12 @@ from tarot_canvas.models.deck_manager import deck_manager
 from tarot_canvas.models.reference_deck import ReferenceDeck
 from tarot_canvas.ui.main_window import MainWindow
 from tarot_canvas.utils.logger import logger
+from tarot_canvas.utils.note_writer import NoteWriter
 from tarot_canvas.utils.theme_manager import ThemeManager
 
+# Longest the app waits on exit for notes still being saved
+QUIT_SAVE_SECONDS = 5
+
 
 class DeckDownloadThread(QThread):
     progress_update = pyqtSignal(int, str)
@@ -181,10 +185,19 @@ def main():
     # Process URI argument if provided
     process_uri_argument(app.arguments(), main_window)
 
+    # Let notes still being saved reach the disk before exiting
+    app.aboutToQuit.connect(flush_notes)
+
     # Run the application event loop
     return app.exec()
 
 
+def flush_notes():
+    """Give notes still being saved a few seconds to reach the disk"""
+    if not NoteWriter.get_instance().flush(QUIT_SAVE_SECONDS):
+        logger.warning(f"Notes were still being saved after {QUIT_SAVE_SECONDS} s, quitting anyway")
+
+
 def process_uri_argument(args, main_window):
     """Process URI argument for opening specific cards"""
     # Create argument parser
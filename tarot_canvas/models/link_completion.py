@@ -0,0 +1,176 @@
+import bisect
+import heapq
+import re
+
+from tarot_canvas.models.notes_index import NotesIndex
+from tarot_canvas.models.notes_store import NotesStore
+
+# Completions offered for what has been typed inside [[ ]]
+COMPLETION_LIMIT = 20
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _trigrams(text):
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class LinkCompletionIndex:
+    """Ranked, typo-tolerant completion of [[wiki links]] to notes, cards and decks.
+
+    Completions are indexed two ways: every word they contain, kept sorted
+    so a partial word finds the words it begins with through a binary
+    search, and every three-letter run, so a misspelt or run-together query
+    still finds what it resembles. A lookup touches only the entries sharing
+    words or letters with the query, so it costs about as much with tens of
+    thousands of notes as with ten. Note names are re-read only when the
+    notes index reports that they changed, cards and decks only when the
+    ones given differ from those indexed.
+    """
+
+    _instance = None
+    _database_instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """Get the singleton instance"""
+        if cls._instance is None:
+            cls._instance = cls(NotesIndex.get_instance())
+        return cls._instance
+
+    @classmethod
+    def get_database_instance(cls):
+        """Get the instance completing the names of notes kept in the notes database"""
+        if cls._database_instance is None:
+            cls._database_instance = cls(NotesStore.get_instance())
+        return cls._database_instance
+
+    def __init__(self, notes_index):
+        # The notes index or the notes database, both of which have names() and a generation
+        self.notes_index = notes_index
+        self._notes_generation = None  # Generation of the notes index last read
+        self._sources = {"note": set(), "card": set(), "deck": set()}
+        self._entries = {}  # completion -> (lower-case text, words)
+        self._postings = {}  # word -> set of completions
+        self._words = []  # every indexed word, sorted
+        self._grams = {}  # three letters -> set of completions
+        self._shortest = None  # every completion, shortest first, until one changes
+
+    def __len__(self):
+        self.sync_notes()
+        return len(self._entries)
+
+    def sync_notes(self):
+        if self._notes_generation != self.notes_index.generation:
+            self._notes_generation = self.notes_index.generation
+            self._update("note", {name: () for name in self.notes_index.names()})
+
+    def set_cards(self, cards):
+        """Offer links to these cards, matched by their names and ids"""
+        self._update(
+            "card",
+            {f"card:{card['name']}": (card.get("id", ""),) for card in cards if card.get("name")},
+        )
+
+    def set_decks(self, names):
+        self._update("deck", {f"deck:{name}": () for name in names if name})
+
+    def _update(self, kind, completions):
+        """Make the completions of one kind those given, with any extra words to find them by"""
+        current = self._sources[kind]
+        for completion in current - completions.keys():
+            self._remove(completion)
+        for completion in completions.keys() - current:
+            self._add(completion, completions[completion])
+        self._sources[kind] = set(completions)
+
+    def _add(self, completion, aliases):
+        if completion in self._entries:
+            # The same text offered by two sources is indexed once
+            return
+        text = completion.lower()
+        words = set(_WORD.findall(text))
+        for alias in aliases:
+            alias = alias.lower()
+            words.update(_WORD.findall(alias))
+            words.add(alias)
+        self._entries[completion] = (text, words)
+        self._shortest = None
+        for word in words:
+            completions = self._postings.get(word)
+            if completions is None:
+                completions = self._postings[word] = set()
+                bisect.insort(self._words, word)
+            completions.add(completion)
+        for gram in _trigrams(text):
+            self._grams.setdefault(gram, set()).add(completion)
+
+    def _remove(self, completion):
+        entry = self._entries.pop(completion, None)
+        if entry is None:
+            return
+        self._shortest = None
+        text, words = entry
+        for word in words:
+            completions = self._postings[word]
+            completions.discard(completion)
+            if not completions:
+                del self._postings[word]
+                del self._words[bisect.bisect_left(self._words, word)]
+        for gram in _trigrams(text):
+            completions = self._grams[gram]
+            completions.discard(completion)
+            if not completions:
+                del self._grams[gram]
+
+    def _prefixed(self, prefix):
+        """Get the completions with any word starting with a prefix"""
+        start = bisect.bisect_left(self._words, prefix)
+        end = bisect.bisect_left(self._words, prefix + "\uffff", start)
+        completions = set()
+        for word in self._words[start:end]:
+            completions.update(self._postings[word])
+        return completions
+
+    def complete(self, text, limit=COMPLETION_LIMIT):
+        """Get the best completions for what was typed inside [[ ]], best first.
+
+        Completions starting with the text come first, then those with a word
+        starting with every word typed, then those merely sharing most of the
+        text's three-letter runs, shorter completions first at each level.
+        """
+        self.sync_notes()
+        query = text.lower().strip()
+        if not query:
+            if self._shortest is None:
+                self._shortest = sorted(
+                    self._entries, key=lambda completion: (len(completion), completion)
+                )
+            return self._shortest[:limit]
+
+        ranked = {}
+        words = _WORD.findall(query)
+        if words:
+            candidates = sorted((self._prefixed(word) for word in words), key=len)
+            matches = set(candidates[0])
+            for completions in candidates[1:]:
+                matches.intersection_update(completions)
+            for completion in matches:
+                ranked[completion] = 0.0 if self._entries[completion][0].startswith(query) else 1.0
+
+        if len(ranked) < limit:
+            grams = _trigrams(query)
+            hits = {}
+            for gram in grams:
+                for completion in self._grams.get(gram, ()):
+                    hits[completion] = hits.get(completion, 0) + 1
+            for completion, count in hits.items():
+                # Close enough when most of the query's letter runs appear
+                if completion not in ranked and count * 2 >= len(grams):
+                    ranked[completion] = 2.0 + 1.0 - count / len(grams)
+
+        return heapq.nsmallest(
+            limit,
+            ranked,
+            key=lambda completion: (ranked[completion], len(completion), completion),
+        )
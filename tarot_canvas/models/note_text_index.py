@@ -0,0 +1,295 @@
+import html
+import os
+import re
+import sqlite3
+
+from tarot_canvas.models.notes_index import NotesIndex
+from tarot_canvas.utils.logger import logger
+from tarot_canvas.utils.path_helper import get_data_directory
+
+# Results returned by a search
+SEARCH_LIMIT = 50
+
+# Words of context shown around matches in a snippet
+SNIPPET_WORDS = 12
+
+# Matching words are wrapped in these while SQLite builds a snippet
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+_WORD = re.compile(r"\w+")
+
+# Wiki links: [[card:The Fool]], [[deck:Rider Waite]] or [[Note name]]
+_LINK = re.compile(r"\[\[([^\[\]\n]+?)\]\]")
+
+# Bumped when the tables change, so older indexes are rebuilt
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS note_files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    card_id TEXT NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS note_text USING fts5(
+    title, body, tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS note_links (
+    source INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    target TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS note_links_target ON note_links (kind, target);
+CREATE INDEX IF NOT EXISTS note_links_source ON note_links (source);
+"""
+
+
+def parse_links(text):
+    """Get the (kind, target) of every wiki link in a note, kind being "card", "deck" or "note"."""
+    links = set()
+    for match in _LINK.finditer(text):
+        link = match.group(1).strip()
+        kind, _, target = link.partition(":")
+        if kind in ("card", "deck"):
+            if target.strip():
+                links.add((kind, target.strip()))
+        elif link:
+            links.add(("note", link))
+    return links
+
+
+def snippet_html(snippet):
+    """Turn a snippet built by SQLite into one line of HTML, the matching words in bold"""
+    return (
+        html.escape(snippet)
+        .replace(MATCH_START, "<b>")
+        .replace(MATCH_END, "</b>")
+        .replace("\n", " ")
+    )
+
+
+def match_query(text):
+    """Turn what the user typed into an FTS5 query matching notes with every word.
+
+    Each word is quoted, so punctuation cannot break the query syntax, and
+    matches as a prefix, so results show up while a word is still being typed.
+    """
+    words = _WORD.findall(text)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class NoteTextIndex:
+    """Persistent index of what notes say: their full text and their wiki links.
+
+    The text is kept in an SQLite FTS5 table and the links as edges from a
+    note to the card, deck or note it names, indexed by target. The index
+    lives next to the notes and survives restarts: the first time it is
+    used, only notes whose files changed since it last saw them are read
+    again. After that it is updated from the text being saved, so it never
+    re-reads a note the app wrote itself. Searches are ranked with BM25,
+    title matches counting more than matches in the text, and backlinks are
+    found through the target index, so they cost as much as there are links.
+    """
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """Get the singleton instance"""
+        if cls._instance is None:
+            cls._instance = cls(NotesIndex.get_instance())
+        return cls._instance
+
+    def __init__(self, notes_index, db_path=None):
+        self.notes_index = notes_index
+        self.db_path = str(db_path or get_data_directory("tarot-canvas/note_index.sqlite3"))
+        self._db = None
+
+    def _connection(self):
+        """Open the database the first time it is needed and catch up with the notes"""
+        if self._db is None:
+            if self.db_path != ":memory:":
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._db = sqlite3.connect(self.db_path)
+            self._db.execute("PRAGMA journal_mode = WAL")
+            self._db.executescript(_SCHEMA)
+            if self._db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                # Forget what was indexed so every note is read again
+                with self._db:
+                    self._db.execute("DELETE FROM note_files")
+                    self._db.execute("DELETE FROM note_text")
+                    self._db.execute("DELETE FROM note_links")
+                self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.sync()
+        return self._db
+
+    def sync(self):
+        """Re-index notes changed on disk since the index last saw them, and drop deleted ones"""
+        db = self._connection()
+        known = {
+            path: (note_id, mtime)
+            for note_id, path, mtime in db.execute("SELECT id, path, mtime FROM note_files")
+        }
+        changed = 0
+        with db:
+            for note in self.notes_index.all_notes():
+                note_id, mtime = known.pop(note.file_path, (None, None))
+                if mtime == note.mtime:
+                    continue
+                try:
+                    with open(note.file_path, encoding="utf-8") as f:
+                        text = f.read()
+                except OSError as e:
+                    logger.warning(f"Could not index note {note.file_path}: {e}")
+                    continue
+                self._store(db, note, text)
+                changed += 1
+            for note_id, _ in known.values():
+                self._delete(db, note_id)
+        if changed or known:
+            logger.info(f"Re-indexed {changed} notes, dropped {len(known)} deleted notes")
+
+    def _store(self, db, note, text):
+        row = db.execute("SELECT id FROM note_files WHERE path = ?", (note.file_path,)).fetchone()
+        if row is None:
+            note_id = db.execute(
+                "INSERT INTO note_files (path, card_id, mtime) VALUES (?, ?, ?)",
+                (note.file_path, note.card_id, note.mtime),
+            ).lastrowid
+        else:
+            note_id = row[0]
+            db.execute(
+                "UPDATE note_files SET card_id = ?, mtime = ? WHERE id = ?",
+                (note.card_id, note.mtime, note_id),
+            )
+            db.execute("DELETE FROM note_text WHERE rowid = ?", (note_id,))
+            db.execute("DELETE FROM note_links WHERE source = ?", (note_id,))
+        db.execute(
+            "INSERT INTO note_text (rowid, title, body) VALUES (?, ?, ?)",
+            (note_id, note.name, text),
+        )
+        db.executemany(
+            "INSERT INTO note_links (source, kind, target) VALUES (?, ?, ?)",
+            ((note_id, kind, target) for kind, target in parse_links(text)),
+        )
+        return note_id
+
+    def _delete(self, db, note_id):
+        db.execute("DELETE FROM note_text WHERE rowid = ?", (note_id,))
+        db.execute("DELETE FROM note_links WHERE source = ?", (note_id,))
+        db.execute("DELETE FROM note_files WHERE id = ?", (note_id,))
+
+    def note_saved(self, note, text):
+        """Index the text just written to a note's file"""
+        db = self._connection()
+        with db:
+            self._store(db, note, text)
+
+    def note_renamed(self, old_path, note):
+        """Move a renamed note's entry to its new file and title"""
+        db = self._connection()
+        with db:
+            row = db.execute(
+                "SELECT id FROM note_files WHERE path = ?", (str(old_path),)
+            ).fetchone()
+            if row is None:
+                return
+            db.execute(
+                "UPDATE note_files SET path = ?, mtime = ? WHERE id = ?",
+                (note.file_path, note.mtime, row[0]),
+            )
+            db.execute("UPDATE note_text SET title = ? WHERE rowid = ?", (note.name, row[0]))
+
+    def note_deleted(self, file_path):
+        db = self._connection()
+        with db:
+            row = db.execute(
+                "SELECT id FROM note_files WHERE path = ?", (str(file_path),)
+            ).fetchone()
+            if row is not None:
+                self._delete(db, row[0])
+
+    def search(self, text, limit=SEARCH_LIMIT, card_id=None):
+        """Find notes containing every word of a query, best matches first.
+
+        Only one card's notes are searched when `card_id` is given.
+
+        Returns:
+            list: dicts with "card_id", "file_path", "title" and "snippet",
+            the snippet being HTML with the matching words in bold
+        """
+        query = match_query(text)
+        if not query:
+            return []
+        rows = self._connection().execute(
+            "SELECT f.card_id, f.path, note_text.title,"
+            " snippet(note_text, 1, ?, ?, '…', ?)"
+            " FROM note_text JOIN note_files AS f ON f.id = note_text.rowid"
+            " WHERE note_text MATCH ? AND (? IS NULL OR f.card_id = ?)"
+            " ORDER BY bm25(note_text, 5.0, 1.0) LIMIT ?",
+            (MATCH_START, MATCH_END, SNIPPET_WORDS, query, card_id, card_id, limit),
+        )
+        return [
+            {
+                "card_id": card_id,
+                "file_path": path,
+                "title": title,
+                "snippet": snippet_html(snippet),
+            }
+            for card_id, path, title, snippet in rows
+        ]
+
+    def matching_paths(self, text, card_id=None):
+        """Get the paths of every note containing every word of a query, in no order.
+
+        Unlike search() nothing is ranked, cut off or quoted, so this suits
+        filtering a whole list of notes.
+        """
+        query = match_query(text)
+        if not query:
+            return set()
+        rows = self._connection().execute(
+            "SELECT f.path FROM note_text JOIN note_files AS f ON f.id = note_text.rowid"
+            " WHERE note_text MATCH ? AND (? IS NULL OR f.card_id = ?)",
+            (query, card_id, card_id),
+        )
+        return {path for (path,) in rows}
+
+    def backlinks(self, kind, target):
+        """Find the notes linking to a card, deck or note, by its name in any case.
+
+        Returns:
+            list: dicts with "card_id", "file_path" and "title", by title
+        """
+        rows = self._connection().execute(
+            "SELECT DISTINCT f.card_id, f.path, note_text.title"
+            " FROM note_links AS l"
+            " JOIN note_files AS f ON f.id = l.source"
+            " JOIN note_text ON note_text.rowid = l.source"
+            " WHERE l.kind = ? AND l.target = ?"
+            " ORDER BY note_text.title",
+            (kind, target.strip()),
+        )
+        return [
+            {"card_id": card_id, "file_path": path, "title": title} for card_id, path, title in rows
+        ]
+
+    def most_referenced(self, kind="card", limit=20):
+        """Get the most linked-to names of one kind, as (name, number of linking notes)"""
+        return (
+            self._connection()
+            .execute(
+                # The name is spelled the same way whatever order the links were stored in
+                "SELECT MIN(target COLLATE BINARY), COUNT(DISTINCT source) AS links"
+                " FROM note_links WHERE kind = ? GROUP BY target"
+                " ORDER BY links DESC, MIN(target) LIMIT ?",
+                (kind, limit),
+            )
+            .fetchall()
+        )
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,204 @@
+import os
+
+from tarot_canvas.utils.logger import logger
+from tarot_canvas.utils.path_helper import get_data_directory
+
+
+def display_name_from_filename(filename):
+    """Extract a display name from a note filename like 1700000000_My_Note.md"""
+    name = filename.rsplit(".", 1)[0]
+
+    # Remove timestamp prefix if it exists
+    if "_" in name:
+        prefix, rest = name.split("_", 1)
+        if prefix.isdigit():
+            name = rest
+
+    return name.replace("_", " ")
+
+
+class NoteEntry:
+    """A note file as the index knows it"""
+
+    __slots__ = ("card_id", "file_path", "name", "mtime")
+
+    def __init__(self, card_id, file_path, name, mtime):
+        self.card_id = card_id
+        self.file_path = file_path
+        self.name = name
+        self.mtime = mtime
+
+
+class NotesIndex:
+    """Index of every note file under the notes directory, shared by all card views.
+
+    The notes directory is scanned once, the first time the index is used,
+    and then kept up to date as notes are created, renamed, deleted and
+    saved, so looking up a card's notes or a note by name does not touch the
+    disk. Each card's listing is kept sorted newest first until it changes.
+    """
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """Get the singleton instance"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, base_dir=None):
+        self.base_dir = str(base_dir or get_data_directory("tarot-canvas/notes"))
+        self._cards = None  # card id -> {file path -> NoteEntry}, None until scanned
+        self._by_path = {}  # file path -> NoteEntry
+        self._by_name = {}  # display name -> {file path -> NoteEntry}, latest last
+        self._sorted = {}  # card id -> entries newest first
+        self.generation = 0  # Bumped whenever a note is added or removed
+
+    def __len__(self):
+        self._ensure_scanned()
+        return len(self._by_path)
+
+    def _ensure_scanned(self):
+        if self._cards is None:
+            self.rescan()
+
+    def rescan(self):
+        """Rebuild the index from the notes directory"""
+        self.generation += 1
+        self._cards = {}
+        self._by_path = {}
+        self._by_name = {}
+        self._sorted = {}
+        try:
+            card_dirs = [entry for entry in os.scandir(self.base_dir) if entry.is_dir()]
+        except FileNotFoundError:
+            return
+        for card_dir in card_dirs:
+            self._scan_card(card_dir.name)
+        logger.info(f"Indexed {len(self._by_path)} notes in {self.base_dir}")
+
+    def _scan_card(self, card_id):
+        """Index the note files in one card's directory"""
+        try:
+            entries = list(os.scandir(os.path.join(self.base_dir, card_id)))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.name.endswith(".md") and entry.is_file():
+                self._add(card_id, entry.path, entry.stat().st_mtime)
+
+    def refresh_card(self, card_id):
+        """Re-read one card's directory, picking up files changed outside the app"""
+        self._ensure_scanned()
+        for entry in list(self._cards.get(card_id, {}).values()):
+            self._remove(entry.file_path)
+        self._scan_card(card_id)
+
+    def card_directory(self, card_id):
+        return os.path.join(self.base_dir, card_id)
+
+    def notes_for_card(self, card_id):
+        """Get a card's notes, newest first"""
+        self._ensure_scanned()
+        entries = self._sorted.get(card_id)
+        if entries is None:
+            entries = sorted(
+                self._cards.get(card_id, {}).values(),
+                key=lambda entry: (entry.mtime, entry.file_path),
+                reverse=True,
+            )
+            self._sorted[card_id] = entries
+        return list(entries)
+
+    def find(self, name):
+        """Get the note with a display name, or None"""
+        self._ensure_scanned()
+        entries = self._by_name.get(name)
+        return next(reversed(entries.values())) if entries else None
+
+    def find_for_card(self, card_id, name):
+        """Get one of a card's notes by display name, or None"""
+        self._ensure_scanned()
+        for entry in reversed(self._by_name.get(name, {}).values()):
+            if entry.card_id == card_id:
+                return entry
+        return None
+
+    def get(self, file_path):
+        """Get the note stored in a file, or None"""
+        self._ensure_scanned()
+        return self._by_path.get(str(file_path))
+
+    def all_notes(self):
+        """Get every indexed note"""
+        self._ensure_scanned()
+        return list(self._by_path.values())
+
+    def names(self):
+        """Get the display name of every note"""
+        self._ensure_scanned()
+        return list(self._by_name)
+
+    def note_created(self, card_id, file_path, mtime=None):
+        """Record a note file that was just written for a card.
+
+        Pass `mtime` for a file that is still on its way to the disk.
+        """
+        self._ensure_scanned()
+        file_path = str(file_path)
+        self._remove(file_path)
+        return self._add(card_id, file_path, self._mtime(file_path) if mtime is None else mtime)
+
+    def note_saved(self, file_path):
+        """Record that a note file was written again"""
+        self._ensure_scanned()
+        entry = self._by_path.get(str(file_path))
+        if entry is None:
+            return None
+        entry.mtime = self._mtime(entry.file_path)
+        self._sorted.pop(entry.card_id, None)
+        return entry
+
+    def note_renamed(self, old_path, new_path):
+        """Record a note file that was moved to a new name"""
+        self._ensure_scanned()
+        entry = self._remove(str(old_path))
+        card_id = entry.card_id if entry else os.path.basename(os.path.dirname(new_path))
+        return self._add(card_id, str(new_path), self._mtime(new_path))
+
+    def note_deleted(self, file_path):
+        """Record a note file that was deleted"""
+        self._ensure_scanned()
+        return self._remove(str(file_path))
+
+    def _add(self, card_id, file_path, mtime):
+        entry = NoteEntry(
+            card_id, file_path, display_name_from_filename(os.path.basename(file_path)), mtime
+        )
+        self._cards.setdefault(card_id, {})[file_path] = entry
+        self._by_path[file_path] = entry
+        self._by_name.setdefault(entry.name, {})[file_path] = entry
+        self._sorted.pop(card_id, None)
+        self.generation += 1
+        return entry
+
+    def _remove(self, file_path):
+        entry = self._by_path.pop(file_path, None)
+        if entry is None:
+            return None
+        del self._cards[entry.card_id][file_path]
+        self._sorted.pop(entry.card_id, None)
+        named = self._by_name[entry.name]
+        del named[file_path]
+        if not named:
+            del self._by_name[entry.name]
+        self.generation += 1
+        return entry
+
+    @staticmethod
+    def _mtime(file_path):
+        try:
+            return os.path.getmtime(file_path)
+        except OSError:
+            return 0.0
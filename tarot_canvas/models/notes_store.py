@@ -0,0 +1,393 @@
+import os
+import sqlite3
+import time
+
+from tarot_canvas.models.note_text_index import (
+    MATCH_END,
+    MATCH_START,
+    SEARCH_LIMIT,
+    SNIPPET_WORDS,
+    match_query,
+    parse_links,
+    snippet_html,
+)
+from tarot_canvas.models.notes_index import NoteEntry, display_name_from_filename
+from tarot_canvas.utils.logger import logger
+from tarot_canvas.utils.path_helper import get_data_directory
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    card_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    created INTEGER NOT NULL,
+    modified REAL NOT NULL,
+    filename TEXT NOT NULL,
+    UNIQUE (card_id, filename)
+);
+CREATE INDEX IF NOT EXISTS notes_by_card ON notes (card_id, modified DESC);
+CREATE INDEX IF NOT EXISTS notes_by_title ON notes (title COLLATE NOCASE);
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_text USING fts5(
+    title, body, content = 'notes', content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS notes_text_insert AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_text (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_text_delete AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_text (notes_text, rowid, title, body)
+    VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_text_update AFTER UPDATE OF title, body ON notes BEGIN
+    INSERT INTO notes_text (notes_text, rowid, title, body)
+    VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO notes_text (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TABLE IF NOT EXISTS note_links (
+    source INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    target TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS note_links_target ON note_links (kind, target);
+CREATE INDEX IF NOT EXISTS note_links_source ON note_links (source);
+CREATE TRIGGER IF NOT EXISTS note_links_delete AFTER DELETE ON notes BEGIN
+    DELETE FROM note_links WHERE source = old.id;
+END;
+"""
+
+# Bumped when the tables change; older databases are brought up to date on open
+SCHEMA_VERSION = 1
+
+_COLUMNS = "id, card_id, title, created, modified, filename"
+
+# The notes UI tells notes apart by file path; database notes get keys like notes-db:12
+KEY_PREFIX = "notes-db:"
+
+
+def note_key(note_id):
+    return f"{KEY_PREFIX}{note_id}"
+
+
+def note_id_from_key(key):
+    """Get the id in a database note's key, or None for anything else, such as a file path"""
+    if not key.startswith(KEY_PREFIX) or not key[len(KEY_PREFIX) :].isdigit():
+        return None
+    return int(key[len(KEY_PREFIX) :])
+
+
+def note_filename(title, created):
+    """Get the markdown file name a note is stored under, like 1700000000_My_Note.md"""
+    safe_title = title.replace(" ", "_").replace("/", "_").replace("\\", "_")
+    return f"{created}_{safe_title}.md"
+
+
+def _row(row):
+    note_id, card_id, title, created, modified, filename = row
+    return {
+        "id": note_id,
+        "file_path": note_key(note_id),
+        "card_id": card_id,
+        "title": title,
+        "created": created,
+        "modified": modified,
+        "filename": filename,
+    }
+
+
+class NotesStore:
+    """Every note in a single SQLite database, as an alternative to the markdown tree.
+
+    Each note is a row holding its card, title, text, creation and
+    modification times, and the file name it has in the markdown tree, so
+    notes can be moved between the two without losing anything: the text
+    is kept exactly as written, line endings included, and exported files
+    get back their names and modification times. Listing a card's notes,
+    looking a note up by title, full-text search and backlinks are indexed
+    queries, and renaming a note only updates its row. The database is
+    written in WAL mode, so reading never waits for a save, and without an
+    fsync per save, so a save costs well under a millisecond; a crash of
+    the app loses nothing, a power cut at most the last saves.
+
+    Rows carry a "file_path" key, notes-db:<id>, which the notes UI uses
+    wherever a markdown note has its file path.
+    """
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """Get the singleton instance"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path or get_data_directory("tarot-canvas/notes.sqlite3"))
+        self._db = None
+        self.generation = 0  # Bumped whenever a note is added, renamed or removed
+
+    def _connection(self):
+        if self._db is None:
+            if self.db_path != ":memory:":
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._db = sqlite3.connect(self.db_path)
+            self._db.execute("PRAGMA journal_mode = WAL")
+            self._db.execute("PRAGMA synchronous = NORMAL")
+            self._db.executescript(_SCHEMA)
+            if self._db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                # Databases from before links were stored get them from the notes' text
+                with self._db:
+                    self._db.execute("DELETE FROM note_links")
+                    for note_id, body in self._db.execute("SELECT id, body FROM notes").fetchall():
+                        self._store_links(self._db, note_id, body)
+                self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return self._db
+
+    def _store_links(self, db, note_id, body):
+        db.execute("DELETE FROM note_links WHERE source = ?", (note_id,))
+        db.executemany(
+            "INSERT INTO note_links (source, kind, target) VALUES (?, ?, ?)",
+            ((note_id, kind, target) for kind, target in parse_links(body)),
+        )
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    def create_note(self, card_id, title, body="", created=None):
+        """Add a note to a card and get its id"""
+        created = int(created if created is not None else time.time())
+        db = self._connection()
+        with db:
+            note_id = db.execute(
+                "INSERT INTO notes (card_id, title, body, created, modified, filename)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (card_id, title, body, created, time.time(), note_filename(title, created)),
+            ).lastrowid
+            self._store_links(db, note_id, body)
+        self.generation += 1
+        return note_id
+
+    def note(self, note_id):
+        """Get a note with its text under "body", or None"""
+        row = (
+            self._connection()
+            .execute(f"SELECT {_COLUMNS}, body FROM notes WHERE id = ?", (note_id,))
+            .fetchone()
+        )
+        if row is None:
+            return None
+        note = _row(row[:-1])
+        note["body"] = row[-1]
+        return note
+
+    def notes_for_card(self, card_id):
+        """Get a card's notes without their text, newest first"""
+        rows = self._connection().execute(
+            f"SELECT {_COLUMNS} FROM notes WHERE card_id = ? ORDER BY modified DESC, id DESC",
+            (card_id,),
+        )
+        return [_row(row) for row in rows]
+
+    def entries_for_card(self, card_id):
+        """Get a card's notes as entries for the notes list, newest first"""
+        return [
+            NoteEntry(card_id, note["file_path"], note["title"], note["modified"])
+            for note in self.notes_for_card(card_id)
+        ]
+
+    def entry(self, note_id):
+        """Get a note as an entry for the notes list, or None"""
+        note = self.note(note_id)
+        if note is None:
+            return None
+        return NoteEntry(note["card_id"], note["file_path"], note["title"], note["modified"])
+
+    def names(self):
+        """Get the title of every note"""
+        return [
+            title for (title,) in self._connection().execute("SELECT DISTINCT title FROM notes")
+        ]
+
+    def find(self, title, card_id=None):
+        """Get the most recently changed note with a title, in any case, or None.
+
+        Only one card's notes are looked at when `card_id` is given.
+        """
+        row = (
+            self._connection()
+            .execute(
+                f"SELECT {_COLUMNS} FROM notes WHERE title = ? COLLATE NOCASE"
+                " AND (? IS NULL OR card_id = ?) ORDER BY modified DESC LIMIT 1",
+                (title, card_id, card_id),
+            )
+            .fetchone()
+        )
+        return _row(row) if row else None
+
+    def save(self, note_id, body):
+        db = self._connection()
+        with db:
+            db.execute(
+                "UPDATE notes SET body = ?, modified = ? WHERE id = ?",
+                (body, time.time(), note_id),
+            )
+            self._store_links(db, note_id, body)
+
+    def rename(self, note_id, title):
+        """Give a note a new title, and the file name that goes with it"""
+        db = self._connection()
+        with db:
+            row = db.execute("SELECT created FROM notes WHERE id = ?", (note_id,)).fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE notes SET title = ?, filename = ? WHERE id = ?",
+                    (title, note_filename(title, row[0]), note_id),
+                )
+        self.generation += 1
+
+    def delete(self, note_id):
+        db = self._connection()
+        with db:
+            db.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+        self.generation += 1
+
+    def search(self, text, limit=SEARCH_LIMIT, card_id=None):
+        """Find notes containing every word of a query, best matches first.
+
+        Only one card's notes are searched when `card_id` is given. Each
+        note comes with a "snippet" of HTML, the matching words in bold.
+        """
+        query = match_query(text)
+        if not query:
+            return []
+        rows = self._connection().execute(
+            "SELECT n.id, n.card_id, n.title, n.created, n.modified, n.filename,"
+            " snippet(notes_text, 1, ?, ?, '…', ?)"
+            " FROM notes_text JOIN notes AS n ON n.id = notes_text.rowid"
+            " WHERE notes_text MATCH ? AND (? IS NULL OR n.card_id = ?)"
+            " ORDER BY bm25(notes_text, 5.0, 1.0) LIMIT ?",
+            (MATCH_START, MATCH_END, SNIPPET_WORDS, query, card_id, card_id, limit),
+        )
+        results = []
+        for row in rows:
+            note = _row(row[:-1])
+            note["snippet"] = snippet_html(row[-1])
+            results.append(note)
+        return results
+
+    def matching_paths(self, text, card_id=None):
+        """Get the keys of every note containing every word of a query, in no order"""
+        query = match_query(text)
+        if not query:
+            return set()
+        rows = self._connection().execute(
+            "SELECT n.id FROM notes_text JOIN notes AS n ON n.id = notes_text.rowid"
+            " WHERE notes_text MATCH ? AND (? IS NULL OR n.card_id = ?)",
+            (query, card_id, card_id),
+        )
+        return {note_key(note_id) for (note_id,) in rows}
+
+    def backlinks(self, kind, target):
+        """Find the notes linking to a card, deck or note, by its name in any case, by title"""
+        rows = self._connection().execute(
+            "SELECT DISTINCT n.id, n.card_id, n.title, n.created, n.modified, n.filename"
+            " FROM note_links AS l JOIN notes AS n ON n.id = l.source"
+            " WHERE l.kind = ? AND l.target = ? ORDER BY n.title",
+            (kind, target.strip()),
+        )
+        return [_row(row) for row in rows]
+
+    def most_referenced(self, kind="card", limit=20):
+        """Get the most linked-to names of one kind, as (name, number of linking notes)"""
+        return (
+            self._connection()
+            .execute(
+                "SELECT MIN(target COLLATE BINARY), COUNT(DISTINCT source) AS links"
+                " FROM note_links WHERE kind = ? GROUP BY target"
+                " ORDER BY links DESC, MIN(target) LIMIT ?",
+                (kind, limit),
+            )
+            .fetchall()
+        )
+
+    def import_markdown(self, notes_dir=None):
+        """Copy the markdown tree (notes/<card id>/<file>.md) into the store.
+
+        Notes already imported from the same file are updated rather than
+        duplicated, so importing again picks up changes made in the tree.
+
+        Returns:
+            int: number of notes read
+        """
+        notes_dir = str(notes_dir or get_data_directory("tarot-canvas/notes"))
+        if not os.path.isdir(notes_dir):
+            # No note has been written yet
+            return 0
+        db = self._connection()
+        count = 0
+        with db:
+            for card_dir in sorted(os.scandir(notes_dir), key=lambda entry: entry.name):
+                if not card_dir.is_dir():
+                    continue
+                for entry in sorted(os.scandir(card_dir.path), key=lambda entry: entry.name):
+                    if not entry.name.endswith(".md") or not entry.is_file():
+                        continue
+                    # Keep the text exactly as written, line endings included
+                    with open(entry.path, encoding="utf-8", newline="") as f:
+                        body = f.read()
+                    modified = entry.stat().st_mtime
+                    prefix = entry.name.split("_", 1)[0]
+                    created = (
+                        int(prefix) if "_" in entry.name and prefix.isdigit() else int(modified)
+                    )
+                    db.execute(
+                        "INSERT INTO notes (card_id, title, body, created, modified, filename)"
+                        " VALUES (?, ?, ?, ?, ?, ?)"
+                        " ON CONFLICT (card_id, filename) DO UPDATE SET"
+                        " title = excluded.title, body = excluded.body,"
+                        " created = excluded.created, modified = excluded.modified",
+                        (
+                            card_dir.name,
+                            display_name_from_filename(entry.name),
+                            body,
+                            created,
+                            modified,
+                            entry.name,
+                        ),
+                    )
+                    note_id = db.execute(
+                        "SELECT id FROM notes WHERE card_id = ? AND filename = ?",
+                        (card_dir.name, entry.name),
+                    ).fetchone()[0]
+                    self._store_links(db, note_id, body)
+                    count += 1
+        self.generation += 1
+        logger.info(f"Imported {count} notes from {notes_dir} into {self.db_path}")
+        return count
+
+    def export_markdown(self, notes_dir):
+        """Write every note back out as notes/<card id>/<file>.md, keeping its modification time.
+
+        Returns:
+            int: number of notes written
+        """
+        notes_dir = str(notes_dir)
+        count = 0
+        for card_id, filename, body, modified in self._connection().execute(
+            "SELECT card_id, filename, body, modified FROM notes ORDER BY card_id, filename"
+        ):
+            card_dir = os.path.join(notes_dir, card_id)
+            os.makedirs(card_dir, exist_ok=True)
+            file_path = os.path.join(card_dir, filename)
+            with open(file_path, "w", encoding="utf-8", newline="") as f:
+                f.write(body)
+            os.utime(file_path, (modified, modified))
+            count += 1
+        logger.info(f"Exported {count} notes from {self.db_path} to {notes_dir}")
+        return count
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -2,17 +2,38 @@ from tarot_canvas.ui.canvas.alignment import (
     align_items_horizontally,
     align_items_vertically,
     arrange_items_in_circle,
+    arrange_items_in_fan,
+    arrange_items_in_grid,
     distribute_items_horizontally,
     distribute_items_vertically,
 )
 from tarot_canvas.ui.canvas.animations import CardAnimationController
-from tarot_canvas.ui.canvas.card_item import DraggableCardItem
-from tarot_canvas.ui.canvas.commands import CardMoveCommand
+from tarot_canvas.ui.canvas.auto_arrange import ARRANGE_MODES, apply_positions, arrange
+from tarot_canvas.ui.canvas.card_item import DraggableCardItem, wobble_amplitudes
+from tarot_canvas.ui.canvas.card_search import CanvasFindDialog, CardSearchIndex, SearchHighlight
+from tarot_canvas.ui.canvas.card_stack import CardStack
+from tarot_canvas.ui.canvas.commands import (
+    UNDO_LIMIT,
+    CardAddCommand,
+    CardGroupCommand,
+    CardLayoutCommand,
+    CardMoveCommand,
+    CardRemoveCommand,
+    CardUngroupCommand,
+    capture_layout,
+)
+from tarot_canvas.ui.canvas.diagnostics import DiagnosticsOverlay, FrameStats
+from tarot_canvas.ui.canvas.export import export_scene, scene_from_layout, scene_layout
 from tarot_canvas.ui.canvas.icons import CanvasIcon
+from tarot_canvas.ui.canvas.layers import CanvasLayer, CanvasLayers
+from tarot_canvas.ui.canvas.minimap import CanvasMinimap
+from tarot_canvas.ui.canvas.spatial_index import SpatialGridIndex, resting_rect
 from tarot_canvas.ui.canvas.view import PannableGraphicsView
 
 __all__ = [
     "DraggableCardItem",
+    "wobble_amplitudes",
+    "CardStack",
     "PannableGraphicsView",
     "CardAnimationController",
     "align_items_horizontally",
@@ -20,6 +41,31 @@ __all__ = [
     "distribute_items_horizontally",
     "distribute_items_vertically",
     "arrange_items_in_circle",
+    "arrange_items_in_grid",
+    "arrange_items_in_fan",
+    "ARRANGE_MODES",
+    "arrange",
+    "apply_positions",
     "CardMoveCommand",
+    "CardLayoutCommand",
+    "CardAddCommand",
+    "CardRemoveCommand",
+    "CardGroupCommand",
+    "CardUngroupCommand",
+    "capture_layout",
+    "UNDO_LIMIT",
     "CanvasIcon",
+    "CanvasMinimap",
+    "CanvasLayer",
+    "CanvasLayers",
+    "CanvasFindDialog",
+    "CardSearchIndex",
+    "SearchHighlight",
+    "DiagnosticsOverlay",
+    "FrameStats",
+    "SpatialGridIndex",
+    "resting_rect",
+    "export_scene",
+    "scene_layout",
+    "scene_from_layout",
 ]
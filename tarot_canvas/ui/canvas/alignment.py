@@ -154,3 +154,53 @@ def arrange_items_in_circle(items):
 
         # Set the new position
         item.setPos(item.pos().x() + offset_x, item.pos().y() + offset_y)
+
+
+def arrange_items_in_grid(items, center, spacing=20):
+    """Lay items out row by row in a roughly square grid centred on a point"""
+    if not items:
+        return
+
+    card_width = items[0].sceneBoundingRect().width()
+    card_height = items[0].sceneBoundingRect().height()
+
+    # Pick the column count that makes the whole grid about as tall as it is wide
+    columns = max(1, math.ceil(math.sqrt(len(items) * card_height / card_width)))
+    rows = math.ceil(len(items) / columns)
+
+    step_x = card_width + spacing
+    step_y = card_height + spacing
+    left = center.x() - (columns - 1) * step_x / 2
+    top = center.y() - (rows - 1) * step_y / 2
+
+    for i, item in enumerate(items):
+        row, column = divmod(i, columns)
+        item_rect = item.sceneBoundingRect()
+        offset_x = left + column * step_x - item_rect.center().x()
+        offset_y = top + row * step_y - item_rect.center().y()
+        item.setPos(item.pos().x() + offset_x, item.pos().y() + offset_y)
+
+
+def arrange_items_in_fan(items, center, overlap=0.65):
+    """Spread items in an overlapping arc, like a hand of cards fanned on a table"""
+    if not items:
+        return
+
+    card_width = items[0].sceneBoundingRect().width()
+    card_height = items[0].sceneBoundingRect().height()
+
+    # Each card covers this fraction of the one before it
+    step_x = card_width * (1 - overlap)
+    sag = card_height * 0.25
+    half = (len(items) - 1) / 2
+
+    for i, item in enumerate(items):
+        # -1 at the left end of the fan, 1 at the right end
+        t = (i - half) / half if half else 0
+        new_x = center.x() + (i - half) * step_x
+        new_y = center.y() + sag * t * t
+
+        item_rect = item.sceneBoundingRect()
+        offset_x = new_x - item_rect.center().x()
+        offset_y = new_y - item_rect.center().y()
+        item.setPos(item.pos().x() + offset_x, item.pos().y() + offset_y)
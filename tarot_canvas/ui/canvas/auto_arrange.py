@@ -0,0 +1,381 @@
+import math
+import statistics
+from array import array
+from collections import Counter
+from pathlib import Path
+
+from tarot_canvas.ui.canvas.spatial_index import resting_rect
+
+# Number of packed values per card in a rect buffer (left, top, width, height)
+RECT_STRIDE = 4
+
+# Gap left between cards by every arrangement
+ARRANGE_SPACING = 20
+
+# Overlap removal gives up after this many passes over the cards
+DECLUTTER_ITERATIONS = 60
+
+SUIT_ORDER = ("wands", "cups", "swords", "pentacles")
+RANK_ORDER = (
+    "ace",
+    "two",
+    "three",
+    "four",
+    "five",
+    "six",
+    "seven",
+    "eight",
+    "nine",
+    "ten",
+    "page",
+    "knight",
+    "queen",
+    "king",
+)
+
+ARRANGE_MODES = {
+    "declutter": "Remove Overlaps",
+    "shelf": "Pack in Rows",
+    "skyline": "Pack Tightly",
+    "deck": "Sort by Deck",
+    "suit": "Sort by Suit",
+    "number": "Sort by Number",
+}
+
+
+def capture_rects(items):
+    """Pack each item's resting scene rect into a flat array"""
+    rects = array("d")
+    for item in items:
+        rect = resting_rect(item)
+        rects.extend((rect.left(), rect.top(), rect.width(), rect.height()))
+    return rects
+
+
+def arrange(items, mode, spacing=ARRANGE_SPACING):
+    """Work out where each item goes for an auto-arrange mode, without moving anything.
+
+    Returns the new item positions as a flat (x, y) array, in the same form
+    the items' pos() uses, ready to be animated or applied.
+    """
+    if mode not in ARRANGE_MODES:
+        raise ValueError(f"Unknown arrangement: {mode}")
+
+    rects = capture_rects(items)
+    if mode == "declutter":
+        lefts, tops = remove_overlaps(rects, spacing)
+    elif mode in ("shelf", "skyline"):
+        order = _reading_order(rects)
+        lefts, tops = pack_rects(rects, order, spacing, skyline=mode == "skyline")
+    else:
+        keys = [card_sort_key(item.card_data, mode) for item in items]
+        order = sorted(range(len(items)), key=keys.__getitem__)
+        groups = [key[0] for key in keys] if mode in ("deck", "suit") else None
+        lefts, tops = sorted_grid(rects, order, spacing, groups)
+
+    if mode != "declutter":
+        _recentre(rects, lefts, tops)
+
+    # Convert resting top-lefts back to item positions
+    positions = array("d", bytes(16 * len(items)))
+    for i, item in enumerate(items):
+        offset = i * RECT_STRIDE
+        positions[2 * i] = item.pos().x() + lefts[i] - rects[offset]
+        positions[2 * i + 1] = item.pos().y() + tops[i] - rects[offset + 1]
+    return positions
+
+
+def apply_positions(items, positions):
+    """Move items to positions produced by arrange()"""
+    for i, item in enumerate(items):
+        item.setPos(positions[2 * i], positions[2 * i + 1])
+
+
+def card_sort_key(card_data, by):
+    """Sort key placing cards by deck, suit or number, falling back to the others in turn"""
+    card_data = card_data or {}
+    deck = _deck_of(card_data)
+    if card_data.get("type") == "major_arcana":
+        suit, number = 0, card_data.get("number", 0)
+    else:
+        suit_name = card_data.get("suit", "")
+        suit = SUIT_ORDER.index(suit_name) + 1 if suit_name in SUIT_ORDER else len(SUIT_ORDER) + 1
+        rank = card_data.get("rank", "")
+        number = RANK_ORDER.index(rank) + 1 if rank in RANK_ORDER else len(RANK_ORDER) + 1
+    name = card_data.get("name", "")
+
+    if by == "deck":
+        return deck, suit, number, name
+    if by == "suit":
+        return suit, deck, number, name
+    return number, suit, deck, name
+
+
+def _deck_of(card_data):
+    """Identify a card's deck by the folder its image lives in.
+
+    Card images sit at <deck>/<resolution>/<id path>, so the deck folder is
+    as many levels above the image as the card id has parts.
+    """
+    image = card_data.get("image")
+    card_id = card_data.get("id")
+    if not image or not card_id:
+        return ""
+    parents = Path(image).parents
+    depth = len(card_id.split("."))
+    return str(parents[depth]) if depth < len(parents) else ""
+
+
+def _reading_order(rects):
+    """Get card indices top to bottom, then left to right, in rows about a card tall"""
+    count = len(rects) // RECT_STRIDE
+    row_height = max((rects[i * RECT_STRIDE + 3] for i in range(count)), default=1) or 1
+    return sorted(
+        range(count),
+        key=lambda i: (
+            math.floor(rects[i * RECT_STRIDE + 1] / row_height),
+            rects[i * RECT_STRIDE],
+        ),
+    )
+
+
+def _recentre(rects, lefts, tops):
+    """Shift an arrangement so its middle lands on the middle of the original cards"""
+    count = len(lefts)
+    if not count:
+        return
+    before_x = before_y = after_x = after_y = 0.0
+    for i in range(count):
+        offset = i * RECT_STRIDE
+        before_x += rects[offset] + rects[offset + 2] / 2
+        before_y += rects[offset + 1] + rects[offset + 3] / 2
+        after_x += lefts[i] + rects[offset + 2] / 2
+        after_y += tops[i] + rects[offset + 3] / 2
+    dx = (before_x - after_x) / count
+    dy = (before_y - after_y) / count
+    for i in range(count):
+        lefts[i] += dx
+        tops[i] += dy
+
+
+def _target_width(rects, order, spacing):
+    """Pick a packing width that makes the result roughly square"""
+    area = sum(
+        (rects[i * RECT_STRIDE + 2] + spacing) * (rects[i * RECT_STRIDE + 3] + spacing)
+        for i in order
+    )
+    widest = max(rects[i * RECT_STRIDE + 2] for i in order)
+    return max(math.sqrt(area), widest + spacing)
+
+
+def pack_rects(rects, order, spacing=ARRANGE_SPACING, skyline=False):
+    """Pack rects, visited in `order`, into a roughly square block.
+
+    Shelf packing fills rows left to right like text. Skyline packing drops
+    each rect into the lowest gap along the top edge of what is already
+    placed, which fits cards of mixed sizes and orientations more tightly.
+
+    Returns:
+        tuple: (lefts, tops) arrays indexed like the rects
+    """
+    count = len(rects) // RECT_STRIDE
+    lefts = array("d", bytes(8 * count))
+    tops = array("d", bytes(8 * count))
+    if not count:
+        return lefts, tops
+
+    width = _target_width(rects, order, spacing)
+    if skyline:
+        _pack_skyline(rects, order, spacing, width, lefts, tops)
+    else:
+        x = y = shelf_height = 0.0
+        for i in order:
+            w = rects[i * RECT_STRIDE + 2] + spacing
+            h = rects[i * RECT_STRIDE + 3] + spacing
+            if x and x + w > width:
+                # Start a new shelf below the tallest card on this one
+                x, y, shelf_height = 0.0, y + shelf_height, 0.0
+            lefts[i], tops[i] = x, y
+            x += w
+            shelf_height = max(shelf_height, h)
+    return lefts, tops
+
+
+def _pack_skyline(rects, order, spacing, width, lefts, tops):
+    # The skyline is a list of [x, y, width] segments covering 0..width
+    skyline = [[0.0, 0.0, width]]
+    for i in order:
+        w = rects[i * RECT_STRIDE + 2] + spacing
+        h = rects[i * RECT_STRIDE + 3] + spacing
+
+        best = None  # (top, left, first segment, last segment)
+        for start in range(len(skyline)):
+            left = skyline[start][0]
+            if left + w > width and left > 0:
+                break
+            # The rect rests on the highest segment it spans
+            top, end, covered = 0.0, start, 0.0
+            while covered < w and end < len(skyline):
+                top = max(top, skyline[end][1])
+                covered = skyline[end][0] + skyline[end][2] - left
+                end += 1
+            if best is None or (top, left) < best[:2]:
+                best = (top, left, start, end)
+
+        top, left, start, end = best
+        lefts[i], tops[i] = left, top
+
+        # Replace the covered segments with the new rect's top edge
+        right = left + w
+        last = skyline[end - 1]
+        tail = last[0] + last[2] - right
+        skyline[start:end] = [[left, top + h, w]] + ([[right, last[1], tail]] if tail > 0 else [])
+
+        # Merge neighbouring segments at the same height
+        merged = [skyline[0]]
+        for segment in skyline[1:]:
+            if segment[1] == merged[-1][1]:
+                merged[-1][2] += segment[2]
+            else:
+                merged.append(segment)
+        skyline = merged
+
+
+def sorted_grid(rects, order, spacing=ARRANGE_SPACING, groups=None):
+    """Lay rects out in a grid in the given order.
+
+    With `groups` (a group key per rect), every group starts on a new row.
+
+    Returns:
+        tuple: (lefts, tops) arrays indexed like the rects
+    """
+    count = len(rects) // RECT_STRIDE
+    lefts = array("d", bytes(8 * count))
+    tops = array("d", bytes(8 * count))
+    if not count:
+        return lefts, tops
+
+    cell_width = max(rects[i * RECT_STRIDE + 2] for i in range(count)) + spacing
+    cell_height = max(rects[i * RECT_STRIDE + 3] for i in range(count)) + spacing
+    columns = max(1, math.ceil(math.sqrt(count * cell_height / cell_width)))
+    if groups is not None:
+        # Widen rows so a typical group fits on one, within reason
+        typical = statistics.median_low(Counter(groups).values())
+        columns = max(columns, min(typical, 2 * columns))
+
+    row = column = 0
+    previous = None
+    for i in order:
+        if groups is not None and previous is not None and groups[i] != previous and column:
+            row, column = row + 1, 0
+        previous = groups[i] if groups is not None else None
+
+        lefts[i] = column * cell_width + (cell_width - spacing - rects[i * RECT_STRIDE + 2]) / 2
+        tops[i] = row * cell_height + (cell_height - spacing - rects[i * RECT_STRIDE + 3]) / 2
+        column += 1
+        if column == columns:
+            row, column = row + 1, 0
+    return lefts, tops
+
+
+def remove_overlaps(rects, spacing=ARRANGE_SPACING, iterations=DECLUTTER_ITERATIONS):
+    """Push overlapping rects apart while keeping their rough relative positions.
+
+    Overlapping pairs repel along whichever axis separates them with the
+    least movement, so cards slide the short way out of each other and keep
+    their order. Candidate pairs come from a uniform grid rebuilt each pass,
+    which keeps a pass linear in the number of cards. A pile much denser than
+    the cards can fit is first scaled out about its middle, so piles do not
+    need hundreds of passes to spread.
+
+    Returns:
+        tuple: (lefts, tops) arrays indexed like the rects
+    """
+    count = len(rects) // RECT_STRIDE
+    xs = array("d", (rects[i * RECT_STRIDE] + rects[i * RECT_STRIDE + 2] / 2 for i in range(count)))
+    ys = array(
+        "d", (rects[i * RECT_STRIDE + 1] + rects[i * RECT_STRIDE + 3] / 2 for i in range(count))
+    )
+    half_w = array("d", (rects[i * RECT_STRIDE + 2] / 2 + spacing / 2 for i in range(count)))
+    half_h = array("d", (rects[i * RECT_STRIDE + 3] / 2 + spacing / 2 for i in range(count)))
+
+    if count > 1:
+        _spread_pile(xs, ys, half_w, half_h)
+
+    cell = 2 * max(max(half_w), max(half_h)) if count else 1
+    dx = array("d", bytes(8 * count))
+    dy = array("d", bytes(8 * count))
+    for _ in range(iterations):
+        grid = {}
+        for i in range(count):
+            grid.setdefault((math.floor(xs[i] / cell), math.floor(ys[i] / cell)), []).append(i)
+
+        overlaps = 0
+        for (column, row), members in grid.items():
+            neighbours = list(members)
+            # Each pair of cells is visited once, from its left or upper cell
+            for other in ((column + 1, row - 1), (column + 1, row), (column + 1, row + 1)):
+                neighbours.extend(grid.get(other, ()))
+            neighbours.extend(grid.get((column, row + 1), ()))
+
+            for a_index, a in enumerate(members):
+                ax, ay, aw, ah = xs[a], ys[a], half_w[a], half_h[a]
+                for b in neighbours[a_index + 1 :]:
+                    gap_x = abs(xs[b] - ax) - aw - half_w[b]
+                    if gap_x >= 0:
+                        continue
+                    gap_y = abs(ys[b] - ay) - ah - half_h[b]
+                    if gap_y >= 0:
+                        continue
+
+                    overlaps += 1
+                    # Half the overlap each, along the cheaper axis
+                    if gap_x > gap_y:
+                        push = -gap_x / 2 if xs[b] > ax or (xs[b] == ax and b > a) else gap_x / 2
+                        dx[a] -= push
+                        dx[b] += push
+                    else:
+                        push = -gap_y / 2 if ys[b] > ay or (ys[b] == ay and b > a) else gap_y / 2
+                        dy[a] -= push
+                        dy[b] += push
+
+        if not overlaps:
+            break
+        for i in range(count):
+            xs[i] += dx[i]
+            ys[i] += dy[i]
+            dx[i] = dy[i] = 0.0
+
+    lefts = array("d", (xs[i] - half_w[i] + spacing / 2 for i in range(count)))
+    tops = array("d", (ys[i] - half_h[i] + spacing / 2 for i in range(count)))
+    return lefts, tops
+
+
+def _spread_pile(xs, ys, half_w, half_h):
+    """Scale centres out about their middle until the cards could fit side by side"""
+    count = len(xs)
+    area = sum(4 * half_w[i] * half_h[i] for i in range(count))
+    mid_x = sum(xs) / count
+    mid_y = sum(ys) / count
+    span_w = max(xs) - min(xs) + 2 * max(half_w)
+    span_h = max(ys) - min(ys) + 2 * max(half_h)
+    scale = math.sqrt(area / (span_w * span_h))
+    if scale > 1:
+        for i in range(count):
+            xs[i] = mid_x + (xs[i] - mid_x) * scale
+            ys[i] = mid_y + (ys[i] - mid_y) * scale
+
+    # Cards dropped on exactly the same spot have no direction to separate in,
+    # so fan them out on a sunflower spiral around the spot
+    spots = {}
+    for i in range(count):
+        spots.setdefault((round(xs[i]), round(ys[i])), []).append(i)
+    golden_angle = math.pi * (3 - math.sqrt(5))
+    for members in spots.values():
+        if len(members) < 2:
+            continue
+        step = math.sqrt(4 * half_w[members[0]] * half_h[members[0]] / math.pi)
+        for k, i in enumerate(members):
+            radius = step * math.sqrt(k)
+            xs[i] += radius * math.cos(k * golden_angle)
+            ys[i] += radius * math.sin(k * golden_angle)
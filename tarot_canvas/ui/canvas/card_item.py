@@ -1,21 +1,43 @@
+import math
 import random
 
 from PyQt6.QtCore import (
+    QAbstractAnimation,
     QEasingCurve,
+    QObject,
     QPropertyAnimation,
+    QRectF,
     QSequentialAnimationGroup,
     QSettings,
+    QSize,
+    QSizeF,
     QTimer,
 )
+from PyQt6.QtGui import QPainter
 from PyQt6.QtWidgets import QGraphicsPixmapItem
 
 from tarot_canvas.ui.canvas.animations import CardAnimationController
 
 
+def wobble_amplitudes(intensity):
+    """Get the wobble's rotation (in degrees) and scale amplitudes for an intensity of 0-100"""
+    return intensity * 0.016, 1.0 + intensity * 0.0004  # 0 to 1.6 degrees, 1.0 to 1.04
+
+
 class DraggableCardItem(QGraphicsPixmapItem):
     """Enhanced draggable card item with wobble animation."""
 
-    def __init__(self, pixmap, card_data, parent_tab=None):
+    # While exporting, looks up a card's full-resolution image for a given size
+    export_source = None
+
+    # Number of card paints while counting_paints is set, read by the canvas diagnostics
+    paint_count = 0
+    counting_paints = False
+
+    # Canvas layer the item was placed on, kept while it is off the canvas
+    layer = None
+
+    def __init__(self, pixmap, card_data, parent_tab=None, autostart=True):
         super().__init__(pixmap)
         self.card_data = card_data
         self.parent_tab = parent_tab
@@ -25,21 +47,34 @@ class DraggableCardItem(QGraphicsPixmapItem):
         self.setAcceptHoverEvents(True)
         self.setTransformOriginPoint(pixmap.width() / 2, pixmap.height() / 2)
 
-        # Create animation controller
-        self.anim_controller = CardAnimationController()
+        # Create animation controller, owned by the tab so that it (and every
+        # animation parented to it) is torn down together with the canvas
+        self.anim_controller = CardAnimationController(
+            parent_tab if isinstance(parent_tab, QObject) else None
+        )
         self.anim_controller.card_item = self
+        self.rotation_anim = None
+        self.scale_anim = None
+
+        # Render through an item cache when the canvas is in performance mode
+        self.performance_mode = getattr(parent_tab, "performance_mode", False)
+        self._cache_size = QSize()
 
         # Set up wobble animation
-        self.setup_wobble_animation()
+        self.setup_wobble_animation(autostart=autostart)
+
+    def setup_wobble_animation(self, base_rotation=0, autostart=True):
+        """Set up wobble animation with slight rotation changes.
+
+        With autostart off the caller is expected to call start_animations().
+        """
+        self.base_rotation = base_rotation
 
-    def setup_wobble_animation(self, base_rotation=0):
-        """Set up wobble animation with slight rotation changes."""
         # Stop any existing animation
-        if hasattr(self, "rotation_anim") and self.rotation_anim:
-            self.rotation_anim.stop()
+        self.discard_animations()
 
         # Create a sequential animation group for rotation
-        self.rotation_anim = QSequentialAnimationGroup()
+        self.rotation_anim = QSequentialAnimationGroup(self.anim_controller)
 
         # Create subtle rotation animations around the base rotation
         rot1 = QPropertyAnimation(self.anim_controller, b"rotation")
@@ -66,7 +101,7 @@ class DraggableCardItem(QGraphicsPixmapItem):
         self.rotation_anim.addAnimation(rot3)
 
         # Create a very subtle scale animation (keep this part the same)
-        self.scale_anim = QPropertyAnimation(self.anim_controller, b"scale")
+        self.scale_anim = QPropertyAnimation(self.anim_controller, b"scale", self.anim_controller)
         self.scale_anim.setDuration(1500 + random.randint(-300, 300))
         self.scale_anim.setStartValue(1.0)
         self.scale_anim.setEndValue(1.02)  # Very slight scale up
@@ -75,19 +110,20 @@ class DraggableCardItem(QGraphicsPixmapItem):
 
         # Start animations with slight delay unless the user disabled them
         settings = QSettings("ArcanaLand", "TarotCanvas")
-        if settings.value("appearance/enable_animations", True, type=bool):
+        if autostart and settings.value("appearance/enable_animations", True, type=bool):
             QTimer.singleShot(random.randint(0, 1000), self.start_animations)
 
     def setup_wobble_animation_with_intensity(
         self, base_rotation=0, rotation_amplitude=0.8, scale_amplitude=1.02
     ):
         """Set up wobble animation with custom intensity."""
+        self.base_rotation = base_rotation
+
         # Stop any existing animation
-        if hasattr(self, "rotation_anim") and self.rotation_anim:
-            self.rotation_anim.stop()
+        self.discard_animations()
 
         # Create a sequential animation group for rotation
-        self.rotation_anim = QSequentialAnimationGroup()
+        self.rotation_anim = QSequentialAnimationGroup(self.anim_controller)
 
         # Create subtle rotation animations around the base rotation
         rot1 = QPropertyAnimation(self.anim_controller, b"rotation")
@@ -114,39 +150,161 @@ class DraggableCardItem(QGraphicsPixmapItem):
         self.rotation_anim.addAnimation(rot3)
 
         # Create a very subtle scale animation with configurable scale
-        self.scale_anim = QPropertyAnimation(self.anim_controller, b"scale")
+        self.scale_anim = QPropertyAnimation(self.anim_controller, b"scale", self.anim_controller)
         self.scale_anim.setDuration(1500 + random.randint(-300, 300))
         self.scale_anim.setStartValue(1.0)
         self.scale_anim.setEndValue(scale_amplitude)  # Configurable scale
         self.scale_anim.setLoopCount(-1)  # Loop indefinitely
         self.scale_anim.setEasingCurve(QEasingCurve.Type.InOutSine)
 
+    def discard_animations(self):
+        """Stop the wobble and release its animation objects"""
+        for anim in (self.rotation_anim, self.scale_anim):
+            if anim is not None:
+                anim.stop()
+                # Hand ownership back to Python so the old animation is freed
+                anim.setParent(None)
+        self.rotation_anim = None
+        self.scale_anim = None
+        self.update_cache_mode()
+
+    def is_wobbling(self):
+        """Check whether the card, or the stack holding it, is currently wobbling"""
+        parent = self.parentItem()
+        if isinstance(parent, DraggableCardItem) and parent.is_wobbling():
+            return True
+        return (
+            self.rotation_anim is not None
+            and self.rotation_anim.state() == QAbstractAnimation.State.Running
+        )
+
+    def update_cache_mode(self):
+        """Pick the item cache that suits the current zoom and whether the card is wobbling"""
+        views = self.scene().views() if self.scene() is not None else []
+        zoom = views[0].transform().m11() if views else 1.0
+        size = QSize()
+
+        if not self.performance_mode or zoom >= 1.0:
+            # At full size the pixmap already is the cheapest thing to draw
+            mode = QGraphicsPixmapItem.CacheMode.NoCache
+        elif self.is_wobbling():
+            # Cache a copy downscaled to its on-screen size once, so wobble
+            # ticks only rotate that instead of smoothly shrinking the full pixmap
+            mode = QGraphicsPixmapItem.CacheMode.ItemCoordinateCache
+            scaled = self.boundingRect().size() * zoom
+            size = QSize(math.ceil(scaled.width()), math.ceil(scaled.height()))
+        else:
+            # A resting card is rendered once per zoom level at device resolution
+            mode = QGraphicsPixmapItem.CacheMode.DeviceCoordinateCache
+
+        # setCacheMode() throws the cached rendering away even if nothing changed
+        if (mode, size) != (self.cacheMode(), self._cache_size):
+            self._cache_size = size
+            self.setCacheMode(mode, size)
+
+    def set_base_rotation(self, rotation):
+        """Set the rotation the card rests at (180 means reversed) and restart the wobble."""
+        # Stop the wobble first so it cannot override the new rotation
+        self.discard_animations()
+        self.setRotation(rotation)
+        self.anim_controller._rotation = rotation
+
+        if self.card_data:
+            self.card_data["reversed"] = rotation % 360 == 180
+
+        self.base_rotation = rotation
+        # Cards on a locked layer rest without wobbling
+        layers = getattr(self.parent_tab, "layers", None)
+        if layers is None or not layers.is_locked(self):
+            self.restart_wobble()
+
+        # Quarter turns change the card's footprint on the canvas
+        if self.parent_tab is not None and hasattr(self.parent_tab, "index_card"):
+            self.parent_tab.index_card(self)
+
+    def restart_wobble(self):
+        """Wobble around the resting rotation as much as the user chose, like the other cards"""
+        settings = QSettings("ArcanaLand", "TarotCanvas")
+        intensity = settings.value("appearance/animation_intensity", 50, type=int)
+        self.setup_wobble_animation_with_intensity(
+            self.base_rotation, *wobble_amplitudes(intensity)
+        )
+        if settings.value("appearance/enable_animations", True, type=bool):
+            QTimer.singleShot(random.randint(0, 1000), self.start_animations)
+
     def start_animations(self):
         """Start the wobble animations."""
+        if self.rotation_anim is None:
+            return
         self.rotation_anim.setLoopCount(-1)  # Loop indefinitely
         self.rotation_anim.start()
         # self.scale_anim.start()
+        self.update_cache_mode()
 
     def pause_animations(self):
         """Pause animations (when card is being dragged)."""
+        if self.rotation_anim is None:
+            return
         self.rotation_anim.pause()
         self.scale_anim.pause()
+        self.update_cache_mode()
 
     def resume_animations(self):
         """Resume animations after dragging stops."""
+        if self.rotation_anim is None:
+            return
         self.rotation_anim.resume()
         self.scale_anim.resume()
+        self.update_cache_mode()
 
     # Override these to pause/resume animations during drag
     def mousePressEvent(self, event):
         self.pause_animations()
         super().mousePressEvent(event)
+        # Snapshot the selection so the whole drag can be undone in one step
+        if self.parent_tab and hasattr(self.parent_tab, "begin_card_drag"):
+            self.parent_tab.begin_card_drag()
 
     def mouseReleaseEvent(self, event):
         super().mouseReleaseEvent(event)
+        if self.parent_tab and hasattr(self.parent_tab, "end_card_drag"):
+            self.parent_tab.end_card_drag()
         # Small delay before resuming animation
         QTimer.singleShot(200, self.resume_animations)
 
+    def itemChange(self, change, value):
+        """Keep the canvas spatial index in sync and snap cards while dragging"""
+        if change == QGraphicsPixmapItem.GraphicsItemChange.ItemSceneHasChanged:
+            self.update_cache_mode()
+        if self.parent_tab is not None:
+            if (
+                change == QGraphicsPixmapItem.GraphicsItemChange.ItemPositionChange
+                and self.scene() is not None
+                and self.scene().mouseGrabberItem() is self
+                and hasattr(self.parent_tab, "snap_card_position")
+            ):
+                return self.parent_tab.snap_card_position(self, value)
+            elif change in (
+                QGraphicsPixmapItem.GraphicsItemChange.ItemPositionHasChanged,
+                QGraphicsPixmapItem.GraphicsItemChange.ItemSceneHasChanged,
+                QGraphicsPixmapItem.GraphicsItemChange.ItemZValueHasChanged,
+            ) and hasattr(self.parent_tab, "index_card"):
+                self.parent_tab.index_card(self)
+        return super().itemChange(change, value)
+
+    def paint(self, painter, option, widget=None):
+        """Paint the card, using its full-resolution image while exporting"""
+        if DraggableCardItem.counting_paints:
+            DraggableCardItem.paint_count += 1
+        if DraggableCardItem.export_source is not None and self.card_data:
+            rect = QRectF(self.offset(), QSizeF(self.pixmap().deviceIndependentSize()))
+            image = DraggableCardItem.export_source(self.card_data.get("image"), rect.size())
+            if image is not None:
+                painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+                painter.drawImage(rect, image)
+                return
+        super().paint(painter, option, widget)
+
     def mouseDoubleClickEvent(self, event):
         """Handle double click events to open a card view tab"""
         if self.parent_tab and hasattr(self.parent_tab, "open_card_view"):
@@ -0,0 +1,270 @@
+import bisect
+import math
+import re
+
+from PyQt6.QtCore import QRectF, Qt, QVariantAnimation
+from PyQt6.QtGui import QColor, QKeySequence, QPainterPath, QPen, QShortcut
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QGraphicsItem,
+    QLabel,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QVBoxLayout,
+)
+
+from tarot_canvas.ui.canvas.card_stack import CardStack
+
+# Results listed by the find dialog; every match is still highlighted
+FIND_RESULT_LIMIT = 200
+
+# Length of the highlight pulse shown around matching cards
+PULSE_MS = 1200
+
+# Number of times the highlight fades in and out
+PULSE_COUNT = 2
+
+HIGHLIGHT_COLOR = QColor(255, 200, 60)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def card_tokens(card_data):
+    """Get the lower-case words a card can be found by: its id, name, suit, rank and type"""
+    card_data = card_data or {}
+    tokens = set()
+    for key in ("id", "name", "suit", "rank", "type"):
+        value = card_data.get(key)
+        if value:
+            tokens.update(_WORD.findall(str(value).lower()))
+    if card_data.get("id"):
+        tokens.add(card_data["id"].lower())
+    return tokens
+
+
+class CardSearchIndex:
+    """Index from card ids and name words to the cards placed on a canvas.
+
+    Kept up to date as cards are added, removed and stacked, so a search
+    looks up the words it was given rather than walking the scene. Words are
+    also kept sorted, so a partial word finds every word it begins with
+    through a binary search. A card in a collapsed stack is off the scene,
+    and is found through the stack showing it.
+    """
+
+    def __init__(self):
+        self._handles = {}  # card item -> item showing it (itself, or its collapsed stack)
+        self._postings = {}  # word -> set of card items
+        self._words = []  # every indexed word, sorted
+
+    def __len__(self):
+        return len(self._handles)
+
+    def handle(self, card):
+        """Get the item showing a card, or None if the card is not indexed"""
+        return self._handles.get(card)
+
+    def add(self, card, handle=None):
+        """Index a card, found through `handle` if something other than the card shows it"""
+        indexed = card in self._handles
+        self._handles[card] = handle or card
+        if indexed:
+            return
+        for word in card_tokens(card.card_data):
+            cards = self._postings.get(word)
+            if cards is None:
+                cards = self._postings[word] = set()
+                bisect.insort(self._words, word)
+            cards.add(card)
+
+    def remove(self, card):
+        if self._handles.pop(card, None) is None:
+            return
+        for word in card_tokens(card.card_data):
+            cards = self._postings.get(word)
+            if cards is None:
+                continue
+            cards.discard(card)
+            if not cards:
+                del self._postings[word]
+                del self._words[bisect.bisect_left(self._words, word)]
+
+    def sync(self, item, scene):
+        """Update the index after an item was added to, moved on or removed from a scene"""
+        if isinstance(item, CardStack):
+            if item.scene() is scene and item.collapsed:
+                for card in item.cards:
+                    if self._handles.get(card) is not item:
+                        self.add(card, item)
+            elif item.scene() is not scene:
+                for card in item.cards:
+                    if self._handles.get(card) is item:
+                        self.remove(card)
+        elif item.scene() is scene:
+            if self._handles.get(item) is not item:
+                self.add(item)
+        elif self._handles.get(item) is item:
+            # Cards leaving the scene for a collapsed stack stay indexed through it
+            self.remove(item)
+
+    def _prefixed(self, prefix):
+        """Get the cards with any word starting with a prefix"""
+        start = bisect.bisect_left(self._words, prefix)
+        end = bisect.bisect_left(self._words, prefix + "\uffff", start)
+        if end - start == 1:
+            return self._postings[self._words[start]]
+        cards = set()
+        for word in self._words[start:end]:
+            cards.update(self._postings[word])
+        return cards
+
+    def search(self, text):
+        """Find the cards matching every word of a query, as (card, handle) pairs.
+
+        Each query word matches the start of any of a card's words, so
+        "thr cup" finds the Three of Cups.
+        """
+        words = _WORD.findall(text.lower())
+        if not words:
+            return []
+
+        # Intersect from the rarest word so the work follows the number of matches
+        candidates = sorted((self._prefixed(word) for word in words), key=len)
+        matches = set(candidates[0])
+        for cards in candidates[1:]:
+            matches.intersection_update(cards)
+            if not matches:
+                return []
+        return sorted(
+            ((card, self._handles[card]) for card in matches),
+            key=lambda match: match[0].card_data.get("name", ""),
+        )
+
+
+class SearchHighlight(QGraphicsItem):
+    """Pulsing outline drawn around every matching card.
+
+    One item paints all the outlines, so highlighting thousands of matches
+    costs a single item's paint per animation frame.
+    """
+
+    def __init__(self, rects, animation_parent=None):
+        super().__init__()
+        self.rects = list(rects)
+        self._bounds = QRectF()
+        for rect in self.rects:
+            self._bounds = self._bounds.united(rect)
+        self._bounds.adjust(-12, -12, 12, 12)
+        self.setZValue(math.inf)
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+        self.setOpacity(0.0)
+
+        self.animation = QVariantAnimation(animation_parent)
+        self.animation.setDuration(PULSE_MS)
+        self.animation.setStartValue(0.0)
+        self.animation.setEndValue(float(PULSE_COUNT))
+        self.animation.valueChanged.connect(
+            lambda value: self.setOpacity(math.sin(math.pi * (value % 1.0)))
+        )
+
+    def boundingRect(self):
+        return QRectF(self._bounds)
+
+    def shape(self):
+        return QPainterPath()
+
+    def paint(self, painter, option, widget=None):
+        pen = QPen(HIGHLIGHT_COLOR, 6)
+        pen.setCosmetic(True)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        for rect in self.rects:
+            painter.drawRoundedRect(rect.adjusted(-6, -6, 6, 6), 8, 8)
+
+
+class CanvasFindDialog(QDialog):
+    """Palette-style search over the cards placed on one canvas"""
+
+    def __init__(self, canvas_tab, parent=None):
+        super().__init__(parent)
+        self.canvas_tab = canvas_tab
+        self.setWindowTitle("Find on Canvas")
+        self.setMinimumWidth(400)
+        self.setMinimumHeight(300)
+        self.setWindowFlags(Qt.WindowType.Dialog | Qt.WindowType.FramelessWindowHint)
+
+        layout = QVBoxLayout(self)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Find cards on this canvas...")
+        self.search_input.textChanged.connect(self.filter_results)
+        layout.addWidget(self.search_input)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #666; font-style: italic;")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignRight)
+        layout.addWidget(self.status_label)
+
+        self.results_list = QListWidget()
+        self.results_list.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.results_list.currentItemChanged.connect(self.on_current_changed)
+        self.results_list.itemActivated.connect(self.on_item_activated)
+        layout.addWidget(self.results_list)
+
+        self.escape_shortcut = QShortcut(QKeySequence(Qt.Key.Key_Escape), self)
+        self.escape_shortcut.activated.connect(self.close)
+        self.search_input.setFocus()
+
+    def filter_results(self):
+        """Look up the cards matching the search text and highlight all of them"""
+        matches = self.canvas_tab.find_cards(self.search_input.text())
+
+        self.results_list.blockSignals(True)
+        self.results_list.clear()
+        for card, handle in matches[:FIND_RESULT_LIMIT]:
+            name = card.card_data.get("name", "Unknown Card")
+            if handle is not card:
+                name += " (in a stack)"
+            item = QListWidgetItem(name)
+            item.setData(Qt.ItemDataRole.UserRole, handle)
+            self.results_list.addItem(item)
+        self.results_list.blockSignals(False)
+
+        if not self.search_input.text().strip():
+            self.status_label.clear()
+        elif len(matches) > FIND_RESULT_LIMIT:
+            self.status_label.setText(f"{len(matches)} matches, first {FIND_RESULT_LIMIT} listed")
+        else:
+            self.status_label.setText(f"{len(matches)} match{'es' if len(matches) != 1 else ''}")
+
+        handles = list(dict.fromkeys(handle for _, handle in matches))
+        self.canvas_tab.highlight_cards(handles)
+        if self.results_list.count():
+            self.results_list.setCurrentRow(0)
+
+    def on_current_changed(self, item, previous=None):
+        if item is not None:
+            self.canvas_tab.center_on_card(item.data(Qt.ItemDataRole.UserRole))
+
+    def on_item_activated(self, item):
+        """Select the card on the canvas and close"""
+        handle = item.data(Qt.ItemDataRole.UserRole)
+        self.canvas_tab.scene.clearSelection()
+        # Cards in an expanded stack are selected through the stack
+        handle.topLevelItem().setSelected(True)
+        self.accept()
+
+    def keyPressEvent(self, event):
+        """Move through the results with the arrow keys while typing"""
+        count = self.results_list.count()
+        if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            if self.results_list.currentItem():
+                self.on_item_activated(self.results_list.currentItem())
+            return
+        if event.key() in (Qt.Key.Key_Up, Qt.Key.Key_Down) and count:
+            step = -1 if event.key() == Qt.Key.Key_Up else 1
+            self.results_list.setCurrentRow((self.results_list.currentRow() + step) % count)
+            event.accept()
+            return
+        super().keyPressEvent(event)
@@ -0,0 +1,253 @@
+import math
+
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import (
+    QColor,
+    QFont,
+    QFontMetricsF,
+    QPainter,
+    QPainterPath,
+    QPen,
+    QPixmap,
+    QTransform,
+)
+from PyQt6.QtWidgets import QGraphicsPixmapItem
+
+from tarot_canvas.ui.canvas.card_item import DraggableCardItem
+from tarot_canvas.ui.canvas.spatial_index import resting_rect
+
+# Cards drawn as edges underneath the top card of a collapsed stack
+STACK_EDGE_LAYERS = 4
+
+# Offset between those edges, in scene units
+STACK_EDGE_OFFSET = 3
+
+# Radius of the card count badge on a collapsed stack
+STACK_BADGE_RADIUS = 14
+
+STACK_BADGE_COLOR = QColor(120, 80, 200)
+
+
+class CardStack(DraggableCardItem):
+    """Cards that move, rotate and flip together as a single canvas item.
+
+    An expanded stack keeps its cards' layout as child items of the stack, so
+    moving or flipping them is one transform, one spatial index entry and one
+    shared wobble instead of one per card. A collapsed stack takes its cards
+    off the scene altogether and paints a single pile image with a count
+    badge, so it costs one item's paint and index work however many cards it
+    holds.
+    """
+
+    def __init__(self, cards, parent_tab=None, collapsed=False):
+        self.cards = sorted(cards, key=lambda card: card.zValue())
+        self.collapsed = collapsed
+        self._bounds = QRectF()
+        super().__init__(
+            QPixmap(), {"name": f"Stack of {len(self.cards)} Cards"}, parent_tab, autostart=False
+        )
+        self.setZValue(self.cards[-1].zValue())
+
+        # Each card's place in the stack: (offset from the stack, rotation)
+        origin = QRectF()
+        for card in self.cards:
+            origin = origin.united(resting_rect(card))
+        self.setPos(origin.topLeft())
+        self._layout = [(card.pos() - origin.topLeft(), card.base_rotation) for card in self.cards]
+
+    def assemble(self, scene):
+        """Take the stack's cards off the canvas and show the stack in their place"""
+        if self.scene() is None:
+            scene.addItem(self)
+
+        for card, (offset, rotation) in zip(self.cards, self._layout, strict=True):
+            card.discard_animations()
+            card.setSelected(False)
+            card.setFlag(QGraphicsPixmapItem.GraphicsItemFlag.ItemIsMovable, False)
+            card.setFlag(QGraphicsPixmapItem.GraphicsItemFlag.ItemIsSelectable, False)
+            # Clicks on a card fall through to the stack underneath
+            card.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+            card.performance_mode = self.performance_mode
+            self._place_card(card, offset, rotation)
+
+        self._relayout()
+        self.set_base_rotation(self.base_rotation)
+
+    def release(self):
+        """Put the cards back on the canvas where the stack shows them and remove the stack"""
+        scene = self.scene()
+        transform = self._resting_transform()
+
+        for card, (offset, rotation) in zip(self.cards, self._layout, strict=True):
+            # Unparenting hands the card to Python, so re-add it for the scene to own
+            card.setParentItem(None)
+            if card.scene() is not None:
+                card.scene().removeItem(card)
+            card.setFlag(QGraphicsPixmapItem.GraphicsItemFlag.ItemIsMovable, True)
+            card.setFlag(QGraphicsPixmapItem.GraphicsItemFlag.ItemIsSelectable, True)
+            card.setAcceptedMouseButtons(Qt.MouseButton.AllButtons)
+            # Land on the stack's layer, which may lock the card again as it joins
+            card.layer = self.layer
+            scene.addItem(card)
+
+            center = card.boundingRect().center()
+            card.setPos(transform.map(offset + center) - center)
+            card.set_base_rotation((rotation + self.base_rotation) % 360)
+
+        self.discard_animations()
+        scene.removeItem(self)
+
+    def set_collapsed(self, collapsed):
+        """Switch between showing every card and showing a single pile"""
+        if collapsed == self.collapsed:
+            return
+        self.collapsed = collapsed
+        if self.scene() is not None:
+            for card, (offset, rotation) in zip(self.cards, self._layout, strict=True):
+                self._place_card(card, offset, rotation)
+            self._relayout()
+            self.update_cache_mode()
+            # The cards' entries move between the stack and the cards themselves
+            if self.parent_tab is not None and hasattr(self.parent_tab, "index_card"):
+                self.parent_tab.index_card(self)
+
+    def _place_card(self, card, offset, rotation):
+        if self.collapsed:
+            card.setParentItem(None)
+            if card.scene() is not None:
+                card.scene().removeItem(card)
+        else:
+            # Parent first, so the card is never indexed at its offset as a scene position
+            card.setParentItem(self)
+        card.setPos(offset)
+        card.setRotation(rotation)
+        card.setScale(1.0)
+        card.base_rotation = rotation
+        card.anim_controller._rotation = rotation
+
+    def _relayout(self):
+        """Recompute the stack's outline, and its pile image when collapsed"""
+        self.prepareGeometryChange()
+        if self.collapsed:
+            face, rect = self._pile_image()
+            self.setPixmap(face)
+            self.setOffset(rect.topLeft())
+            self._bounds = rect
+        else:
+            self.setPixmap(QPixmap())
+            self.setOffset(0, 0)
+            bounds = QRectF()
+            for card in self.cards:
+                bounds = bounds.united(resting_rect(card))
+            self._bounds = bounds
+
+        # Rotate about the middle of what is shown, without moving it
+        before = self._resting_transform().map(QPointF())
+        self.setTransformOriginPoint(self._bounds.center())
+        after = self._resting_transform().map(QPointF())
+        if before != after:
+            self.setPos(self.pos() + before - after)
+
+    def _resting_transform(self):
+        """Map stack coordinates to the scene at the stack's base rotation"""
+        origin = self.pos() + self.transformOriginPoint()
+        return (
+            QTransform()
+            .translate(origin.x(), origin.y())
+            .rotate(self.base_rotation)
+            .translate(-self.transformOriginPoint().x(), -self.transformOriginPoint().y())
+        )
+
+    def _pile_image(self):
+        """Draw the top card over the edges of the cards beneath it, with a count badge"""
+        top_offset, _ = self._layout[-1]
+        top = self.cards[-1].pixmap()
+        layers = [card.pixmap() for card in self.cards[-STACK_EDGE_LAYERS - 1 : -1]]
+        rotations = [rotation for _, rotation in self._layout[-len(layers) - 1 :]]
+
+        card_rect = resting_rect(self.cards[-1]).translated(-top_offset)
+        spread = STACK_EDGE_OFFSET * len(layers)
+
+        # The count sits in a pill centred on the top card's top-right corner
+        font = QFont()
+        font.setBold(True)
+        font.setPixelSize(STACK_BADGE_RADIUS)
+        count = str(len(self.cards))
+        badge_height = STACK_BADGE_RADIUS * 2
+        text_width = QFontMetricsF(font).horizontalAdvance(count)
+        badge_width = max(badge_height, 2 * math.ceil(text_width / 2 + STACK_BADGE_RADIUS / 2))
+        badge = QRectF(card_rect.width() - badge_width / 2, 0, badge_width, badge_height).adjusted(
+            1, 1, -1, -1
+        )
+
+        rect = QRectF(
+            top_offset.x() + card_rect.left(),
+            top_offset.y() + card_rect.top() - STACK_BADGE_RADIUS,
+            card_rect.width() + max(spread, badge_width / 2),
+            card_rect.height() + spread + STACK_BADGE_RADIUS,
+        )
+
+        ratio = top.devicePixelRatio()
+        face = QPixmap((rect.size() * ratio).toSize())
+        face.setDevicePixelRatio(ratio)
+        face.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(face)
+        painter.setRenderHints(
+            QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform
+        )
+        for depth, (pixmap, rotation) in enumerate(zip([*layers, top], rotations, strict=True)):
+            shift = STACK_EDGE_OFFSET * (len(layers) - depth)
+            if rotation % 360:
+                pixmap = pixmap.transformed(QTransform().rotate(rotation))
+            painter.drawPixmap(QPointF(shift, STACK_BADGE_RADIUS + shift), pixmap)
+
+        painter.setPen(QPen(QColor(255, 255, 255), 2))
+        painter.setBrush(STACK_BADGE_COLOR)
+        painter.drawRoundedRect(badge, badge.height() / 2, badge.height() / 2)
+        painter.setFont(font)
+        painter.drawText(badge, Qt.AlignmentFlag.AlignCenter, count)
+        painter.end()
+        return face, rect
+
+    def boundingRect(self):
+        return QRectF(self._bounds)
+
+    def shape(self):
+        path = QPainterPath()
+        path.addRect(self._bounds)
+        return path
+
+    def update_cache_mode(self):
+        """Pick the stack's item cache, and its cards', which wobble along with it"""
+        super().update_cache_mode()
+        for card in self.childItems():
+            if isinstance(card, DraggableCardItem):
+                card.update_cache_mode()
+
+    def paint(self, painter, option, widget=None):
+        """Paint the pile image, or just a selection outline around the expanded cards"""
+        if self.collapsed:
+            super().paint(painter, option, widget)
+        elif self.isSelected():
+            painter.setPen(QPen(QColor(220, 210, 240), 0, Qt.PenStyle.DashLine))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRect(self._bounds)
+
+    def resting_cards(self):
+        """Get (card, scene position, rotation) for each card as the stack shows it.
+
+        Cards in a collapsed stack are all placed on the top card.
+        """
+        transform = self._resting_transform()
+        top_offset, _ = self._layout[-1]
+        top_center = top_offset + self.cards[-1].boundingRect().center()
+        for card, (offset, rotation) in zip(self.cards, self._layout, strict=True):
+            center = card.boundingRect().center()
+            stack_center = top_center if self.collapsed else offset + center
+            yield card, transform.map(stack_center) - center, (rotation + self.base_rotation) % 360
+
+    def mouseDoubleClickEvent(self, event):
+        """Expand a collapsed stack, or collapse an expanded one"""
+        self.set_collapsed(not self.collapsed)
+        event.accept()
@@ -1,5 +1,36 @@
+from array import array
+
 from PyQt6.QtGui import QUndoCommand
 
+# Maximum number of steps kept on a canvas undo stack
+UNDO_LIMIT = 200
+
+# Command id - QUndoStack only offers mergeWith() to commands sharing an id
+CARD_DRAG_ID = 1
+
+# Number of packed values stored per card in a layout buffer (x, y, rotation)
+LAYOUT_STRIDE = 3
+
+
+def capture_layout(items):
+    """Pack the position and base rotation of each item into a flat array"""
+    state = array("d")
+    for item in items:
+        pos = item.pos()
+        state.extend((pos.x(), pos.y(), item.base_rotation))
+    return state
+
+
+def apply_layout(items, state):
+    """Restore positions and rotations previously packed by capture_layout"""
+    for i, item in enumerate(items):
+        offset = i * LAYOUT_STRIDE
+        item.setPos(state[offset], state[offset + 1])
+
+        rotation = state[offset + 2]
+        if rotation != item.base_rotation:
+            item.set_base_rotation(rotation)
+
 
 class CardMoveCommand(QUndoCommand):
     """Undo command for card movements"""
@@ -16,3 +47,122 @@ class CardMoveCommand(QUndoCommand):
 
     def redo(self):
         self.item.setPos(self.new_pos)
+
+
+class CardLayoutCommand(QUndoCommand):
+    """Undo command restoring the layout of any number of cards in one step.
+
+    Positions and rotations live in two packed ``array('d')`` buffers, so
+    undoing a re-layout of hundreds of cards is a single command rather than
+    one QUndoCommand (and two QPointFs) per card.
+    """
+
+    def __init__(self, items, old_state, new_state, text="Arrange Cards", mergeable=False):
+        super().__init__()
+        self.items = tuple(items)
+        self.old_state = old_state
+        self.new_state = new_state
+        self.mergeable = mergeable
+        self.setText(text)
+
+    def id(self):
+        # -1 tells QUndoStack never to try merging this command
+        return CARD_DRAG_ID if self.mergeable else -1
+
+    def mergeWith(self, other):
+        """Merge consecutive drags of the same set of cards"""
+        if not other.mergeable or other.items != self.items:
+            return False
+        self.new_state = other.new_state
+        self.setObsolete(self.old_state == self.new_state)
+        return True
+
+    def undo(self):
+        apply_layout(self.items, self.old_state)
+
+    def redo(self):
+        apply_layout(self.items, self.new_state)
+
+
+class CardAddCommand(QUndoCommand):
+    """Undo command for adding one or more cards to a scene"""
+
+    def __init__(self, scene, items, text="Add Cards"):
+        super().__init__()
+        self.scene = scene
+        self.items = tuple(items)
+        self.setText(text)
+        self._removed = False
+
+    def undo(self):
+        _remove_items(self.scene, self.items)
+        self._removed = True
+
+    def redo(self):
+        # Freshly created cards already have their wobble scheduled
+        _add_items(self.scene, self.items, restart_wobble=self._removed)
+
+
+class CardRemoveCommand(QUndoCommand):
+    """Undo command for removing one or more cards from a scene"""
+
+    def __init__(self, scene, items, text="Remove Cards"):
+        super().__init__()
+        self.scene = scene
+        self.items = tuple(items)
+        self.setText(text)
+
+    def undo(self):
+        _add_items(self.scene, self.items, restart_wobble=True)
+
+    def redo(self):
+        _remove_items(self.scene, self.items)
+
+
+class CardGroupCommand(QUndoCommand):
+    """Undo command gathering cards into a stack"""
+
+    def __init__(self, scene, stack, text="Group Cards"):
+        super().__init__()
+        self.scene = scene
+        self.stack = stack
+        self.setText(text)
+
+    def undo(self):
+        self.stack.release()
+
+    def redo(self):
+        self.stack.assemble(self.scene)
+
+
+class CardUngroupCommand(QUndoCommand):
+    """Undo command breaking a stack back up into its cards"""
+
+    def __init__(self, scene, stack, text="Ungroup Cards"):
+        super().__init__()
+        self.scene = scene
+        self.stack = stack
+        self.setText(text)
+
+    def undo(self):
+        self.stack.assemble(self.scene)
+
+    def redo(self):
+        self.stack.release()
+
+
+def _add_items(scene, items, restart_wobble):
+    for item in items:
+        if item.scene() is None:
+            scene.addItem(item)
+            if restart_wobble:
+                # Restart the wobble that was stopped when the card was removed
+                item.set_base_rotation(item.base_rotation)
+
+
+def _remove_items(scene, items):
+    for item in items:
+        if item.scene() is scene:
+            # Cards parked on the undo stack should not keep animating
+            item.discard_animations()
+            scene.removeItem(item)
@@ -0,0 +1,201 @@
+import json
+import time
+from collections import deque
+
+from PyQt6.QtCore import QAbstractAnimation, Qt, QTimer
+from PyQt6.QtGui import QColor, QFont, QPainter, QPixmapCache
+from PyQt6.QtWidgets import QWidget
+
+from tarot_canvas.ui.canvas.card_item import DraggableCardItem
+from tarot_canvas.utils.image_cache import ImageCache
+
+# Number of recent frames the statistics are taken over
+FRAME_WINDOW = 120
+
+# Frames slower than this miss a 60 Hz display refresh
+FRAME_BUDGET_MS = 1000 / 60
+
+# How often the overlay text is refreshed, and counters are added to a trace
+OVERLAY_REFRESH_MS = 250
+
+
+class FrameStats:
+    """Rolling paint statistics for a view, with optional trace recording"""
+
+    def __init__(self, window=FRAME_WINDOW):
+        # (start time, paint seconds, cards painted) for the most recent frames
+        self.frames = deque(maxlen=window)
+        self._trace = None
+        self._trace_start = 0.0
+
+    def add_frame(self, start, duration, painted):
+        """Record one paint of the view"""
+        self.frames.append((start, duration, painted))
+        if self._trace is not None:
+            self._trace.append(
+                {
+                    "name": "paint",
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": 1,
+                    "ts": round((start - self._trace_start) * 1e6),
+                    "dur": round(duration * 1e6),
+                    "args": {"cards_painted": painted},
+                }
+            )
+
+    def add_counters(self, **counters):
+        """Record counter values (e.g. running animations) into the trace"""
+        if self._trace is not None:
+            self._trace.append(
+                {
+                    "name": "canvas",
+                    "ph": "C",
+                    "pid": 1,
+                    "ts": round((time.perf_counter() - self._trace_start) * 1e6),
+                    "args": counters,
+                }
+            )
+
+    def fps(self):
+        """Get the number of frames painted in the last second"""
+        cutoff = time.perf_counter() - 1.0
+        return float(sum(1 for start, _, _ in self.frames if start >= cutoff))
+
+    def paint_ms(self):
+        """Get the (average, worst) paint time in milliseconds"""
+        if not self.frames:
+            return 0.0, 0.0
+        durations = [duration for _, duration, _ in self.frames]
+        return sum(durations) / len(durations) * 1000, max(durations) * 1000
+
+    def cards_per_frame(self):
+        if not self.frames:
+            return 0.0
+        return sum(painted for _, _, painted in self.frames) / len(self.frames)
+
+    def over_budget(self):
+        """Get how many frames in the window took longer than a 60 Hz frame"""
+        budget = FRAME_BUDGET_MS / 1000
+        return sum(1 for _, duration, _ in self.frames if duration > budget)
+
+    @property
+    def recording(self):
+        return self._trace is not None
+
+    def start_recording(self):
+        self._trace = []
+        self._trace_start = time.perf_counter()
+
+    def stop_recording(self, path):
+        """Stop recording and write the trace in Chrome trace event format.
+
+        The file opens in chrome://tracing or https://ui.perfetto.dev.
+        """
+        trace, self._trace = self._trace or [], None
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        return len(trace)
+
+
+class DiagnosticsOverlay(QWidget):
+    """Frame timing readout drawn over the top-left corner of a view"""
+
+    def __init__(self, view, stats):
+        super().__init__(view)
+        self.view = view
+        self.stats = stats
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        # Opaque, so refreshing the readout never repaints the canvas beneath it
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setFont(QFont("monospace", 8))
+        self.lines = []
+        # Optional callable reporting the canvas' own and shared image memory
+        self.memory_usage = None
+
+        # Runs while the readout is shown or a trace is being recorded
+        self._timer = QTimer(self)
+        self._timer.setInterval(OVERLAY_REFRESH_MS)
+        self._timer.timeout.connect(self.tick)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._timer.start()
+        self.refresh()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if not self.stats.recording:
+            self._timer.stop()
+
+    def start_recording(self):
+        """Record frame timings and counters into a trace, shown or not"""
+        self.stats.start_recording()
+        self._timer.start()
+        self.tick()
+
+    def stop_recording(self, path):
+        """Stop recording and write the trace, returning the number of events"""
+        if not self.isVisible():
+            self._timer.stop()
+        return self.stats.stop_recording(path)
+
+    def tick(self):
+        if self.isVisible():
+            self.refresh()
+        else:
+            self.sample_counters()
+
+    def sample_counters(self):
+        """Get (cards, running animations, image cache MiB), adding them to any trace"""
+        cards = [item for item in self.view.scene().items() if isinstance(item, DraggableCardItem)]
+        animating = sum(
+            1
+            for item in cards
+            if item.rotation_anim is not None
+            and item.rotation_anim.state() == QAbstractAnimation.State.Running
+        )
+        cache_mib = ImageCache.get_instance().size_in_bytes() / (1024 * 1024)
+        self.stats.add_counters(cards=len(cards), animations=animating, image_cache_mib=cache_mib)
+        return len(cards), animating, cache_mib
+
+    def refresh(self):
+        """Recompute the readout"""
+        cards, animating, cache_mib = self.sample_counters()
+        image_cache = ImageCache.get_instance()
+        average, worst = self.stats.paint_ms()
+
+        self.lines = [
+            f"{self.stats.fps():3.0f} fps",
+            f"paint {average:5.2f} ms avg, {worst:5.2f} ms max",
+            f"{self.stats.over_budget()} of last {len(self.stats.frames)} frames over 16.7 ms",
+            f"{self.stats.cards_per_frame():.1f} of {cards} cards painted per frame",
+            f"{animating} animations running",
+            f"image cache {cache_mib:.1f} MiB in {len(image_cache)} images",
+            f"pixmap cache limit {QPixmapCache.cacheLimit() // 1024} MiB",
+            "recording trace (Ctrl+F12 to stop)"
+            if self.stats.recording
+            else "Ctrl+F12 to record a trace",
+        ]
+        if self.memory_usage is not None:
+            usage = self.memory_usage()
+            self.lines.insert(
+                -2,
+                f"canvas owns {usage['owned_bytes'] / (1024 * 1024):.1f} MiB, "
+                f"shares {usage['shared_bytes'] / (1024 * 1024):.1f} MiB",
+            )
+
+        metrics = self.fontMetrics()
+        width = max(metrics.horizontalAdvance(line) for line in self.lines) + 16
+        self.resize(width, metrics.lineSpacing() * len(self.lines) + 12)
+        self.move(self.view.viewport().geometry().topLeft())
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(15, 10, 30))
+        painter.setPen(QColor(200, 240, 200))
+        metrics = self.fontMetrics()
+        for i, line in enumerate(self.lines):
+            painter.drawText(8, 6 + metrics.ascent() + i * metrics.lineSpacing(), line)
+        painter.end()
@@ -0,0 +1,340 @@
+import argparse
+import json
+import math
+import os
+import struct
+import sys
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+from PyQt6.QtCore import QMarginsF, QRectF, QSize, QSizeF, Qt
+from PyQt6.QtGui import QImage, QImageReader, QPageLayout, QPageSize, QPainter, QPdfWriter
+from PyQt6.QtSvg import QSvgGenerator
+from PyQt6.QtWidgets import QApplication, QGraphicsScene
+
+from tarot_canvas.ui.canvas.card_item import DraggableCardItem
+from tarot_canvas.ui.canvas.card_stack import CardStack
+from tarot_canvas.utils.image_cache import ImageCache
+
+# Scene units are treated as screen pixels at this resolution
+SCENE_DPI = 96
+
+# Upper bound for one rendered PNG strip
+STRIP_BYTES = 32 * 1024 * 1024
+
+# Upper bound for full-resolution card images held while exporting
+SOURCE_IMAGE_BYTES = 256 * 1024 * 1024
+
+# Blank space left around the cards when exporting the whole board
+EXPORT_MARGIN = 40
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+EXPORT_FORMATS = (".png", ".pdf", ".svg")
+
+
+class _SourceImages:
+    """Full-resolution card images scaled to the export resolution.
+
+    Images are decoded on demand as tiles reach them and evicted least
+    recently used first, so memory stays bounded however many cards there are.
+    """
+
+    def __init__(self, scale, budget=SOURCE_IMAGE_BYTES):
+        self.scale = scale
+        self.budget = budget
+        self._images = OrderedDict()  # (path, width, height) -> QImage
+        self._bytes = 0
+
+    def get(self, path, size):
+        """Get the image for a card painted at `size` scene units, or None"""
+        if not path or not os.path.exists(path):
+            return None
+
+        width = max(1, round(size.width() * self.scale))
+        height = max(1, round(size.height() * self.scale))
+        key = (path, width, height)
+
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        source_size = reader.size()
+        if source_size.width() > width or source_size.height() > height:
+            # Let the decoder downscale rather than decoding the full image first
+            reader.setScaledSize(
+                source_size.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio)
+            )
+        image = reader.read()
+        if image.isNull():
+            return None
+
+        self._images[key] = image
+        self._bytes += image.sizeInBytes()
+        while self._bytes > self.budget and len(self._images) > 1:
+            _, evicted = self._images.popitem(last=False)
+            self._bytes -= evicted.sizeInBytes()
+        return image
+
+
+@contextmanager
+def high_resolution_cards(scene, scale):
+    """Make card items paint their source image at `scale` output pixels per scene unit"""
+    cards = [item for item in scene.items() if isinstance(item, DraggableCardItem)]
+    # A card's item cache holds it at its on-screen size, and rendering
+    # draws that cache rather than calling paint(), so turn caching off
+    for card in cards:
+        card.setCacheMode(DraggableCardItem.CacheMode.NoCache)
+    previous = DraggableCardItem.export_source
+    DraggableCardItem.export_source = _SourceImages(scale).get
+    try:
+        yield
+    finally:
+        DraggableCardItem.export_source = previous
+        for card in cards:
+            card.update_cache_mode()
+
+
+def content_rect(scene, margin=EXPORT_MARGIN):
+    """Get the scene area covered by items, plus a margin"""
+    rect = scene.itemsBoundingRect()
+    if rect.isEmpty():
+        return scene.sceneRect()
+    return rect.adjusted(-margin, -margin, margin, margin)
+
+
+def export_scene(scene, path, dpi=300, source_rect=None, progress=None):
+    """Export a scene to PNG, PDF or SVG depending on the file extension.
+
+    `progress`, if given, is called with (tiles done, total tiles).
+    """
+    exporters = {".png": export_png, ".pdf": export_pdf, ".svg": export_svg}
+    suffix = Path(path).suffix.lower()
+    if suffix not in exporters:
+        raise ValueError(f"Unsupported export format: {suffix or path}")
+    exporters[suffix](scene, path, dpi, source_rect, progress)
+
+
+def export_png(scene, path, dpi=300, source_rect=None, progress=None):
+    """Render a scene into a PNG one horizontal strip at a time.
+
+    Each strip is filtered and fed to a streaming zlib compressor as soon as it
+    is rendered, so only one strip is ever held in memory.
+    """
+    rect = source_rect or content_rect(scene)
+    scale = dpi / SCENE_DPI
+    width = max(1, math.ceil(rect.width() * scale))
+    height = max(1, math.ceil(rect.height() * scale))
+    row_bytes = width * 4
+    strip_height = max(1, min(height, STRIP_BYTES // row_bytes))
+    strips = math.ceil(height / strip_height)
+
+    compressor = zlib.compressobj(6)
+    strip = QImage(width, strip_height, QImage.Format.Format_RGBA8888)
+
+    with open(path, "wb") as f, high_resolution_cards(scene, scale):
+        f.write(PNG_SIGNATURE)
+        # 8-bit RGBA, no interlacing
+        _write_png_chunk(f, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+        pixels_per_metre = round(dpi / 0.0254)
+        _write_png_chunk(f, b"pHYs", struct.pack(">IIB", pixels_per_metre, pixels_per_metre, 1))
+
+        for index in range(strips):
+            top = index * strip_height
+            rows = min(strip_height, height - top)
+
+            strip.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(strip)
+            painter.setRenderHints(
+                QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform
+            )
+            scene.render(
+                painter,
+                QRectF(0, 0, width, rows),
+                QRectF(rect.left(), rect.top() + top / scale, width / scale, rows / scale),
+            )
+            painter.end()
+
+            pixels = strip.constBits()
+            pixels.setsize(strip.sizeInBytes())
+            pixels = pixels.asstring()
+            stride = strip.bytesPerLine()
+            # Each scanline is prefixed with its filter type, 0 (none)
+            scanlines = b"".join(
+                b"\x00" + pixels[row * stride : row * stride + row_bytes] for row in range(rows)
+            )
+
+            data = compressor.compress(scanlines)
+            if data:
+                _write_png_chunk(f, b"IDAT", data)
+            if progress:
+                progress(index + 1, strips)
+
+        _write_png_chunk(f, b"IDAT", compressor.flush())
+        _write_png_chunk(f, b"IEND", b"")
+
+
+def _write_png_chunk(f, kind, data):
+    f.write(struct.pack(">I", len(data)))
+    f.write(kind)
+    f.write(data)
+    f.write(struct.pack(">I", zlib.crc32(kind + data)))
+
+
+def export_pdf(scene, path, dpi=300, source_rect=None, progress=None, page_size=None):
+    """Render a scene into a PDF.
+
+    Without a page size the board goes on a single page of its own size;
+    with one (e.g. QPageSize.PageSizeId.A4) it is tiled across several pages
+    at the chosen resolution.
+    """
+    rect = source_rect or content_rect(scene)
+    scale = dpi / SCENE_DPI
+
+    writer = QPdfWriter(str(path))
+    writer.setCreator("Tarot Canvas")
+    writer.setResolution(dpi)
+
+    if page_size is None:
+        points = 72 / SCENE_DPI
+        writer.setPageSize(
+            QPageSize(QSizeF(rect.width() * points, rect.height() * points), QPageSize.Unit.Point)
+        )
+        writer.setPageMargins(QMarginsF(0, 0, 0, 0), QPageLayout.Unit.Point)
+        tiles = [rect]
+    else:
+        writer.setPageSize(QPageSize(page_size))
+        writer.setPageMargins(QMarginsF(0, 0, 0, 0), QPageLayout.Unit.Point)
+        page = writer.pageLayout().paintRectPixels(dpi)
+        tiles = list(_tiles(rect, page.width() / scale, page.height() / scale))
+
+    painter = QPainter(writer)
+    painter.setRenderHints(
+        QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform
+    )
+    with high_resolution_cards(scene, scale):
+        for index, tile in enumerate(tiles):
+            if index:
+                writer.newPage()
+            scene.render(painter, QRectF(0, 0, tile.width() * scale, tile.height() * scale), tile)
+            if progress:
+                progress(index + 1, len(tiles))
+    painter.end()
+
+
+def _tiles(rect, tile_width, tile_height):
+    """Split a rect into tiles, row by row"""
+    for row in range(math.ceil(rect.height() / tile_height)):
+        for column in range(math.ceil(rect.width() / tile_width)):
+            left = rect.left() + column * tile_width
+            top = rect.top() + row * tile_height
+            yield QRectF(
+                left,
+                top,
+                min(tile_width, rect.right() - left),
+                min(tile_height, rect.bottom() - top),
+            )
+
+
+def export_svg(scene, path, dpi=300, source_rect=None, progress=None):
+    """Render a scene into an SVG, embedding card images at the given resolution"""
+    rect = source_rect or content_rect(scene)
+    scale = dpi / SCENE_DPI
+    width = max(1, math.ceil(rect.width() * scale))
+    height = max(1, math.ceil(rect.height() * scale))
+
+    generator = QSvgGenerator()
+    generator.setFileName(str(path))
+    generator.setTitle("Tarot Canvas")
+    generator.setResolution(dpi)
+    generator.setSize(QSize(width, height))
+    generator.setViewBox(QRectF(0, 0, width, height))
+
+    painter = QPainter(generator)
+    with high_resolution_cards(scene, scale):
+        scene.render(painter, QRectF(0, 0, width, height), rect)
+    painter.end()
+    if progress:
+        progress(1, 1)
+
+
+def scene_layout(scene):
+    """Describe the cards on a scene as JSON-compatible data"""
+    cards = []
+    for item in scene.items(Qt.SortOrder.AscendingOrder):
+        if not isinstance(item, DraggableCardItem) or item.parentItem() is not None:
+            continue
+        if isinstance(item, CardStack):
+            placements = item.resting_cards()
+        else:
+            placements = [(item, item.pos(), item.base_rotation)]
+
+        for card, pos, rotation in placements:
+            rect = card.boundingRect()
+            cards.append(
+                {
+                    "name": card.card_data.get("name", ""),
+                    "image": card.card_data.get("image", ""),
+                    "x": pos.x(),
+                    "y": pos.y(),
+                    "width": rect.width(),
+                    "height": rect.height(),
+                    "rotation": rotation,
+                    "z": item.zValue(),
+                }
+            )
+    return {"cards": cards}
+
+
+def scene_from_layout(layout):
+    """Build a static scene from data produced by scene_layout()"""
+    scene = QGraphicsScene()
+    cache = ImageCache.get_instance()
+    for card in layout.get("cards", []):
+        pixmap = cache.get_scaled(card["image"], round(card["width"]), round(card["height"]))
+        if pixmap.isNull():
+            print(f"Card image not found: {card['image']}")
+            continue
+
+        item = DraggableCardItem(
+            pixmap, {"name": card.get("name", ""), "image": card["image"]}, autostart=False
+        )
+        item.discard_animations()
+        item.setPos(card["x"], card["y"])
+        item.setRotation(card.get("rotation", 0))
+        item.base_rotation = card.get("rotation", 0)
+        item.setZValue(card.get("z", 0))
+        scene.addItem(item)
+    return scene
+
+
+def main(argv=None):
+    """Export saved card layouts without opening the application window"""
+    parser = argparse.ArgumentParser(description="Export Tarot Canvas layouts to PNG, PDF or SVG")
+    parser.add_argument("layouts", nargs="+", help="layout JSON files saved from a canvas")
+    parser.add_argument("--format", choices=[f[1:] for f in EXPORT_FORMATS], default="png")
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--output-dir", default=".", help="directory for the exported files")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    for layout_path in args.layouts:
+        with open(layout_path) as f:
+            scene = scene_from_layout(json.load(f))
+        output = output_dir / f"{Path(layout_path).stem}.{args.format}"
+        export_scene(scene, output, dpi=args.dpi)
+        print(f"Exported {layout_path} to {output}")
+
+
+if __name__ == "__main__":
+    main()
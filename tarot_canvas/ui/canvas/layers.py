@@ -0,0 +1,295 @@
+from contextlib import contextmanager
+
+from PyQt6.QtCore import QPointF, QRectF, QSizeF, Qt
+from PyQt6.QtGui import QPainter, QPixmap, QTransform
+from PyQt6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+
+from tarot_canvas.ui.canvas.card_stack import CardStack
+from tarot_canvas.utils.image_cache import pixmap_size_in_bytes
+
+
+class CanvasLayer:
+    """A named set of canvas items that are shown, hidden and locked together"""
+
+    def __init__(self, name):
+        self.name = name
+        self.visible = True
+        self.locked = False
+        self.items = {}  # top-level item -> None, in the order the items joined
+
+        # Rendering of a static layer, covering `cache_rect` of the scene
+        self.cache = None
+        self.cache_rect = QRectF()
+        self.cache_transform = QTransform()
+        self._bounds = None
+
+    def bounds(self):
+        """Get the scene area covered by the layer's items"""
+        if self._bounds is None:
+            self._bounds = QRectF()
+            for item in self.items:
+                self._bounds = self._bounds.united(_painted_rect(item))
+        return QRectF(self._bounds)
+
+
+def _painted_rect(item):
+    """Get the scene area an item and its children paint"""
+    return item.mapRectToScene(item.boundingRect().united(item.childrenBoundingRect()))
+
+
+class CanvasLayers:
+    """The layers of one canvas, bottom first, drawing static layers from a cache.
+
+    New cards join the active layer. A locked layer's cards cannot be
+    selected or moved and do not wobble, so while the layer lies wholly
+    below or wholly above every unlocked layer it is painted once into a
+    pixmap and its cards are hidden from the scene. The view draws that
+    pixmap behind or over the live cards, so repainting under a dragged card
+    copies pixels rather than painting the static cards again. The pixmap is
+    redrawn only when one of the layer's cards changes, or when the view
+    zooms or scrolls past the area it covers.
+    """
+
+    def __init__(self, scene, view):
+        self.scene = scene
+        self.view = view
+        self.layers = [CanvasLayer("Layer 1")]
+        self.active = self.layers[0]
+        self._below = []  # static layers drawn behind the live cards
+        self._above = []  # and over them
+        self.visibility_changed = None  # called with the items a layer showed or hid
+        view.layer_painter = self
+
+    def layer_of(self, item):
+        """Get the layer a top-level item belongs to, or None"""
+        layer = item.layer
+        return layer if layer in self.layers and item in layer.items else None
+
+    def is_locked(self, item):
+        layer = self.layer_of(item)
+        return layer is not None and layer.locked
+
+    def is_hidden(self, item):
+        """Check whether an item, or the stack holding it, is on a hidden layer"""
+        layer = self.layer_of(item.topLevelItem())
+        return layer is not None and not layer.visible
+
+    def is_cached(self, layer):
+        return layer in self._below or layer in self._above
+
+    def sync(self, item):
+        """Update the layers after an item was added to, moved on or removed from the scene"""
+        layer = item.layer
+        if item.scene() is not self.scene or item.parentItem() is not None:
+            # The item keeps its layer, so undoing a removal puts it back there
+            if layer is not None and item in layer.items:
+                del layer.items[item]
+                self.invalidate(layer)
+            return
+
+        if layer is None and isinstance(item, CardStack):
+            # A new stack stays on the layer of the cards it was made from
+            layer = item.cards[-1].layer
+        if layer not in self.layers:
+            layer = self.active
+        if item in layer.items:
+            self.invalidate(layer)
+        else:
+            self._join(item, layer)
+
+    def _join(self, item, layer):
+        item.layer = layer
+        layer.items[item] = None
+        self._apply_state(item, layer)
+        self.invalidate(layer)
+
+    def _apply_state(self, item, layer):
+        """Make an item selectable, movable, animated and visible as its layer says"""
+        item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, not layer.locked)
+        item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, not layer.locked)
+        if layer.locked:
+            item.setSelected(False)
+            if item.rotation_anim is not None:
+                item.discard_animations()
+                item.setRotation(item.base_rotation)
+        elif item.rotation_anim is None:
+            item.restart_wobble()
+        item.setVisible(layer.visible and not self.is_cached(layer))
+
+    def add_layer(self, name):
+        """Add an empty layer on top of the others and make it the active one"""
+        layer = CanvasLayer(name)
+        self.layers.append(layer)
+        self.active = layer
+        self._refresh()
+        return layer
+
+    def remove_layer(self, layer):
+        """Remove a layer, moving its items to the layer beneath it"""
+        if len(self.layers) < 2:
+            raise ValueError("A canvas needs at least one layer")
+        index = self.layers.index(layer)
+        target = self.layers[index - 1] if index else self.layers[1]
+        self.layers.remove(layer)
+        if self.active is layer:
+            self.active = target if not target.locked else self._live_layer()
+        self.move_items(list(layer.items), target)
+        layer.items.clear()
+        self._refresh()
+
+    def _live_layer(self):
+        """Get the topmost unlocked layer, unlocking the top layer if there is none"""
+        for layer in reversed(self.layers):
+            if not layer.locked:
+                return layer
+        self.layers[-1].locked = False
+        return self.layers[-1]
+
+    def move_layer(self, layer, offset):
+        """Move a layer up (positive offset) or down the stack of layers"""
+        index = self.layers.index(layer)
+        new_index = max(0, min(len(self.layers) - 1, index + offset))
+        if new_index != index:
+            self.layers.insert(new_index, self.layers.pop(index))
+            self._refresh()
+
+    def set_active(self, layer):
+        """Place new cards on a layer from now on, unlocking it if needed"""
+        self.active = layer
+        if layer.locked:
+            self.set_locked(layer, False)
+
+    def set_visible(self, layer, visible):
+        if layer.visible != visible:
+            layer.visible = visible
+            self._refresh()
+            self._visibility_changed(list(layer.items))
+
+    def set_locked(self, layer, locked):
+        if locked and layer is self.active:
+            raise ValueError("The active layer cannot be locked")
+        if layer.locked != locked:
+            layer.locked = locked
+            self._refresh()
+
+    def move_items(self, items, layer):
+        """Move top-level items to another layer"""
+        moved = []
+        for item in items:
+            old_layer = self.layer_of(item)
+            if old_layer is layer:
+                continue
+            if old_layer is not None:
+                del old_layer.items[item]
+                self.invalidate(old_layer)
+            self._join(item, layer)
+            if old_layer is None or old_layer.visible != layer.visible:
+                moved.append(item)
+        self._visibility_changed(moved)
+
+    def _visibility_changed(self, items):
+        if items and self.visibility_changed is not None:
+            self.visibility_changed(items)
+
+    def _refresh(self):
+        """Work out which layers are static, and re-apply every layer's state to its items"""
+        live = [index for index, layer in enumerate(self.layers) if not layer.locked]
+        self._below = self.layers[: live[0]] if live else list(self.layers)
+        self._above = self.layers[live[-1] + 1 :] if live else []
+        for layer in self.layers:
+            layer.cache = None
+            for item in layer.items:
+                self._apply_state(item, layer)
+        self.view.resetCachedContent()
+        self.view.viewport().update()
+
+    def invalidate(self, layer):
+        """Forget a layer's bounds and cached rendering after one of its items changed"""
+        layer._bounds = None
+        if self.is_cached(layer):
+            layer.cache = None
+            self.view.resetCachedContent()
+            self.view.viewport().update()
+
+    @contextmanager
+    def showing_all(self):
+        """Show the cards of static layers on the scene itself, e.g. while exporting it"""
+        hidden = [
+            item for layer in self._below + self._above if layer.visible for item in layer.items
+        ]
+        for item in hidden:
+            item.setVisible(True)
+        try:
+            yield
+        finally:
+            for item in hidden:
+                item.setVisible(False)
+
+    def cache_bytes(self):
+        """Get the memory held by the static layers' cached renderings"""
+        return sum(pixmap_size_in_bytes(layer.cache) for layer in self.layers if layer.cache)
+
+    def paint(self, painter, rect, above=False):
+        """Draw the static layers below (or above) the live cards into an exposed scene rect"""
+        layers = [layer for layer in (self._above if above else self._below) if layer.visible]
+        if not layers:
+            return
+        transform = self.view.viewportTransform()
+        visible = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        for layer in layers:
+            needed = layer.bounds().intersected(visible)
+            if needed.isEmpty():
+                continue
+            if (
+                layer.cache is None
+                or layer.cache_transform.m11() != transform.m11()
+                or layer.cache_transform.m22() != transform.m22()
+                or not layer.cache_rect.contains(needed)
+            ):
+                self._render(layer, transform, visible)
+            if not layer.cache_rect.intersects(rect):
+                continue
+
+            # Copy the cache pixel for pixel; the painter's clip limits it to the exposed area
+            top_left = painter.worldTransform().map(layer.cache_rect.topLeft())
+            painter.save()
+            painter.resetTransform()
+            painter.drawPixmap(QPointF(round(top_left.x()), round(top_left.y())), layer.cache)
+            painter.restore()
+
+    def _render(self, layer, transform, visible):
+        """Paint a layer's items into its cache, covering the view and half a view around it"""
+        margin_x, margin_y = visible.width() / 2, visible.height() / 2
+        area = layer.bounds().intersected(
+            visible.adjusted(-margin_x, -margin_y, margin_x, margin_y)
+        )
+
+        # Cover whole device pixels, so the cache is drawn without resampling
+        device = transform.mapRect(area).toAlignedRect()
+        layer.cache_rect = transform.inverted()[0].mapRect(QRectF(device))
+        layer.cache_transform = QTransform(transform)
+
+        ratio = self.view.devicePixelRatioF()
+        pixmap = QPixmap((QSizeF(device.size()) * ratio).toSize())
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        origin = transform * QTransform.fromTranslate(-device.x(), -device.y())
+        option = QStyleOptionGraphicsItem()
+        for item in sorted(layer.items, key=lambda item: item.zValue()):
+            if _painted_rect(item).intersects(layer.cache_rect):
+                self._paint_item(painter, item, origin, option, 1.0)
+        painter.end()
+        layer.cache = pixmap
+
+    def _paint_item(self, painter, item, origin, option, opacity):
+        """Paint an item and its children the way the scene would"""
+        opacity *= item.opacity()
+        painter.setTransform(item.sceneTransform() * origin)
+        painter.setOpacity(opacity)
+        item.paint(painter, option, None)
+        for child in sorted(item.childItems(), key=lambda child: child.zValue()):
+            if child.isVisibleTo(item):
+                self._paint_item(painter, child, origin, option, opacity)
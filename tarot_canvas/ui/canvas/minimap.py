@@ -0,0 +1,233 @@
+from PyQt6.QtCore import QEvent, QPointF, QRectF, QSize, Qt, QTimer
+from PyQt6.QtGui import QColor, QImage, QPainter, QPen, QTransform
+from PyQt6.QtWidgets import QWidget
+
+from tarot_canvas.utils.image_cache import pixmap_size_in_bytes
+
+# Size of the overview in screen pixels
+MINIMAP_SIZE = QSize(200, 150)
+
+# Gap between the minimap and the corner of the view
+MINIMAP_MARGIN = 10
+
+# Card changes are batched for this long before the overview is patched
+MINIMAP_REFRESH_MS = 100
+
+MINIMAP_BACKGROUND = QColor(20, 14, 36, 200)
+MINIMAP_VIEWPORT = QColor(220, 210, 240)
+
+
+def _resting_transform(item):
+    """Map a card to the scene at its base rotation, ignoring the wobble animation"""
+    origin = item.transformOriginPoint()
+    pos = item.pos()
+    return (
+        QTransform()
+        .translate(pos.x() + origin.x(), pos.y() + origin.y())
+        .rotate(getattr(item, "base_rotation", 0))
+        .translate(-origin.x(), -origin.y())
+    )
+
+
+class CanvasMinimap(QWidget):
+    """Overview of the whole canvas in the corner of a view.
+
+    The overview is a small cached image built from downscaled card
+    thumbnails and the canvas spatial index, never by rendering the scene.
+    The canvas reports every card it adds, moves, turns or removes through
+    sync(), and only the areas the card left and entered are redrawn, so
+    the cost follows what moved rather than how many cards are on the
+    board. Cards are drawn at their resting rotation, so the wobble
+    animation never causes a redraw.
+    """
+
+    def __init__(self, view, spatial_index, size=MINIMAP_SIZE):
+        super().__init__(view)
+        self.view = view
+        self.spatial_index = spatial_index
+        self.setFixedSize(size)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+
+        self._image = QImage(size, QImage.Format.Format_ARGB32_Premultiplied)
+        self._scene_rect = QRectF()  # scene area covered by the image
+        self._to_minimap = QTransform()
+        self._thumbnails = {}  # (pixmap cache key, width, height) -> QPixmap
+        self._dirty = []  # scene rects waiting to be redrawn
+        self._footprints = {}  # item -> (rect, rotation, z) it was last synced at
+        self._needs_rebuild = True
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(MINIMAP_REFRESH_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+        view.horizontalScrollBar().valueChanged.connect(self.update)
+        view.verticalScrollBar().valueChanged.connect(self.update)
+        if hasattr(view, "interaction_finished"):
+            view.interaction_finished.connect(self.update)
+        view.installEventFilter(self)
+
+        self._place()
+
+    def eventFilter(self, obj, event):
+        if obj is self.view and event.type() == QEvent.Type.Resize:
+            self._place()
+            self.update()
+        return super().eventFilter(obj, event)
+
+    def _place(self):
+        """Pin the minimap to the bottom-right corner of the view's viewport"""
+        viewport = self.view.viewport().geometry()
+        self.move(
+            viewport.right() - self.width() - MINIMAP_MARGIN,
+            viewport.bottom() - self.height() - MINIMAP_MARGIN,
+        )
+
+    def sync(self, item):
+        """Redraw the areas a card left and entered after the spatial index changed for it"""
+        old = self._footprints.pop(item, None)
+        new = None
+        if item in self.spatial_index:
+            new = (self.spatial_index.rect(item), item.base_rotation, item.zValue())
+            self._footprints[item] = new
+        if old == new:
+            return
+
+        if not self.isVisible():
+            # Catch up with a full rebuild when shown again
+            self._needs_rebuild = True
+            return
+        self._dirty.extend(footprint[0] for footprint in (old, new) if footprint is not None)
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    def refresh(self):
+        """Bring the overview up to date with the changes collected so far"""
+        self._refresh_timer.stop()
+        bounds = self.spatial_index.bounds()
+
+        if self._needs_rebuild or not self._covers(bounds):
+            self._fit(bounds)
+            self._redraw(self._scene_rect)
+            self._needs_rebuild = False
+        else:
+            for rect in self._dirty:
+                self._redraw(rect)
+
+        self._dirty.clear()
+        self.update()
+
+    def _covers(self, bounds):
+        """Check the overview still frames the cards without wasting most of its area"""
+        if bounds.isEmpty():
+            return True
+        if not self._scene_rect.contains(bounds):
+            return False
+        # Refit once the cards only span a small part of the overview
+        return (
+            max(
+                bounds.width() / self._scene_rect.width(),
+                bounds.height() / self._scene_rect.height(),
+            )
+            > 0.25
+        )
+
+    def _fit(self, bounds):
+        """Choose the scene area shown, with slack so small moves don't force a rebuild"""
+        if bounds.isEmpty():
+            bounds = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        slack = max(bounds.width(), bounds.height()) * 0.5
+        rect = bounds.adjusted(-slack, -slack, slack, slack)
+
+        # Match the minimap's aspect ratio
+        scale = min(self.width() / rect.width(), self.height() / rect.height())
+        center = rect.center()
+        rect = QRectF(0, 0, self.width() / scale, self.height() / scale)
+        rect.moveCenter(center)
+
+        self._scene_rect = rect
+        self._to_minimap = QTransform.fromScale(scale, scale).translate(-rect.left(), -rect.top())
+        self._thumbnails.clear()
+
+    def _redraw(self, scene_rect):
+        """Repaint the part of the overview showing a scene rect"""
+        target = self._to_minimap.mapRect(scene_rect).toAlignedRect().adjusted(-1, -1, 1, 1)
+        target = target.intersected(self._image.rect())
+        if target.isEmpty():
+            return
+
+        painter = QPainter(self._image)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter.fillRect(target, MINIMAP_BACKGROUND)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+        painter.setClipRect(target)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+        source = self._to_minimap.inverted()[0].mapRect(QRectF(target))
+        for item in sorted(self.spatial_index.query(source), key=lambda item: item.zValue()):
+            transform = _resting_transform(item)
+            # An expanded stack has no image of its own, only the cards in it
+            for card, card_transform in [
+                (item, transform),
+                *((child, child.itemTransform(item)[0] * transform) for child in item.childItems()),
+            ]:
+                thumbnail = self._thumbnail(card)
+                if not thumbnail.isNull():
+                    painter.setTransform(card_transform * self._to_minimap)
+                    painter.drawPixmap(card.boundingRect(), thumbnail, QRectF(thumbnail.rect()))
+        painter.end()
+
+    def size_in_bytes(self):
+        """Get the approximate memory held by the overview image and thumbnails"""
+        return self._image.sizeInBytes() + sum(
+            pixmap_size_in_bytes(thumbnail) for thumbnail in self._thumbnails.values()
+        )
+
+    def _thumbnail(self, item):
+        """Get a card's pixmap downscaled to its size on the minimap"""
+        size = self._to_minimap.mapRect(item.boundingRect()).size().toSize().expandedTo(QSize(1, 1))
+        pixmap = item.pixmap()
+        key = (pixmap.cacheKey(), size.width(), size.height())
+        thumbnail = self._thumbnails.get(key)
+        if thumbnail is None:
+            thumbnail = pixmap.scaled(
+                size,
+                Qt.AspectRatioMode.IgnoreAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+            self._thumbnails[key] = thumbnail
+        return thumbnail
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawImage(0, 0, self._image)
+
+        # Outline the part of the canvas currently in view
+        visible = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        painter.setPen(QPen(MINIMAP_VIEWPORT, 1))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(self._to_minimap.mapRect(visible).intersected(QRectF(self.rect())))
+
+        painter.setPen(QPen(MINIMAP_VIEWPORT.darker(200), 1))
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+        painter.end()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.navigate_to(event.position())
+            event.accept()
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.MouseButton.LeftButton:
+            self.navigate_to(event.position())
+            event.accept()
+
+    def navigate_to(self, point):
+        """Center the view on the scene position under a minimap point"""
+        scene_pos = self._to_minimap.inverted()[0].map(QPointF(point))
+        self.view.centerOn(scene_pos)
+        self.update()
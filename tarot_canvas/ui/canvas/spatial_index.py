@@ -0,0 +1,196 @@
+import math
+
+from PyQt6.QtCore import QPointF, QRectF
+
+
+def resting_rect(item):
+    """Scene rect of a card at its base rotation, ignoring the wobble animation"""
+    rect = item.boundingRect()
+    if getattr(item, "base_rotation", 0) % 180:
+        # Quarter turns around the centre swap the card's width and height
+        center = rect.center()
+        rect = QRectF(0, 0, rect.height(), rect.width())
+        rect.moveCenter(center)
+    return rect.translated(item.pos())
+
+
+class SpatialGridIndex:
+    """Uniform grid over card bounds for constant-time neighbourhood queries.
+
+    Each item is bucketed into every cell its rect overlaps. Cards are all
+    roughly the same size, so with cells about one card wide a query only
+    touches a handful of buckets no matter how many cards are on the canvas.
+    """
+
+    def __init__(self, cell_size=256):
+        self.cell_size = cell_size
+        self._cells = {}  # (column, row) -> set of items
+        self._entries = {}  # item -> (rect, cell range)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, item):
+        return item in self._entries
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (
+            math.floor(rect.left() / size),
+            math.floor(rect.top() / size),
+            math.floor(rect.right() / size),
+            math.floor(rect.bottom() / size),
+        )
+
+    def _cells_in(self, cell_range):
+        left, top, right, bottom = cell_range
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                yield column, row
+
+    def insert(self, item, rect=None):
+        """Add an item, or refresh it if it is already indexed"""
+        rect = rect if rect is not None else resting_rect(item)
+        cell_range = self._cell_range(rect)
+
+        entry = self._entries.get(item)
+        if entry is not None:
+            if entry[1] == cell_range:
+                # Still covering the same cells - only the rect needs updating
+                self._entries[item] = (rect, cell_range)
+                return
+            self._discard_from_cells(item, entry[1])
+
+        self._entries[item] = (rect, cell_range)
+        for cell in self._cells_in(cell_range):
+            self._cells.setdefault(cell, set()).add(item)
+
+    update = insert
+
+    def remove(self, item):
+        """Drop an item from the index"""
+        entry = self._entries.pop(item, None)
+        if entry is not None:
+            self._discard_from_cells(item, entry[1])
+
+    def _discard_from_cells(self, item, cell_range):
+        for cell in self._cells_in(cell_range):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(item)
+                if not bucket:
+                    del self._cells[cell]
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+
+    def rect(self, item):
+        """Get the indexed rect of an item"""
+        return self._entries[item][0]
+
+    def items(self):
+        return self._entries.keys()
+
+    def query(self, rect):
+        """Get every indexed item whose rect intersects the given rect"""
+        found = set()
+        for cell in self._cells_in(self._cell_range(rect)):
+            bucket = self._cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return {item for item in found if self._entries[item][0].intersects(rect)}
+
+    def items_at(self, point):
+        """Get every indexed item containing the given scene point"""
+        size = self.cell_size
+        bucket = self._cells.get((math.floor(point.x() / size), math.floor(point.y() / size)))
+        if not bucket:
+            return []
+        return [item for item in bucket if self._entries[item][0].contains(point)]
+
+    def bounds(self):
+        """Get the united rect of everything in the index"""
+        rect = QRectF()
+        for item_rect, _ in self._entries.values():
+            rect = rect.united(item_rect)
+        return rect
+
+    def find_free_slot(self, width, height, near, spacing=20, max_rings=32):
+        """Find the top-left of the free card-sized slot closest to a point.
+
+        Candidate slots lie on a lattice one card (plus spacing) apart and are
+        visited ring by ring outward from `near`, so the cost depends on how
+        crowded that neighbourhood is rather than on the total card count.
+        """
+        origin = QPointF(near.x() - width / 2, near.y() - height / 2)
+        step_x = width + spacing
+        step_y = height + spacing
+        margin = spacing / 2
+
+        for ring in range(max_rings + 1):
+            candidates = [
+                (column, row)
+                for column in range(-ring, ring + 1)
+                for row in range(-ring, ring + 1)
+                if max(abs(column), abs(row)) == ring
+            ]
+            candidates.sort(key=lambda cell: math.hypot(cell[0] * step_x, cell[1] * step_y))
+
+            for column, row in candidates:
+                slot = QRectF(
+                    origin.x() + column * step_x, origin.y() + row * step_y, width, height
+                )
+                if not self.query(slot.adjusted(-margin, -margin, margin, margin)):
+                    return slot.topLeft()
+
+        return origin
+
+    def snap_offset(self, rect, threshold, grid_size=None, snap_to_edges=True, exclude=()):
+        """Get the (dx, dy) that snaps a rect onto nearby card edges or the grid.
+
+        Edges within `threshold` win over the grid on each axis. Without a
+        grid, an axis with no edge in reach is left alone.
+        """
+        dx = dy = None
+
+        if snap_to_edges:
+            area = rect.adjusted(-threshold, -threshold, threshold, threshold)
+            best_x = best_y = threshold + 1
+            for item in self.query(area):
+                if item in exclude:
+                    continue
+                other = self._entries[item][0]
+
+                for delta in (
+                    other.left() - rect.left(),
+                    other.right() - rect.right(),
+                    other.left() - rect.right(),
+                    other.right() - rect.left(),
+                    other.center().x() - rect.center().x(),
+                ):
+                    if abs(delta) < best_x:
+                        best_x, dx = abs(delta), delta
+
+                for delta in (
+                    other.top() - rect.top(),
+                    other.bottom() - rect.bottom(),
+                    other.top() - rect.bottom(),
+                    other.bottom() - rect.top(),
+                    other.center().y() - rect.center().y(),
+                ):
+                    if abs(delta) < best_y:
+                        best_y, dy = abs(delta), delta
+
+            if best_x > threshold:
+                dx = None
+            if best_y > threshold:
+                dy = None
+
+        if grid_size:
+            if dx is None:
+                dx = round(rect.left() / grid_size) * grid_size - rect.left()
+            if dy is None:
+                dy = round(rect.top() / grid_size) * grid_size - rect.top()
+
+        return dx or 0.0, dy or 0.0
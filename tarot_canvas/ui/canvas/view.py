@@ -1,9 +1,40 @@
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPainter
+import math
+import time
+from collections import deque
+
+from PyQt6.QtCore import QPointF, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QPainter, QPixmapCache
 from PyQt6.QtWidgets import QGraphicsView
 
+from tarot_canvas.ui.canvas.card_item import DraggableCardItem
+from tarot_canvas.ui.canvas.diagnostics import DiagnosticsOverlay, FrameStats
+
+# How long after the last pan or zoom step smooth rendering comes back
+INTERACTION_IDLE_MS = 150
+
+# Zoom per standard wheel notch (120 eighths of a degree)
+WHEEL_ZOOM_FACTOR = 1.15
+
+# Display refresh assumed when the screen does not report one
+DEFAULT_REFRESH_RATE = 60
+
+# Only pointer movement this recent counts towards a kinetic pan's speed
+KINETIC_SAMPLE_SECONDS = 0.08
+
+# Time for kinetic panning to lose about two thirds of its speed
+KINETIC_DECAY_SECONDS = 0.3
+
+# Kinetic panning stops below this speed, in pixels per second
+KINETIC_MIN_SPEED = 30
+
+# Room in Qt's pixmap cache for cached cards (in KiB); Qt's default is 10 MiB
+ITEM_CACHE_KB = 64 * 1024
+
 
 class PannableGraphicsView(QGraphicsView):
+    # Emitted once panning or zooming has settled
+    interaction_finished = pyqtSignal()
+
     def __init__(self, scene, parent=None):
         super().__init__(scene, parent)
         self.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
@@ -11,12 +42,159 @@ class PannableGraphicsView(QGraphicsView):
         self._panning = False
         self._last_mouse_pos = None
 
+        # Input waiting for the next frame: a zoom factor about an anchor and
+        # a pan in viewport pixels. Bursts of wheel, trackpad and drag events
+        # are merged so each frame changes the transform at most once.
+        self.kinetic_panning = True
+        self._pending_zoom = 1.0
+        self._zoom_anchor = QPointF()
+        self._pending_pan = QPointF()
+        self._pan_samples = deque()  # (time, pointer movement) during a drag
+        self._velocity = QPointF()  # kinetic pan speed in pixels per second
+        self._last_frame = 0.0
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._frame_timer.timeout.connect(self._apply_pending_input)
+
+        # Restores smooth rendering once panning or zooming settles
+        self.performance_mode = False
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(INTERACTION_IDLE_MS)
+        self._idle_timer.timeout.connect(self.finish_interaction)
+
+        # Frame timing, only collected while the overlay is shown or a trace records
+        self.frame_stats = FrameStats()
+        self.diagnostics_overlay = DiagnosticsOverlay(self, self.frame_stats)
+        self.diagnostics_overlay.hide()
+
+        # Draws static canvas layers from their cached rendering, if set
+        self.layer_painter = None
+
+    def set_performance_mode(self, enabled):
+        """Trade fidelity during pans and zooms, and cache the background, for faster redraws"""
+        self.performance_mode = enabled
+        if enabled:
+            # Repaint one rect per frame or a few small ones, whichever is cheaper
+            self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
+            self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
+            QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), ITEM_CACHE_KB))
+        else:
+            self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate)
+            self.setCacheMode(QGraphicsView.CacheModeFlag.CacheNone)
+        # Cards do not antialias, so there are no half pixels to pad dirty rects for
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing, enabled)
+
+        self.finish_interaction()
+        self.resetCachedContent()
+
+    def zoom(self, factor):
+        """Scale the view by a factor"""
+        self._begin_interaction()
+        self.scale(factor, factor)
+
+    def _schedule_frame(self):
+        """Apply pending input on the next display frame"""
+        if self._frame_timer.isActive():
+            return
+        screen = self.screen()
+        rate = screen.refreshRate() if screen is not None else 0
+        self._frame_timer.setInterval(round(1000 / (rate or DEFAULT_REFRESH_RATE)))
+        self._last_frame = time.perf_counter()
+        self._frame_timer.start()
+
+    def _apply_pending_input(self):
+        """Apply everything input asked for since the last frame in one step"""
+        now = time.perf_counter()
+        elapsed, self._last_frame = now - self._last_frame, now
+
+        if not self._velocity.isNull():
+            self._pending_pan += self._velocity * elapsed
+            self._velocity *= math.exp(-elapsed / KINETIC_DECAY_SECONDS)
+            if math.hypot(self._velocity.x(), self._velocity.y()) < KINETIC_MIN_SPEED:
+                self._velocity = QPointF()
+
+        if self._pending_zoom != 1.0:
+            factor, self._pending_zoom = self._pending_zoom, 1.0
+            # Keep the scene point under the anchor where it is on screen
+            anchor = self._zoom_anchor.toPoint()
+            scene_point = self.mapToScene(anchor)
+            self.zoom(factor)
+            self._pending_pan += QPointF(anchor - self.mapFromScene(scene_point))
+
+        # Scroll bars move in whole pixels; the remainder waits for the next frame
+        dx, dy = round(self._pending_pan.x()), round(self._pending_pan.y())
+        if dx or dy:
+            self._pending_pan -= QPointF(dx, dy)
+            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - dx)
+            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - dy)
+
+        if self._velocity.isNull():
+            self._frame_timer.stop()
+
+    def stop_kinetic_pan(self):
+        """Stop any momentum left over from a pan"""
+        self._velocity = QPointF()
+
+    def scrollContentsBy(self, dx, dy):
+        self._begin_interaction()
+        super().scrollContentsBy(dx, dy)
+
+    def _begin_interaction(self):
+        if not self.performance_mode:
+            return
+        if self.renderHints() & QPainter.RenderHint.SmoothPixmapTransform:
+            self.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, False)
+        self._idle_timer.start()
+
+    def finish_interaction(self):
+        """Restore smooth rendering and announce that the view has settled"""
+        self._idle_timer.stop()
+        if not self.renderHints() & QPainter.RenderHint.SmoothPixmapTransform:
+            self.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+            self.viewport().update()
+        self.interaction_finished.emit()
+
+    def set_diagnostics_visible(self, visible):
+        """Show or hide the frame timing overlay"""
+        self.diagnostics_overlay.setVisible(visible)
+        self.frame_stats.frames.clear()
+
+    def drawBackground(self, painter, rect):
+        super().drawBackground(painter, rect)
+        if self.layer_painter is not None:
+            self.layer_painter.paint(painter, rect)
+
+    def drawForeground(self, painter, rect):
+        super().drawForeground(painter, rect)
+        if self.layer_painter is not None:
+            self.layer_painter.paint(painter, rect, above=True)
+
+    def paintEvent(self, event):
+        if not (self.diagnostics_overlay.isVisible() or self.frame_stats.recording):
+            super().paintEvent(event)
+            return
+
+        # Cards count their paints only while the diagnostics measure a frame
+        painted = DraggableCardItem.paint_count
+        DraggableCardItem.counting_paints = True
+        start = time.perf_counter()
+        try:
+            super().paintEvent(event)
+        finally:
+            DraggableCardItem.counting_paints = False
+        self.frame_stats.add_frame(
+            start, time.perf_counter() - start, DraggableCardItem.paint_count - painted
+        )
+
     def mousePressEvent(self, event):
         """Override mouse press to implement shift+drag panning"""
+        self.stop_kinetic_pan()
         if event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
             # Start panning mode
             self._panning = True
-            self._last_mouse_pos = event.pos()
+            self._last_mouse_pos = event.position()
+            self._pan_samples.clear()
             self.setCursor(Qt.CursorShape.ClosedHandCursor)
             event.accept()
         else:
@@ -25,15 +203,13 @@ class PannableGraphicsView(QGraphicsView):
 
     def mouseMoveEvent(self, event):
         """Handle mouse movement for panning or default behavior"""
-        if self._panning and self._last_mouse_pos:
-            # Calculate how much to pan
-            delta = event.pos() - self._last_mouse_pos
-            self._last_mouse_pos = event.pos()
-
-            # Pan the view
-            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - delta.x())
-            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - delta.y())
-
+        if self._panning and self._last_mouse_pos is not None:
+            # Queue the movement for the next frame, and remember it for momentum
+            delta = event.position() - self._last_mouse_pos
+            self._last_mouse_pos = event.position()
+            self._pending_pan += delta
+            self._record_pan_sample(delta)
+            self._schedule_frame()
             event.accept()
         else:
             super().mouseMoveEvent(event)
@@ -44,17 +220,49 @@ class PannableGraphicsView(QGraphicsView):
             self._panning = False
             self._last_mouse_pos = None
             self.setCursor(Qt.CursorShape.ArrowCursor)
+            if self.kinetic_panning:
+                self._velocity = self._pan_velocity()
+                if not self._velocity.isNull():
+                    self._schedule_frame()
             event.accept()
         else:
             super().mouseReleaseEvent(event)
 
+    def _record_pan_sample(self, delta):
+        now = time.perf_counter()
+        self._pan_samples.append((now, delta))
+        while now - self._pan_samples[0][0] > KINETIC_SAMPLE_SECONDS:
+            self._pan_samples.popleft()
+
+    def _pan_velocity(self):
+        """Get the pointer's recent speed, or zero if it had come to rest"""
+        now = time.perf_counter()
+        samples = [
+            (t, delta) for t, delta in self._pan_samples if now - t <= KINETIC_SAMPLE_SECONDS
+        ]
+        self._pan_samples.clear()
+        if len(samples) < 2:
+            return QPointF()
+        moved = sum((delta for _, delta in samples[1:]), QPointF())
+        velocity = moved / max(samples[-1][0] - samples[0][0], 1e-3)
+        if math.hypot(velocity.x(), velocity.y()) < KINETIC_MIN_SPEED:
+            return QPointF()
+        return velocity
+
     def wheelEvent(self, event):
-        """Handle zooming with mouse wheel"""
-        zoom_factor = 1.15
+        """Zoom with the wheel or pinch, and pan with two-finger trackpad scrolling.
 
-        if event.angleDelta().y() > 0:
-            # Zoom in
-            self.scale(zoom_factor, zoom_factor)
+        Events only accumulate here; the view changes once per display frame.
+        """
+        self.stop_kinetic_pan()
+        pixels = event.pixelDelta()
+        if pixels.isNull() or event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            notches = event.angleDelta().y() / 120
+            if not notches:
+                return
+            self._pending_zoom *= WHEEL_ZOOM_FACTOR**notches
+            self._zoom_anchor = event.position()
         else:
-            # Zoom out
-            self.scale(1.0 / zoom_factor, 1.0 / zoom_factor)
+            self._pending_pan += QPointF(pixels)
+        self._schedule_frame()
+        event.accept()
@@ -1,3 +1,4 @@
+import html
 import os
 
 from PyQt6.QtCore import QSize, Qt, pyqtSignal
@@ -15,6 +16,10 @@ from PyQt6.QtWidgets import (
 )
 
 from tarot_canvas.models.deck_manager import deck_manager
+from tarot_canvas.ui.tabs.card_view.notes_tab import notes_text_index
+
+# Notes listed under the matching cards
+NOTE_RESULT_LIMIT = 20
 
 
 class CommandPaletteItem(QWidget):
@@ -78,8 +83,31 @@ class CommandPaletteItem(QWidget):
         self.action_label.setText(text)
 
 
+class NotePaletteItem(QWidget):
+    """Command palette item for a note, with the matching words shown in context"""
+
+    def __init__(self, result, card_name, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.setSpacing(2)
+
+        title_label = QLabel(
+            f"{html.escape(result['title'])}"
+            f" <span style='color: gray;'>- {html.escape(card_name)}</span>"
+        )
+        title_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(title_label)
+
+        snippet_label = QLabel(result["snippet"])
+        snippet_label.setTextFormat(Qt.TextFormat.RichText)
+        snippet_label.setStyleSheet("color: #666; font-size: 10px;")
+        layout.addWidget(snippet_label)
+
+
 class CommandPalette(QDialog):
     card_selected = pyqtSignal(dict, object)  # Card data, Deck
+    note_selected = pyqtSignal(str, str)  # Card id, note file path
 
     def __init__(self, parent=None, active_tab_type=None):
         super().__init__(parent)
@@ -108,7 +136,7 @@ class CommandPalette(QDialog):
 
         # Search input
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Search for cards...")
+        self.search_input.setPlaceholderText("Search for cards and notes...")
         self.search_input.textChanged.connect(self.filter_results)
         layout.addWidget(self.search_input)
 
@@ -143,8 +171,8 @@ class CommandPalette(QDialog):
         # Initially populate with reference deck cards
         self.populate_results(self.cards)
 
-    def populate_results(self, card_deck_pairs):
-        """Populate the results list with the given cards"""
+    def populate_results(self, card_deck_pairs, notes=()):
+        """Populate the results list with the given cards, followed by notes"""
         self.results_list.clear()
 
         for card, deck in card_deck_pairs:
@@ -166,6 +194,17 @@ class CommandPalette(QDialog):
             self.results_list.addItem(item)
             self.results_list.setItemWidget(item, card_widget)
 
+        card_names = {card["id"]: card.get("name", card["id"]) for card, _ in self.cards}
+        for result in notes:
+            item = QListWidgetItem()
+            item.setSizeHint(QSize(0, 50))
+            item.setData(Qt.ItemDataRole.UserRole + 1, result)
+            self.results_list.addItem(item)
+            self.results_list.setItemWidget(
+                item,
+                NotePaletteItem(result, card_names.get(result["card_id"], result["card_id"])),
+            )
+
         # Select first item if available
         if self.results_list.count() > 0:
             self.results_list.setCurrentRow(0)
@@ -198,11 +237,18 @@ class CommandPalette(QDialog):
             ):
                 filtered_cards.append((card, deck))
 
-        # Populate with filtered results
-        self.populate_results(filtered_cards)
+        # Populate with filtered results, then notes mentioning the search words
+        notes = notes_text_index().search(search_text, limit=NOTE_RESULT_LIMIT)
+        self.populate_results(filtered_cards, notes)
 
     def on_item_activated(self, item):
         """Handle item activation (double-click or Enter key)"""
+        note = item.data(Qt.ItemDataRole.UserRole + 1)
+        if note is not None:
+            self.note_selected.emit(note["card_id"], note["file_path"])
+            self.accept()
+            return
+
         card, deck = item.data(Qt.ItemDataRole.UserRole)
 
         # Emit signal with selected card and deck
@@ -1,4 +1,5 @@
 import os
+import sqlite3
 from importlib.resources import files
 from pathlib import Path
 
@@ -23,18 +24,25 @@ from PyQt6.QtWidgets import (
 
 from tarot_canvas._version import __version__
 from tarot_canvas.models.deck_manager import deck_manager
+from tarot_canvas.models.notes_store import NotesStore
 from tarot_canvas.ui.command_palette import CommandPalette
 from tarot_canvas.ui.components.card_explorer import CardExplorerPanel
 from tarot_canvas.ui.tabs.canvas_tab import CanvasTab
+from tarot_canvas.ui.tabs.card_view.notes_tab import notes_database
 from tarot_canvas.ui.tabs.card_view_tab import CardViewTab
 from tarot_canvas.ui.tabs.deck_view_tab import DeckViewTab
 from tarot_canvas.ui.tabs.library_tab import LibraryTab
+from tarot_canvas.ui.windows.card_references import CardReferencesDialog
 from tarot_canvas.ui.windows.log_viewer import LogViewerDialog
 from tarot_canvas.utils.logger import logger
+from tarot_canvas.utils.note_writer import NoteWriter
 from tarot_canvas.utils.theme_manager import ThemeManager, ThemeType
 
 ICON_PATH = files("tarot_canvas.resources.icons").joinpath("icon.png")
 
+# Longest the notes database import waits for notes still being saved
+NOTE_SAVE_WAIT_SECONDS = 5
+
 
 class TabBarEventFilter(QObject):
     """Event filter to detect double-clicks on tab bar for renaming"""
@@ -146,6 +154,10 @@ class MainWindow(QMainWindow):
         self.explorer_action.triggered.connect(self.toggle_card_explorer)
         view_menu.addAction(self.explorer_action)
 
+        references_action = QAction("Most &Referenced Cards", self)
+        references_action.triggered.connect(self.show_card_references)
+        view_menu.addAction(references_action)
+
         view_menu.addSeparator()
 
         fullscreen_action = QAction("&Fullscreen", self)
@@ -213,6 +225,17 @@ class MainWindow(QMainWindow):
         log_viewer_action.triggered.connect(self.show_log_viewer)
         tools_menu.addAction(log_viewer_action)
 
+        tools_menu.addSeparator()
+
+        # Move notes between the markdown tree and the notes database
+        import_notes_action = QAction("&Import Notes into Database", self)
+        import_notes_action.triggered.connect(self.import_notes_to_store)
+        tools_menu.addAction(import_notes_action)
+
+        export_notes_action = QAction("&Export Notes Database...", self)
+        export_notes_action.triggered.connect(self.export_notes_store)
+        tools_menu.addAction(export_notes_action)
+
         # About menu
         about_menu = menu_bar.addMenu("&About")
 
@@ -397,6 +420,8 @@ class MainWindow(QMainWindow):
             card = data.get("card")
             deck = data.get("deck")
             source_tab_id = data.get("source_tab_id")
+            # Name or file path of a note to open once the card is shown
+            open_note = data.get("open_note")
 
             # Check if a tab for this card already exists
             for i in range(self.tab_widget.count()):
@@ -409,6 +434,8 @@ class MainWindow(QMainWindow):
                 ):
                     # Tab exists, just select it
                     self.tab_widget.setCurrentWidget(tab)
+                    if open_note:
+                        tab.open_note(open_note)
                     return
 
             # Create a new card view tab
@@ -418,6 +445,8 @@ class MainWindow(QMainWindow):
             # Add it to the tab widget
             self.tab_widget.addTab(card_tab, card.get("name", "Card"))
             self.tab_widget.setCurrentWidget(card_tab)
+            if open_note:
+                card_tab.open_note(open_note)
 
         elif action == "open_deck_view":
             # Extract the data
@@ -548,6 +577,7 @@ class MainWindow(QMainWindow):
 
         prefs_dialog = PreferencesDialog(self)
         prefs_dialog.settings_changed.connect(self.apply_settings_to_open_canvases)
+        prefs_dialog.settings_changed.connect(self.apply_notes_storage)
         prefs_dialog.exec()
 
     def apply_settings_to_open_canvases(self):
@@ -689,6 +719,40 @@ class MainWindow(QMainWindow):
         log_viewer = LogViewerDialog(self)
         log_viewer.exec()
 
+    def apply_notes_storage(self):
+        """Fill the notes database from the markdown notes the first time it is chosen"""
+        store = notes_database()
+        if store is not None and len(store) == 0:
+            self.import_notes_to_store()
+
+    def import_notes_to_store(self):
+        """Copy every markdown note into the notes database"""
+        if not NoteWriter.get_instance().flush(NOTE_SAVE_WAIT_SECONDS):
+            QMessageBox.warning(
+                self, "Notes Still Saving", "Notes are still being saved. Try again in a moment."
+            )
+            return
+        try:
+            count = NotesStore.get_instance().import_markdown()
+        except (OSError, sqlite3.Error) as e:
+            QMessageBox.critical(self, "Error", f"Could not import notes: {e}")
+            return
+        self.statusBar().showMessage(f"Imported {count} notes into the notes database", 5000)
+
+    def export_notes_store(self):
+        """Write the notes database out as a markdown tree in a chosen folder"""
+        notes_dir = QFileDialog.getExistingDirectory(
+            self, "Export Notes Database", os.path.expanduser("~/Documents")
+        )
+        if not notes_dir:
+            return
+        try:
+            count = NotesStore.get_instance().export_markdown(notes_dir)
+        except (OSError, sqlite3.Error) as e:
+            QMessageBox.critical(self, "Error", f"Could not export notes: {e}")
+            return
+        QMessageBox.information(self, "Export Successful", f"Exported {count} notes to {notes_dir}")
+
     def change_theme(self, theme_type):
         """Change the application theme"""
         logger.info(f"Changing theme to: {theme_type.value}")
@@ -739,8 +803,51 @@ class MainWindow(QMainWindow):
         # Create and show command palette
         palette = CommandPalette(self, active_tab_type)
         palette.card_selected.connect(self.handle_command_palette_selection)
+        palette.note_selected.connect(self.open_note)
         palette.exec()
 
+    def show_card_references(self):
+        """Show the cards notes link to most, and open the one picked"""
+        dialog = CardReferencesDialog(self)
+        dialog.card_activated.connect(self.open_card_by_name)
+        dialog.exec()
+
+    def open_card_by_name(self, card_name):
+        """Open a card view for a reference deck card, matching its name in any case"""
+        reference_deck = deck_manager.get_reference_deck()
+        if not reference_deck:
+            return
+        for card in reference_deck.get_all_cards():
+            if card["name"].lower() == card_name.lower():
+                current_tab = self.tab_widget.currentWidget()
+                self.handle_tab_navigation(
+                    "open_card_view",
+                    {
+                        "card": card,
+                        "deck": reference_deck,
+                        "source_tab_id": getattr(current_tab, "id", None),
+                    },
+                )
+                return
+
+    def open_note(self, card_id, file_path):
+        """Open a card's view with one of its notes in the editor"""
+        reference_deck = deck_manager.get_reference_deck()
+        card = reference_deck.get_card_by_id(card_id) if reference_deck else None
+        if card is None:
+            QMessageBox.warning(self, "Card Not Found", f"No card found for this note: {card_id}")
+            return
+        current_tab = self.tab_widget.currentWidget()
+        self.handle_tab_navigation(
+            "open_card_view",
+            {
+                "card": card,
+                "deck": reference_deck,
+                "source_tab_id": getattr(current_tab, "id", None),
+                "open_note": file_path,
+            },
+        )
+
     def handle_command_palette_selection(self, card, deck):
         """Handle card selection from command palette"""
         # Get active tab
@@ -1,8 +1,22 @@
+import functools
+import json
 import os
 import random
+import time
+from array import array
 from pathlib import Path
 
-from PyQt6.QtCore import QPointF, QRectF, QSettings, QSize, Qt, QTimer, pyqtSignal
+from PyQt6.QtCore import (
+    QEasingCurve,
+    QPointF,
+    QRectF,
+    QSettings,
+    QSize,
+    Qt,
+    QTimer,
+    QVariantAnimation,
+    pyqtSignal,
+)
 from PyQt6.QtGui import (
     QAction,
     QBrush,
@@ -13,14 +27,18 @@ from PyQt6.QtGui import (
     QPainter,
     QPixmap,
     QRadialGradient,
+    QUndoStack,
 )
 from PyQt6.QtWidgets import (
     QApplication,
+    QFileDialog,
     QGraphicsScene,
     QGraphicsView,
     QHBoxLayout,
+    QInputDialog,
     QLabel,
     QMenu,
+    QMessageBox,
     QSizePolicy,
     QToolBar,
     QVBoxLayout,
@@ -28,19 +46,95 @@ from PyQt6.QtWidgets import (
 )
 
 from tarot_canvas.models.deck_manager import deck_manager
+from tarot_canvas.models.draw_pile import DrawPile
 
 # Import the refactored components
 from tarot_canvas.ui.canvas import (
+    ARRANGE_MODES,
+    UNDO_LIMIT,
+    CanvasFindDialog,
     CanvasIcon,
+    CanvasLayers,
+    CanvasMinimap,
+    CardAddCommand,
+    CardGroupCommand,
+    CardLayoutCommand,
+    CardRemoveCommand,
+    CardSearchIndex,
+    CardStack,
+    CardUngroupCommand,
     DraggableCardItem,
     PannableGraphicsView,
+    SearchHighlight,
+    SpatialGridIndex,
     align_items_horizontally,
     align_items_vertically,
+    apply_positions,
+    arrange,
     arrange_items_in_circle,
+    arrange_items_in_fan,
+    arrange_items_in_grid,
+    capture_layout,
     distribute_items_horizontally,
     distribute_items_vertically,
+    export_scene,
+    resting_rect,
+    scene_layout,
+    wobble_amplitudes,
 )
 from tarot_canvas.ui.tabs.base_tab import BaseTab
+from tarot_canvas.utils.image_cache import ImageCache, pixmap_size_in_bytes
+from tarot_canvas.utils.path_helper import get_data_directory
+
+# Distance in screen pixels within which a dragged card snaps to a neighbour
+SNAP_DISTANCE = 8
+
+# Largest size a card image is shown at on the canvas
+CARD_MAX_WIDTH = 300
+CARD_MAX_HEIGHT = 500
+
+# Duration of the auto-arrange animation
+ARRANGE_ANIMATION_MS = 350
+
+# Larger arrangements are applied at once rather than animated
+ARRANGE_ANIMATION_LIMIT = 1500
+
+# Length of a frame timing trace recorded with Ctrl+F12
+TRACE_SECONDS = 5
+
+
+@functools.cache
+def background_brush(style, color=None):
+    """Get the canvas background brush for a style, shared by every canvas"""
+    if style == "Gradient":
+        gradient = QRadialGradient(QPointF(0, 0), 800)
+        gradient.setColorAt(0, QColor(50, 30, 80))  # Center - medium purple
+        gradient.setColorAt(0.5, QColor(30, 18, 60))  # Middle - darker purple
+        gradient.setColorAt(1, QColor(15, 10, 30))  # Edge - very dark purple
+        return QBrush(gradient)
+    if style == "Solid Color":
+        return QBrush(QColor(color))
+
+    light_purple = QColor(220, 210, 240)  # Light lavender
+    dark_purple = QColor(180, 160, 220)  # Darker lavender
+
+    size = 50  # Size of each square
+    pixmap = QPixmap(size * 2, size * 2)
+    pixmap.fill(Qt.GlobalColor.transparent)
+
+    painter = QPainter(pixmap)
+    painter.setPen(Qt.PenStyle.NoPen)
+
+    painter.setBrush(QBrush(light_purple))
+    painter.drawRect(0, 0, size, size)
+    painter.drawRect(size, size, size, size)
+
+    painter.setBrush(QBrush(dark_purple))
+    painter.drawRect(0, size, size, size)
+    painter.drawRect(size, 0, size, size)
+
+    painter.end()
+    return QBrush(pixmap)
 
 
 class CanvasTab(BaseTab):
@@ -58,6 +152,27 @@ class CanvasTab(BaseTab):
         # Add a maximum size constraint to prevent excessive expansion
         self.setMaximumHeight(800)  # Set a reasonable maximum height
 
+        # Undo history for card placement, layout and removal
+        self.undo_stack = QUndoStack(self)
+        self.undo_stack.setUndoLimit(UNDO_LIMIT)
+
+        # Selection snapshot taken when a card drag starts
+        self._drag_items = None
+        self._drag_state = None
+
+        # Grid index over card bounds, kept in sync as cards move
+        self.spatial_index = SpatialGridIndex()
+
+        # Index of the cards on the canvas by id and name, for Find
+        self.card_index = CardSearchIndex()
+        self._search_highlight = None
+
+        # Shuffled draw pile for each deck drawn from, keyed by deck path
+        self.draw_piles = {}
+
+        # Running auto-arrange animation, if any
+        self._arrange_animation = None
+
         # Setup the UI with size-constrained components
         self.setup_ui()
         self.deck = deck_manager.get_reference_deck()
@@ -91,6 +206,11 @@ class CanvasTab(BaseTab):
 
         # Use our custom view with shift+drag panning
         self.view = PannableGraphicsView(self.scene)
+        self.view.interaction_finished.connect(self.update_card_caches)
+
+        # Named layers; static ones are drawn by the view from a cached rendering
+        self.layers = CanvasLayers(self.scene, self.view)
+        self.layers.visibility_changed = self.index_cards
 
         # Apply background from settings
         self.apply_background_settings()
@@ -101,6 +221,13 @@ class CanvasTab(BaseTab):
         self.view.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorViewCenter)
         self.view.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
+        # Overview of the whole board in the corner of the view
+        self.minimap = CanvasMinimap(self.view, self.spatial_index)
+        self.view.diagnostics_overlay.memory_usage = self.memory_usage
+        self.minimap.setVisible(
+            QSettings("ArcanaLand", "TarotCanvas").value("canvas/show_minimap", True, type=bool)
+        )
+
         # Add canvas to layout (will take most of the space)
         main_layout.addWidget(self.view, 1)
 
@@ -151,67 +278,99 @@ class CanvasTab(BaseTab):
         # Update all card animations
         self.update_card_animations(enable_animations, animation_intensity)
 
-    def create_gradient_background(self):
-        """Create a gradient background for the canvas"""
-        center = QPointF(0, 0)
-        radius = 800
-        gradient = QRadialGradient(center, radius)
+        # Apply snapping settings
+        self.snap_to_edges = settings.value("canvas/snap_to_edges", True, type=bool)
+        self.snap_to_grid = settings.value("canvas/snap_to_grid", False, type=bool)
+        self.grid_size = settings.value("canvas/grid_size", 50, type=int)
+        self.view.kinetic_panning = settings.value("canvas/kinetic_panning", True, type=bool)
 
-        gradient.setColorAt(0, QColor(50, 30, 80))  # Center - medium purple
-        gradient.setColorAt(0.5, QColor(30, 18, 60))  # Middle - darker purple
-        gradient.setColorAt(1, QColor(15, 10, 30))  # Edge - very dark purple
+        # Apply the rendering mode to the view and every card
+        self.performance_mode = (
+            settings.value("canvas/rendering_mode", "Performance") == "Performance"
+        )
+        self.view.set_performance_mode(self.performance_mode)
+        for item in self.scene.items():
+            if isinstance(item, DraggableCardItem):
+                item.performance_mode = self.performance_mode
+        self.update_card_caches()
+
+        # Apply the chance of drawing a card reversed
+        self.reversal_probability = settings.value("canvas/reversal_chance", 50, type=int) / 100
+        for pile in self.draw_piles.values():
+            pile.reversal_probability = self.reversal_probability
 
-        brush = QBrush(gradient)
+    def create_gradient_background(self):
+        """Create a gradient background for the canvas"""
+        brush = background_brush("Gradient")
         self.scene.setBackgroundBrush(brush)
         self.view.setBackgroundBrush(brush)
 
     def create_solid_color_background(self, color_str):
         """Create a solid color background for the canvas"""
-        color = QColor(color_str)
-        brush = QBrush(color)
+        brush = background_brush("Solid Color", color_str)
         self.scene.setBackgroundBrush(brush)
         self.view.setBackgroundBrush(brush)
 
     def create_purple_checkerboard_background(self):
         """Create a purple checkerboard pattern background for the canvas"""
-        light_purple = QColor(220, 210, 240)  # Light lavender
-        dark_purple = QColor(180, 160, 220)  # Darker lavender
-
-        size = 50  # Size of each square
-        pixmap = QPixmap(size * 2, size * 2)
-        pixmap.fill(Qt.GlobalColor.transparent)
-
-        painter = QPainter(pixmap)
-        painter.setPen(Qt.PenStyle.NoPen)
+        self.view.setBackgroundBrush(background_brush("Checkerboard"))
 
-        painter.setBrush(QBrush(light_purple))
-        painter.drawRect(0, 0, size, size)
-        painter.drawRect(size, size, size, size)
+    def memory_usage(self):
+        """Work out how much image memory this canvas owns and how much it shares.
 
-        painter.setBrush(QBrush(dark_purple))
-        painter.drawRect(0, size, size, size)
-        painter.drawRect(size, 0, size, size)
+        Card images come from the shared image cache and are counted once
+        however many cards or canvases show them. Anything else, like pile
+        images of collapsed stacks and the minimap, belongs to this canvas.
 
-        painter.end()
-
-        pattern_brush = QBrush(pixmap)
-        self.view.setBackgroundBrush(pattern_brush)
+        Returns:
+            dict: "cards", "shared_bytes" and "owned_bytes"
+        """
+        cached = ImageCache.get_instance().cache_keys()
+        cards = []
+        owned = {}  # pixmap cache key -> bytes, so shared copies count once
+        for item in self.scene.items():
+            if isinstance(item, CardStack):
+                # Expanded stacks' cards are scene items and are visited themselves
+                if item.collapsed:
+                    cards.extend(item.cards)
+                    owned[item.pixmap().cacheKey()] = pixmap_size_in_bytes(item.pixmap())
+            elif isinstance(item, DraggableCardItem):
+                cards.append(item)
+
+        shared = {}
+        for card in cards:
+            pixmap = card.pixmap()
+            key = pixmap.cacheKey()
+            (shared if key in cached else owned)[key] = pixmap_size_in_bytes(pixmap)
+
+        return {
+            "cards": len(cards),
+            "shared_bytes": sum(shared.values()),
+            "owned_bytes": sum(owned.values())
+            + self.minimap.size_in_bytes()
+            + self.layers.cache_bytes(),
+        }
 
     def update_card_animations(self, enable, intensity):
         """Update all card animations based on settings"""
         # Scale intensity from 0-100 to appropriate animation values
-        rotation_amplitude = intensity * 0.016  # 0 to 1.6 degrees
-        scale_amplitude = 1.0 + (intensity * 0.0004)  # 1.0 to 1.04
+        rotation_amplitude, scale_amplitude = wobble_amplitudes(intensity)
 
         # Get all card items in the scene
         for item in self.scene.items():
-            if isinstance(item, DraggableCardItem) and hasattr(item, "rotation_anim"):
+            # Cards in a stack share the stack's wobble, and locked cards rest
+            if (
+                isinstance(item, DraggableCardItem)
+                and item.parentItem() is None
+                and not self.layers.is_locked(item)
+            ):
                 # Stop any existing animation
-                item.rotation_anim.stop()
+                if item.rotation_anim is not None:
+                    item.rotation_anim.stop()
 
                 if enable:
-                    # Get current rotation/state
-                    base_rotation = item.rotation()
+                    # Get the resting rotation rather than a mid-wobble angle
+                    base_rotation = item.base_rotation
                     if hasattr(item, "anim_controller"):
                         item.anim_controller._rotation = base_rotation
 
@@ -223,6 +382,12 @@ class CanvasTab(BaseTab):
                     # Start the animation
                     item.start_animations()
 
+    def update_card_caches(self):
+        """Re-pick every card's item cache, e.g. once a zoom has settled"""
+        for item in self.scene.items():
+            if isinstance(item, DraggableCardItem):
+                item.update_cache_mode()
+
     def ensure_window_bounds(self):
         """Ensure the window stays within screen boundaries"""
         window = self.window()
@@ -268,15 +433,25 @@ class CanvasTab(BaseTab):
         """Set up keyboard shortcuts for all toolbar actions"""
         # Card Actions
         self.create_shortcut("D", self.on_draw_card, "Summon Card")
+        self.create_shortcut("Shift+D", self.on_deal_cards, "Deal Cards")
         self.create_shortcut("R", self.on_flip_card, "Flip Card (Reversed)")
         self.create_shortcut("Ctrl+D", self.on_duplicate_card, "Duplicate Card")
         self.create_shortcut(Qt.Key.Key_Delete, self.on_delete_card, "Delete Card")
         self.create_shortcut(Qt.Key.Key_Backspace, self.on_delete_card, "Delete Card (Alt)")
 
+        # History Actions
+        self.create_shortcut("Ctrl+Z", self.on_undo, "Undo")
+        self.create_shortcut("Ctrl+Shift+Z", self.on_redo, "Redo")
+        self.create_shortcut("Ctrl+Y", self.on_redo, "Redo (Alt)")
+
         # Arrangement Actions
         self.create_shortcut("Ctrl+]", self.on_bring_to_front, "Bring to Front")
         self.create_shortcut("Ctrl+[", self.on_send_to_back, "Send to Back")
         self.create_shortcut("Ctrl+A", self.on_align_cards, "Align Cards")
+        self.create_shortcut("Ctrl+Shift+A", self.on_auto_arrange, "Auto Arrange")
+        self.create_shortcut("Ctrl+G", self.on_group_cards, "Group Cards")
+        self.create_shortcut("S", self.on_stack_cards, "Stack Cards")
+        self.create_shortcut("Ctrl+Shift+G", self.on_ungroup_cards, "Ungroup Cards")
 
         # View Actions
         self.create_shortcut("Ctrl++", self.on_zoom_in, "Zoom In")
@@ -284,6 +459,12 @@ class CanvasTab(BaseTab):
         self.create_shortcut("Ctrl+-", self.on_zoom_out, "Zoom Out")
         self.create_shortcut("Ctrl+0", self.on_reset_view, "Reset View")
         self.create_shortcut("Ctrl+F", self.on_fit_view, "Fit All in View")
+        self.create_shortcut("Ctrl+Shift+F", self.on_find_cards, "Find Cards on Canvas")
+        self.create_shortcut("Ctrl+E", self.on_export_canvas, "Export Canvas")
+        self.create_shortcut("M", self.on_toggle_minimap, "Toggle Minimap")
+        self.create_shortcut("L", self.on_show_layers, "Layers")
+        self.create_shortcut("F12", self.on_toggle_diagnostics, "Toggle Frame Timing Overlay")
+        self.create_shortcut("Ctrl+F12", self.on_record_trace, "Record Frame Timing Trace")
 
         # Navigation
         self.create_shortcut("Escape", self.on_escape_pressed, "Cancel Selection")
@@ -338,6 +519,7 @@ class CanvasTab(BaseTab):
         # Primary actions with Breeze icons
         primary_actions = [
             ("format-add-node", self.on_draw_card, "Summon a random card (D)"),
+            ("view-grid", self.on_deal_cards, "Deal several cards or the entire deck"),
             (
                 "object-flip-vertical",
                 self.on_flip_card,
@@ -377,6 +559,9 @@ class CanvasTab(BaseTab):
             ("go-top", self.on_bring_to_front, "Bring card to front"),
             ("go-bottom", self.on_send_to_back, "Send card to back"),
             ("align-horizontal-center", self.on_align_cards, "Align selected cards"),
+            ("distribute-randomize", self.on_auto_arrange, "Auto-arrange cards (Ctrl+Shift+A)"),
+            ("object-group", self.on_group_cards, "Group selected cards (Ctrl+G)"),
+            ("object-ungroup", self.on_ungroup_cards, "Ungroup selected stacks (Ctrl+Shift+G)"),
         ]
 
         # Add arrangement actions to toolbar
@@ -409,7 +594,11 @@ class CanvasTab(BaseTab):
             ("zoom-in", self.on_zoom_in, "Zoom in"),
             ("zoom-out", self.on_zoom_out, "Zoom out"),
             ("zoom-fit-best", self.on_fit_view, "Fit all cards in view"),
+            ("edit-find", self.on_find_cards, "Find cards on this canvas (Ctrl+Shift+F)"),
             ("zoom-original", self.on_reset_view, "Reset to default view"),
+            ("view-preview", self.on_toggle_minimap, "Show or hide the minimap (M)"),
+            ("layer-visible-on", self.on_show_layers, "Show, hide and lock layers (L)"),
+            ("document-export", self.on_export_canvas, "Export canvas as an image or PDF"),
         ]
 
         # Add view control actions to toolbar
@@ -443,13 +632,13 @@ class CanvasTab(BaseTab):
         label.setStyleSheet("color: #888; font-size: 11px; margin-top: 5px; margin-bottom: 2px;")
         return label
 
-    def on_draw_card(self):
-        """Draw a random card from the selected deck in Card Explorer (or default deck)"""
+    def get_selected_deck(self):
+        """Get the deck selected in the Card Explorer, or the canvas's default deck"""
         # Get the main window to access the card explorer
         main_window = self.window()
         if not main_window:
             print("Couldn't find main window")
-            return
+            return self.deck
 
         # Try to find the card explorer in the main window
         selected_deck = None
@@ -468,19 +657,26 @@ class CanvasTab(BaseTab):
             print(f"Error accessing card explorer: {e}")
 
         # Use the selected deck or fall back to the default deck
-        deck_to_use = selected_deck or self.deck
+        return selected_deck or self.deck
+
+    def on_draw_card(self):
+        """Draw a random card from the selected deck in Card Explorer (or default deck)"""
+        deck_to_use = self.get_selected_deck()
         if not deck_to_use:
             print("No deck available to draw from!")
             return
 
-        # Get a random card from the selected deck
-        card = deck_to_use.get_random_card()
-        if not card:
+        # Draw the next card from the deck's pile, reshuffling once it runs out
+        pile = self.get_draw_pile(deck_to_use)
+        if not len(pile):
+            pile.gather()
+            print(f"Reshuffled the {deck_to_use.get_name()} deck")
+
+        drawn = pile.draw()
+        if not drawn:
             print(f"Could not draw a card from {deck_to_use.get_name()}!")
             return
-
-        # Add a 50% chance for the card to be reversed
-        is_reversed = random.choice([True, False])
+        card, is_reversed = drawn
 
         # Add the card, possibly reversed, using the selected deck
         self.add_specific_card(card, card_deck=deck_to_use, is_reversed=is_reversed)
@@ -488,65 +684,84 @@ class CanvasTab(BaseTab):
         # Log what deck we drew from
         print(f"Drew card from {deck_to_use.get_name()} deck")
 
-    def add_specific_card(self, card, card_deck=None, is_reversed=False):
-        """Add a specific card to the canvas, optionally reversed"""
-        # Load the card image
+    def get_draw_pile(self, deck):
+        """Get the draw pile for a deck, shuffling a new one on first use"""
+        pile = self.draw_piles.get(deck.deck_path)
+        if pile is None or pile.deck is not deck:
+            pile = DrawPile(deck, reversal_probability=self.reversal_probability)
+            self.draw_piles[deck.deck_path] = pile
+        return pile
+
+    def on_deal_cards(self):
+        """Show the options for dealing several cards at once"""
+        menu = QMenu(self)
+
+        for count, text in ((3, "Deal 3 Cards"), (10, "Deal 10 Cards"), (None, "Deal Entire Deck")):
+            deal_menu = menu.addMenu(text)
+            as_grid = deal_menu.addAction("As Grid")
+            as_fan = deal_menu.addAction("As Fan")
+            as_grid.triggered.connect(lambda _, count=count: self.deal_cards(count, "grid"))
+            as_fan.triggered.connect(lambda _, count=count: self.deal_cards(count, "fan"))
+
+        # Show the menu at the cursor position
+        menu.exec(QCursor.pos())
+
+    def create_card_item(self, card, is_reversed=False, autostart=True):
+        """Create a card item from the shared image cache without adding it to the scene"""
         image_path = card.get("image")
         if not image_path or not os.path.exists(image_path):
             print(f"Card image not found: {image_path}")
-            return
+            return None
 
-        try:
-            # Create a pixmap from the card image
-            pixmap = QPixmap(image_path)
-            if pixmap.isNull():
-                print(f"Failed to load image: {image_path}")
-                return
+        # Decoded images are shared between every card showing the same file
+        pixmap = ImageCache.get_instance().get_scaled(image_path, CARD_MAX_WIDTH, CARD_MAX_HEIGHT)
+        if pixmap.isNull():
+            print(f"Failed to load image: {image_path}")
+            return None
 
-            # Scale the pixmap to a reasonable size if needed
-            if pixmap.width() > 300 or pixmap.height() > 500:
-                pixmap = pixmap.scaled(
-                    300,
-                    500,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
+        # Create a draggable card item
+        card_item = DraggableCardItem(pixmap, card, self, autostart=False)
 
-            # Create a draggable card item
-            card_item = DraggableCardItem(pixmap, card, self)
+        # Set initial rotation based on reversed status
+        initial_rotation = 180 if is_reversed else 0
+        card_item.setRotation(initial_rotation)
 
-            # Set initial rotation based on reversed status
-            initial_rotation = 180 if is_reversed else 0
-            card_item.setRotation(initial_rotation)
+        # Update the animation controller's base rotation
+        if hasattr(card_item, "anim_controller"):
+            card_item.anim_controller._rotation = initial_rotation
 
-            # Update the animation controller's base rotation
-            if hasattr(card_item, "anim_controller"):
-                card_item.anim_controller._rotation = initial_rotation
+        # Update the card's data to reflect its reversed status
+        if card_item.card_data:
+            card_item.card_data["reversed"] = is_reversed
 
-            # Update the card's data to reflect its reversed status
-            if card_item.card_data:
-                card_item.card_data["reversed"] = is_reversed
+        # Setup wobble animation with the correct base rotation
+        card_item.setup_wobble_animation(base_rotation=initial_rotation, autostart=autostart)
 
-            # Setup wobble animation with the correct base rotation
-            card_item.setup_wobble_animation(base_rotation=initial_rotation)
+        return card_item
+
+    def add_specific_card(self, card, card_deck=None, is_reversed=False):
+        """Add a specific card to the canvas, optionally reversed"""
+        try:
+            # The item gets its own copy, as turning it records "reversed" in its data
+            card_item = self.create_card_item(dict(card), is_reversed)
+            if card_item is None:
+                return None
 
             # Deselect any currently selected cards
             for selected_item in self.scene.selectedItems():
                 selected_item.setSelected(False)
 
-            # Get the center of the viewport
+            # Place the card in the free slot nearest the center of the viewport
             view_center = self.view.mapToScene(self.view.viewport().rect().center())
-
-            # Add a slight random offset (±50 pixels) to avoid exact center placement
-            offset_x = random.randint(-50, 50)
-            offset_y = random.randint(-50, 50)
-            view_center = QPointF(view_center.x() + offset_x, view_center.y() + offset_y)
+            card_rect = card_item.boundingRect()
             card_item.setPos(
-                view_center.x() - pixmap.width() / 2, view_center.y() - pixmap.height() / 2
+                self.spatial_index.find_free_slot(
+                    card_rect.width(), card_rect.height(), view_center
+                )
             )
 
-            # Add the card to the scene
-            self.scene.addItem(card_item)
+            # Add the card to the scene through the undo stack
+            self.undo_stack.push(CardAddCommand(self.scene, [card_item], f"Summon {card['name']}"))
 
             # Select the newly added card
             card_item.setSelected(True)
@@ -560,6 +775,65 @@ class CanvasTab(BaseTab):
             print(f"Error adding card to canvas: {e}")
             return None
 
+    def deal_cards(self, count=None, layout="grid", deck=None):
+        """Deal several cards, or the whole deck, onto the canvas in one operation.
+
+        Cards are drawn from the deck's draw pile and added as a single undo step.
+        Returns the new card items.
+        """
+        deck = deck or self.get_selected_deck()
+        if not deck:
+            print("No deck available to draw from!")
+            return []
+
+        # Start from a full, freshly shuffled pile unless enough cards remain
+        pile = self.get_draw_pile(deck)
+        if count is None or count > len(pile):
+            pile.gather()
+        draws = pile.draw_many(len(pile) if count is None else count)
+        if not draws:
+            return []
+
+        # Build every item before touching the scene
+        items = []
+        for card, is_reversed in draws:
+            card_item = self.create_card_item(dict(card), is_reversed, autostart=False)
+            if card_item is not None:
+                items.append(card_item)
+        if not items:
+            return []
+
+        view_center = self.view.mapToScene(self.view.viewport().rect().center())
+        if layout == "fan":
+            arrange_items_in_fan(items, view_center)
+        else:
+            arrange_items_in_grid(items, view_center)
+
+        for selected_item in self.scene.selectedItems():
+            selected_item.setSelected(False)
+
+        # Suspend the scene's BSP index so it is rebuilt once, not once per card
+        self.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+        try:
+            self.undo_stack.push(CardAddCommand(self.scene, items, f"Deal {len(items)} Cards"))
+        finally:
+            self.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+
+        for card_item in items:
+            card_item.setSelected(True)
+
+        # Start every wobble now, spreading their phases instead of their start times
+        settings = QSettings("ArcanaLand", "TarotCanvas")
+        if settings.value("appearance/enable_animations", True, type=bool):
+            for card_item in items:
+                card_item.start_animations()
+                card_item.rotation_anim.setCurrentTime(
+                    random.randrange(card_item.rotation_anim.duration())
+                )
+
+        print(f"Dealt {len(items)} cards from {deck.get_name()} deck")
+        return items
+
     def open_card_view(self, card_data):
         """Open a card view tab for the given card"""
         self.navigation_requested.emit(
@@ -569,92 +843,444 @@ class CanvasTab(BaseTab):
     # Canvas Control Methods
     def on_zoom_in(self):
         """Zoom into the canvas"""
-        self.view.scale(1.2, 1.2)
+        self.view.zoom(1.2)
 
     def on_zoom_out(self):
         """Zoom out of the canvas"""
-        self.view.scale(0.8, 0.8)
+        self.view.zoom(0.8)
 
     def on_fit_view(self):
         """Fit all items in view"""
-        # Get bounding rect of all items
-        items = self.scene.items()
-        if not items:
+        # The spatial index already tracks the bounds of every card
+        rect = self.spatial_index.bounds()
+        if rect.isEmpty():
             return
-        # Calculate bounding rect of all items
-        rect = items[0].sceneBoundingRect()
-        for item in items[1:]:
-            rect = rect.united(item.sceneBoundingRect())
         # Add margin
         rect.adjust(-50, -50, 50, 50)
         # Fit view to rect
         self.view.fitInView(rect, Qt.AspectRatioMode.KeepAspectRatio)
+        self.view.finish_interaction()
 
     def on_reset_view(self):
         """Reset view to default position and zoom"""
         self.view.resetTransform()
         self.view.centerOn(self.scene.sceneRect().center())
+        self.view.finish_interaction()
+
+    def on_export_canvas(self):
+        """Ask for a file and export the canvas to it"""
+        settings = QSettings("ArcanaLand", "TarotCanvas")
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Canvas",
+            settings.value("canvas/last_export_path", f"{self.tab_name}.png"),
+            "PNG Image (*.png);;PDF Document (*.pdf);;SVG Image (*.svg);;Card Layout (*.json)",
+        )
+        if not path:
+            return
+
+        dpi = 300
+        if not path.lower().endswith(".json"):
+            dpi, ok = QInputDialog.getInt(self, "Export Canvas", "Resolution (DPI):", 300, 72, 1200)
+            if not ok:
+                return
+
+        settings.setValue("canvas/last_export_path", path)
+        try:
+            self.export_canvas(path, dpi)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Export Failed", f"Could not export the canvas:\n{e}")
+
+    def export_canvas(self, path, dpi=300):
+        """Export the cards on the canvas to a PNG, PDF, SVG or layout JSON file"""
+        if str(path).lower().endswith(".json"):
+            with open(path, "w") as f:
+                json.dump(scene_layout(self.scene), f, indent=2)
+            print(f"Saved canvas layout to {path}")
+            return
+
+        # Export cards at rest rather than caught mid-wobble
+        cards = [item for item in self.scene.items() if isinstance(item, DraggableCardItem)]
+        rotations = [item.rotation() for item in cards]
+        for item in cards:
+            item.setRotation(item.base_rotation)
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            with self.layers.showing_all():
+                export_scene(self.scene, path, dpi=dpi)
+        finally:
+            QApplication.restoreOverrideCursor()
+            for item, rotation in zip(cards, rotations, strict=True):
+                item.setRotation(rotation)
+
+        print(f"Exported canvas to {path} at {dpi} DPI")
+
+    def on_find_cards(self):
+        """Search the cards placed on this canvas"""
+        dialog = CanvasFindDialog(self, self)
+        dialog.exec()
+
+    def find_cards(self, text):
+        """Get (card, item showing it) for every card on the canvas matching a search"""
+        return self.card_index.search(text)
+
+    def highlight_cards(self, items):
+        """Pulse an outline around the given items, replacing any earlier highlight"""
+        if self._search_highlight is not None:
+            self._search_highlight.animation.stop()
+            self._search_highlight.animation.deleteLater()
+            if self._search_highlight.scene() is not None:
+                self.scene.removeItem(self._search_highlight)
+            self._search_highlight = None
+        if not items:
+            return
+
+        highlight = SearchHighlight((item.sceneBoundingRect() for item in items), self)
+        self.scene.addItem(highlight)
+        highlight.animation.finished.connect(lambda: self.highlight_cards([]))
+        highlight.animation.start()
+        self._search_highlight = highlight
+
+    def center_on_card(self, item):
+        """Scroll the view so an item is in the middle"""
+        self.view.centerOn(item.sceneBoundingRect().center())
+
+    def on_show_layers(self):
+        """Show the layers, topmost first, with their visibility, lock and order"""
+        menu = QMenu(self)
+        for layer in reversed(self.layers.layers):
+            active = layer is self.layers.active
+            layer_menu = menu.addMenu(f"{layer.name}{' (active)' if active else ''}")
+
+            make_active = layer_menu.addAction("Make Active")
+            make_active.setEnabled(not active)
+            make_active.triggered.connect(lambda _, layer=layer: self.layers.set_active(layer))
+
+            visible = layer_menu.addAction("Visible")
+            visible.setCheckable(True)
+            visible.setChecked(layer.visible)
+            visible.toggled.connect(
+                lambda checked, layer=layer: self.layers.set_visible(layer, checked)
+            )
+
+            locked = layer_menu.addAction("Locked")
+            locked.setCheckable(True)
+            locked.setChecked(layer.locked)
+            locked.setEnabled(not active)
+            locked.toggled.connect(
+                lambda checked, layer=layer: self.layers.set_locked(layer, checked)
+            )
+
+            layer_menu.addSeparator()
+            move_here = layer_menu.addAction("Move Selected Cards Here")
+            move_here.setEnabled(bool(self.selected_card_items()) and not layer.locked)
+            move_here.triggered.connect(
+                lambda _, layer=layer: self.layers.move_items(self.selected_card_items(), layer)
+            )
+            layer_menu.addAction("Move Up").triggered.connect(
+                lambda _, layer=layer: self.layers.move_layer(layer, 1)
+            )
+            layer_menu.addAction("Move Down").triggered.connect(
+                lambda _, layer=layer: self.layers.move_layer(layer, -1)
+            )
+            layer_menu.addAction("Rename...").triggered.connect(
+                lambda _, layer=layer: self.rename_layer(layer)
+            )
+            remove = layer_menu.addAction("Delete Layer")
+            remove.setEnabled(len(self.layers.layers) > 1)
+            remove.triggered.connect(lambda _, layer=layer: self.layers.remove_layer(layer))
+
+        menu.addSeparator()
+        menu.addAction("New Layer...").triggered.connect(self.new_layer)
+        menu.exec(QCursor.pos())
+
+    def new_layer(self):
+        """Ask for a name and add a layer on top, where new cards will go"""
+        name, ok = QInputDialog.getText(
+            self, "New Layer", "Layer name:", text=f"Layer {len(self.layers.layers) + 1}"
+        )
+        if ok and name.strip():
+            self.layers.add_layer(name.strip())
+
+    def rename_layer(self, layer):
+        name, ok = QInputDialog.getText(self, "Rename Layer", "Layer name:", text=layer.name)
+        if ok and name.strip():
+            layer.name = name.strip()
+
+    def on_toggle_minimap(self):
+        """Show or hide the minimap and remember the choice"""
+        visible = not self.minimap.isVisible()
+        self.minimap.setVisible(visible)
+        QSettings("ArcanaLand", "TarotCanvas").setValue("canvas/show_minimap", visible)
+
+    def on_toggle_diagnostics(self):
+        """Show or hide the frame timing overlay"""
+        self.view.set_diagnostics_visible(not self.view.diagnostics_overlay.isVisible())
+
+    def on_record_trace(self):
+        """Record a few seconds of frame timings, or stop a recording early"""
+        if self.view.frame_stats.recording:
+            self.stop_trace()
+            return
+
+        self.view.diagnostics_overlay.start_recording()
+        QTimer.singleShot(TRACE_SECONDS * 1000, self.stop_trace)
+        print(f"Recording canvas frame timings for {TRACE_SECONDS} seconds")
+
+    def stop_trace(self):
+        """Write the frame timings recorded so far to the traces directory"""
+        if not self.view.frame_stats.recording:
+            return
+
+        trace_dir = get_data_directory("tarot-canvas/traces")
+        trace_dir.mkdir(parents=True, exist_ok=True)
+        path = trace_dir / f"canvas-trace-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        events = self.view.diagnostics_overlay.stop_recording(path)
+        print(f"Wrote {events} trace events to {path}")
 
     # Card Manipulation Methods
     def on_rotate_card(self):
         """Rotate the selected card by 90 degrees"""
-        items = self.scene.selectedItems()
-        for item in items:
-            if isinstance(item, DraggableCardItem):
-                item.setRotation((item.rotation() + 90) % 360)
+        for item in self.selected_card_items():
+            item.set_base_rotation((item.base_rotation + 90) % 360)
 
     def on_flip_card(self):
         """Flip the selected card upside down (to indicate reversed position in Tarot)"""
-        items = self.scene.selectedItems()
-        for item in items:
-            if isinstance(item, DraggableCardItem):
-                # First, stop all animations that might override our rotation
-                if hasattr(item, "rotation_anim"):
-                    item.rotation_anim.stop()
+        items = self.selected_card_items()
+        if not items:
+            return
 
-                # Toggle between normal and reversed position (180° rotation)
-                current_rotation = item.rotation()
+        old_state = capture_layout(items)
+        new_state = old_state[:]
+        for offset in range(2, len(new_state), 3):
+            # If close to upright (0°), flip to reversed (180°)
+            # If close to reversed (180°), flip to upright (0°)
+            current_rotation = new_state[offset] % 360
+            new_state[offset] = 180 if current_rotation < 90 or current_rotation > 270 else 0
 
-                # If close to upright (0°), flip to reversed (180°)
-                # If close to reversed (180°), flip to upright (0°)
-                new_rotation = 0
-                if abs(current_rotation % 360) < 90 or abs(current_rotation % 360) > 270:
-                    new_rotation = 180
+        self.undo_stack.push(CardLayoutCommand(items, old_state, new_state, "Flip Cards"))
 
-                # Set the new rotation directly
-                item.setRotation(new_rotation)
+    def on_duplicate_card(self):
+        """Duplicate the selected card"""
+        new_items = []
+        for item in self.selected_card_items():
+            if isinstance(item, CardStack):
+                continue
+            # Create a copy of the card, with its own card data to turn
+            new_item = DraggableCardItem(item.pixmap(), dict(item.card_data), self)
+            # Position it slightly offset from the original
+            new_item.setPos(item.pos() + QPointF(20, 20))
+            new_item.set_base_rotation(item.base_rotation)
+            new_items.append(new_item)
+
+        if new_items:
+            self.undo_stack.push(CardAddCommand(self.scene, new_items, "Duplicate Cards"))
 
-                # Update the base rotation in the animation controller
-                if hasattr(item, "anim_controller"):
-                    item.anim_controller._rotation = new_rotation
+    def on_delete_card(self):
+        """Remove the selected card from canvas"""
+        items = self.selected_card_items()
+        if items:
+            self.undo_stack.push(CardRemoveCommand(self.scene, items, "Delete Cards"))
 
-                # Update the card's internal state to reflect reversed status
-                if hasattr(item, "card_data") and item.card_data:
-                    # Toggle the reversed flag (create if it doesn't exist)
-                    item.card_data["reversed"] = new_rotation == 180
+    def on_undo(self):
+        """Undo the last canvas change"""
+        self.undo_stack.undo()
 
-                # Now restart the animation with the new base rotation
-                if hasattr(item, "setup_wobble_animation"):
-                    item.setup_wobble_animation(base_rotation=new_rotation)
+    def on_redo(self):
+        """Redo the last undone canvas change"""
+        self.undo_stack.redo()
 
-    def on_duplicate_card(self):
-        """Duplicate the selected card"""
-        items = self.scene.selectedItems()
+    def on_group_cards(self, collapsed=False):
+        """Gather the selected cards into a stack that moves and flips as one"""
+        items = self.selected_card_items()
+        if len(items) < 2:
+            return
+
+        text = "Stack Cards" if collapsed else "Group Cards"
+        self.undo_stack.beginMacro(text)
+        # Stacks do not nest - selected stacks contribute their cards instead
+        cards = []
         for item in items:
-            if isinstance(item, DraggableCardItem):
-                # Create a copy of the card
-                new_item = DraggableCardItem(item.pixmap(), item.card_data, self)
-                # Position it slightly offset from the original
-                new_item.setPos(item.pos() + QPointF(20, 20))
-                new_item.setRotation(item.rotation())
-                # Add to scene
-                self.scene.addItem(new_item)
+            if isinstance(item, CardStack):
+                self.undo_stack.push(CardUngroupCommand(self.scene, item))
+                cards.extend(item.cards)
+            else:
+                cards.append(item)
+
+        stack = CardStack(cards, self, collapsed=collapsed)
+        self.undo_stack.push(CardGroupCommand(self.scene, stack, text))
+        self.undo_stack.endMacro()
+        stack.setSelected(True)
+
+    def on_stack_cards(self):
+        """Gather the selected cards into a collapsed pile"""
+        self.on_group_cards(collapsed=True)
+
+    def on_ungroup_cards(self):
+        """Break the selected stacks back up into their cards"""
+        stacks = [item for item in self.selected_card_items() if isinstance(item, CardStack)]
+        if not stacks:
+            return
 
-    def on_delete_card(self):
-        """Remove the selected card from canvas"""
-        items = self.scene.selectedItems()
+        self.undo_stack.beginMacro("Ungroup Cards")
+        for stack in stacks:
+            self.undo_stack.push(CardUngroupCommand(self.scene, stack))
+        self.undo_stack.endMacro()
+        for stack in stacks:
+            for card in stack.cards:
+                card.setSelected(True)
+
+    def selected_card_items(self):
+        """Get the selected card items, ignoring any other scene items"""
+        return [item for item in self.scene.selectedItems() if isinstance(item, DraggableCardItem)]
+
+    def on_auto_arrange(self):
+        """Show the auto-arrange modes"""
+        menu = QMenu(self)
+        for mode, text in ARRANGE_MODES.items():
+            action = menu.addAction(text)
+            action.triggered.connect(lambda _, mode=mode: self.auto_arrange(mode))
+        menu.exec(QCursor.pos())
+
+    def auto_arrange(self, mode, items=None, animate=True):
+        """Rearrange the selected cards, or every card, as one animated undo step"""
+        if items is None:
+            items = self.selected_card_items()
+            if len(items) < 2:
+                items = [
+                    item
+                    for item in self.scene.items()
+                    if isinstance(item, DraggableCardItem)
+                    and item.parentItem() is None
+                    and not self.layers.is_locked(item)
+                ]
+        if len(items) < 2:
+            return
+
+        self.finish_arrange_animation()
+        old_state = capture_layout(items)
+        start = array("d", old_state[0::3])
+        start_y = array("d", old_state[1::3])
+        target = arrange(items, mode)
+
+        def finish():
+            self._arrange_animation = None
+            self.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+            apply_positions(items, target)
+            new_state = capture_layout(items)
+            if old_state != new_state:
+                self.undo_stack.push(
+                    CardLayoutCommand(items, old_state, new_state, ARRANGE_MODES[mode])
+                )
+
+        if not animate or len(items) > ARRANGE_ANIMATION_LIMIT:
+            finish()
+            return
+
+        def step(progress):
+            for i, item in enumerate(items):
+                item.setPos(
+                    start[i] + (target[2 * i] - start[i]) * progress,
+                    start_y[i] + (target[2 * i + 1] - start_y[i]) * progress,
+                )
+
+        # One animation drives every card, and the scene's BSP index is
+        # rebuilt once at the end rather than on every frame
+        self.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+        animation = QVariantAnimation(self)
+        animation.setDuration(ARRANGE_ANIMATION_MS)
+        animation.setStartValue(0.0)
+        animation.setEndValue(1.0)
+        animation.setEasingCurve(QEasingCurve.Type.OutCubic)
+        animation.valueChanged.connect(step)
+        animation.finished.connect(finish)
+        self._arrange_animation = animation
+        animation.start(QVariantAnimation.DeletionPolicy.DeleteWhenStopped)
+
+    def finish_arrange_animation(self):
+        """Jump a running auto-arrange animation to its end"""
+        if self._arrange_animation is not None:
+            self._arrange_animation.setCurrentTime(self._arrange_animation.duration())
+
+    def push_layout_change(self, text, items, arrange, *args):
+        """Run an arrangement function and record the result as a single undo step"""
+        old_state = capture_layout(items)
+        arrange(items, *args)
+        new_state = capture_layout(items)
+        if old_state != new_state:
+            self.undo_stack.push(CardLayoutCommand(items, old_state, new_state, text))
+
+    def index_card(self, item):
+        """Update the spatial index after a card moved, turned, was restacked, added or removed"""
+        self.layers.sync(item)
+        # Cards in a stack are covered by the stack's own entry, and cards on
+        # hidden layers are left out, so nothing snaps to or finds them
+        hidden = self.layers.is_hidden(item)
+        if item.scene() is self.scene and item.parentItem() is None and not hidden:
+            self.spatial_index.insert(item)
+        else:
+            self.spatial_index.remove(item)
+        self.card_index.sync(item, None if hidden else self.scene)
+        self.minimap.sync(item)
+
+    def index_cards(self, items):
+        """Update the indexes after items were shown or hidden with their layer"""
         for item in items:
-            self.scene.removeItem(item)
+            self.index_card(item)
+            for child in item.childItems():
+                if isinstance(child, DraggableCardItem):
+                    self.index_card(child)
+
+    def card_items_at(self, scene_pos):
+        """Get the cards under a scene position, topmost first"""
+        items = self.spatial_index.items_at(scene_pos)
+        return sorted(items, key=lambda item: item.zValue(), reverse=True)
+
+    def snap_card_position(self, item, new_pos):
+        """Snap a single dragged card onto neighbouring card edges or the grid"""
+        if not (self.snap_to_edges or self.snap_to_grid):
+            return new_pos
+
+        # Snapping one card of a multi-selection would break the group's layout
+        if self._drag_items and len(self._drag_items) > 1:
+            return new_pos
+
+        rect = resting_rect(item).translated(new_pos - item.pos())
+        threshold = SNAP_DISTANCE / max(self.view.transform().m11(), 0.01)
+        dx, dy = self.spatial_index.snap_offset(
+            rect,
+            threshold,
+            grid_size=self.grid_size if self.snap_to_grid else None,
+            snap_to_edges=self.snap_to_edges,
+            exclude={item},
+        )
+        return new_pos + QPointF(dx, dy)
+
+    def begin_card_drag(self):
+        """Remember where the selected cards were before a drag starts"""
+        self._drag_items = self.selected_card_items()
+        self._drag_state = capture_layout(self._drag_items)
+
+    def end_card_drag(self):
+        """Record a finished drag; consecutive drags of the same cards merge"""
+        if not self._drag_items:
+            return
+
+        items, old_state = self._drag_items, self._drag_state
+        self._drag_items = None
+        self._drag_state = None
+
+        new_state = capture_layout(items)
+        if old_state != new_state:
+            text = (
+                f"Move {items[0].card_data.get('name', 'Card')}"
+                if len(items) == 1
+                else "Move Cards"
+            )
+            self.undo_stack.push(
+                CardLayoutCommand(items, old_state, new_state, text, mergeable=True)
+            )
 
     # Arrangement Control Methods
     def on_bring_to_front(self):
@@ -671,7 +1297,7 @@ class CanvasTab(BaseTab):
 
     def on_align_cards(self):
         """Show alignment options for selected cards"""
-        items = self.scene.selectedItems()
+        items = self.selected_card_items()
         # Only proceed if we have 2+ cards selected
         if len(items) < 2:
             return
@@ -851,19 +1477,51 @@ class CanvasTab(BaseTab):
             )
         )
 
-        # Connect actions to alignment functions
-        h_left.triggered.connect(lambda: align_items_horizontally(items, "left"))
-        h_center.triggered.connect(lambda: align_items_horizontally(items, "center"))
-        h_right.triggered.connect(lambda: align_items_horizontally(items, "right"))
+        # Connect actions to alignment functions, each recorded as one undo step
+        h_left.triggered.connect(
+            lambda: self.push_layout_change(
+                "Align Left Edges", items, align_items_horizontally, "left"
+            )
+        )
+        h_center.triggered.connect(
+            lambda: self.push_layout_change(
+                "Align Centers", items, align_items_horizontally, "center"
+            )
+        )
+        h_right.triggered.connect(
+            lambda: self.push_layout_change(
+                "Align Right Edges", items, align_items_horizontally, "right"
+            )
+        )
 
-        v_top.triggered.connect(lambda: align_items_vertically(items, "top"))
-        v_center.triggered.connect(lambda: align_items_vertically(items, "center"))
-        v_bottom.triggered.connect(lambda: align_items_vertically(items, "bottom"))
+        v_top.triggered.connect(
+            lambda: self.push_layout_change("Align Top Edges", items, align_items_vertically, "top")
+        )
+        v_center.triggered.connect(
+            lambda: self.push_layout_change(
+                "Align Centers", items, align_items_vertically, "center"
+            )
+        )
+        v_bottom.triggered.connect(
+            lambda: self.push_layout_change(
+                "Align Bottom Edges", items, align_items_vertically, "bottom"
+            )
+        )
 
-        distribute_h.triggered.connect(lambda: distribute_items_horizontally(items))
-        distribute_v.triggered.connect(lambda: distribute_items_vertically(items))
+        distribute_h.triggered.connect(
+            lambda: self.push_layout_change(
+                "Distribute Horizontally", items, distribute_items_horizontally
+            )
+        )
+        distribute_v.triggered.connect(
+            lambda: self.push_layout_change(
+                "Distribute Vertically", items, distribute_items_vertically
+            )
+        )
 
-        circle_arrange.triggered.connect(lambda: arrange_items_in_circle(items))
+        circle_arrange.triggered.connect(
+            lambda: self.push_layout_change("Arrange in Circle", items, arrange_items_in_circle)
+        )
 
         # Show the menu at the cursor position
         menu.exec(QCursor.pos())
@@ -0,0 +1,89 @@
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+
+# Time without typing after which an edited document is saved
+IDLE_MS = 1500
+
+# Longest a document stays unsaved while it keeps being edited
+MAX_DELAY_MS = 10000
+
+
+class AutosaveCoordinator(QObject):
+    """Saves edited documents shortly after typing pauses, with one timer for all of them.
+
+    Each watched document is saved once it has gone `idle_ms` without a
+    change, or `max_delay_ms` after its first unsaved change if the typing
+    never pauses. The single timer is set for the next document due, and
+    stays stopped while nothing is waiting to be saved.
+    """
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """Get the singleton instance"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, idle_ms=IDLE_MS, max_delay_ms=MAX_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self.idle_ms = idle_ms
+        self.max_delay_ms = max_delay_ms
+        self._savers = {}  # document -> function saving it
+        self._dirty = {}  # document -> (first unsaved change, last change), monotonic seconds
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.save_due)
+
+    def watch(self, document, save):
+        """Autosave a QTextDocument by calling `save` when it is due, if it is still modified"""
+        self._savers[document] = save
+        document.contentsChanged.connect(lambda: self.document_changed(document))
+        document.destroyed.connect(lambda: self.forget(document))
+
+    def unwatch(self, document):
+        self._savers.pop(document, None)
+        if self._dirty.pop(document, None) is not None:
+            self._schedule()
+
+    def forget(self, document):
+        """Drop a destroyed document, leaving the timer alone as it may be gone already on exit"""
+        self._savers.pop(document, None)
+        self._dirty.pop(document, None)
+
+    def is_active(self):
+        """Check whether any document is waiting to be saved"""
+        return self._timer.isActive()
+
+    def document_changed(self, document):
+        if document not in self._savers:
+            return
+        now = time.monotonic()
+        first, _ = self._dirty.get(document, (now, now))
+        self._dirty[document] = (first, now)
+        self._schedule()
+
+    def _due(self, times):
+        first, last = times
+        return min(last + self.idle_ms / 1000, first + self.max_delay_ms / 1000)
+
+    def _schedule(self):
+        """Set the timer for the next document due, or stop it if none is waiting"""
+        if not self._dirty:
+            self._timer.stop()
+            return
+        due = min(self._due(times) for times in self._dirty.values())
+        self._timer.start(max(0, round((due - time.monotonic()) * 1000)))
+
+    def save_due(self):
+        """Save every document whose time has come"""
+        now = time.monotonic()
+        for document, times in list(self._dirty.items()):
+            if self._due(times) <= now:
+                del self._dirty[document]
+                # Documents saved some other way in the meantime are left alone
+                if document.isModified():
+                    self._savers[document]()
+        self._schedule()
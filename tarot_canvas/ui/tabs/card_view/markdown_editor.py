@@ -6,49 +6,145 @@ from tarot_canvas.ui.tabs.card_view.card_preview import CardPreviewWidget
 from tarot_canvas.utils.logger import logger
 
 
+def open_link_start(line, pos):
+    """Get where the [[wiki link]] being typed at an offset in a line starts, or -1"""
+    start = line.rfind("[[", 0, pos)
+    if start == -1 or "]]" in line[start:pos]:
+        return -1
+    return start
+
+
+def wiki_link_around(line, pos):
+    """Get the (start, end) of the text inside the [[wiki link]] around an offset in a line"""
+    start = line.rfind("[[", 0, pos)
+    if start == -1:
+        return None
+    end = line.find("]]", start)
+    if end == -1 or pos > end:
+        return None
+    return start + 2, end
+
+
+# Block states carried from one line to the next
+NORMAL = -1  # What Qt gives a block that was never highlighted
+IN_CODE = 1  # Inside a ``` or ~~~ fenced code block
+IN_FRONT_MATTER = 2  # Inside the --- block opening a note
+
+# Inline tokens, tried in this order at each position; every group is one token type
+_INLINE_TOKENS = ("wiki_link", "link", "bold", "italic", "code")
+_INLINE = QRegularExpression(
+    r"(\[\[.*?\]\])"  # Internal wiki-style links [[reference]]
+    r"|(\[.*?\]\(.*?\))"  # Markdown links [text](url)
+    r"|(\*\*.*?\*\*)"  # **bold**
+    r"|(\*[^\*]+\*)"  # *italic*
+    r"|(`[^`]+`)"  # `code`
+)
+_INLINE.optimize()
+
+_LIST_ITEM = QRegularExpression(r"^\s*[\-\*] ")
+_LIST_ITEM.optimize()
+
+
 class MarkdownHighlighter(QSyntaxHighlighter):
-    """Syntax highlighter for the Markdown format"""
+    """Syntax highlighter for the Markdown format.
+
+    Each line is scanned once with a single combined pattern. Fenced code
+    and front matter are followed from line to line through the block
+    state, so Qt only re-highlights the lines that changed, plus the lines
+    after them while their state keeps changing.
+    """
 
     def __init__(self, document):
         super().__init__(document)
 
-        self.highlighting_rules = []
-
-        # Header format (# Header)
         header_format = QTextCharFormat()
         header_format.setFontWeight(QFont.Weight.Bold)
         header_format.setForeground(QColor("#569CD6"))  # Blue
-        self.highlighting_rules.append((QRegularExpression(r"^#+ .*$"), header_format))
 
-        # Bold format (**bold**)
+        list_format = QTextCharFormat()
+        list_format.setForeground(QColor("#CE9178"))  # Orange
+
         bold_format = QTextCharFormat()
         bold_format.setFontWeight(QFont.Weight.Bold)
-        self.highlighting_rules.append((QRegularExpression(r"\*\*.*?\*\*"), bold_format))
 
-        # Italic format (*italic*)
         italic_format = QTextCharFormat()
         italic_format.setFontItalic(True)
-        self.highlighting_rules.append((QRegularExpression(r"\*[^\*]+\*"), italic_format))
 
-        # List items (- item)
-        list_format = QTextCharFormat()
-        list_format.setForeground(QColor("#CE9178"))  # Orange
-        self.highlighting_rules.append((QRegularExpression(r"^\s*[\-\*] .*$"), list_format))
-
-        # Links and references
         link_format = QTextCharFormat()
         link_format.setForeground(QColor("#4EC9B0"))  # Teal
-        # Markdown links [text](url)
-        self.highlighting_rules.append((QRegularExpression(r"\[.*?\]\(.*?\)"), link_format))
-        # Internal wiki-style links [[reference]]
-        self.highlighting_rules.append((QRegularExpression(r"\[\[.*?\]\]"), link_format))
+
+        code_format = QTextCharFormat()
+        code_format.setForeground(QColor("#808080"))  # Grey
+        code_format.setFontFixedPitch(True)
+
+        meta_format = QTextCharFormat()
+        meta_format.setForeground(QColor("#6A9955"))  # Green
+
+        self.formats = {
+            "header": header_format,
+            "list": list_format,
+            "bold": bold_format,
+            "italic": italic_format,
+            "link": link_format,
+            "wiki_link": link_format,
+            "code": code_format,
+            "front_matter": meta_format,
+        }
+        # (line format, token) -> the token's format laid over the line's
+        self._merged = {}
+
+    def token_format(self, line_kind, token):
+        """Get the format of an inline token on a header or list line, built once"""
+        if line_kind is None:
+            return self.formats[token]
+        merged = self._merged.get((line_kind, token))
+        if merged is None:
+            merged = QTextCharFormat(self.formats[line_kind])
+            merged.merge(self.formats[token])
+            self._merged[(line_kind, token)] = merged
+        return merged
 
     def highlightBlock(self, text):
-        for pattern, format in self.highlighting_rules:
-            matches = pattern.globalMatch(text)
-            while matches.hasNext():
-                match = matches.next()
-                self.setFormat(match.capturedStart(), match.capturedLength(), format)
+        state = self.previousBlockState()
+        # Offsets are in UTF-16 code units, which is what the block length counts
+        length = self.currentBlock().length() - 1
+        stripped = text.strip()
+
+        if state == IN_FRONT_MATTER or (
+            stripped == "---" and self.currentBlock().blockNumber() == 0
+        ):
+            self.setFormat(0, length, self.formats["front_matter"])
+            closing = state == IN_FRONT_MATTER and stripped in ("---", "...")
+            self.setCurrentBlockState(NORMAL if closing else IN_FRONT_MATTER)
+            return
+
+        if stripped.startswith(("```", "~~~")):
+            self.setFormat(0, length, self.formats["code"])
+            self.setCurrentBlockState(NORMAL if state == IN_CODE else IN_CODE)
+            return
+        if state == IN_CODE:
+            self.setFormat(0, length, self.formats["code"])
+            self.setCurrentBlockState(IN_CODE)
+            return
+        self.setCurrentBlockState(NORMAL)
+
+        line_kind = None
+        if text.startswith("#") and text.lstrip("#").startswith(" "):
+            line_kind = "header"
+        elif _LIST_ITEM.match(text).hasMatch():
+            line_kind = "list"
+        if line_kind is not None:
+            self.setFormat(0, length, self.formats[line_kind])
+
+        matches = _INLINE.globalMatch(text)
+        while matches.hasNext():
+            match = matches.next()
+            token = _INLINE_TOKENS[match.lastCapturedIndex() - 1]
+            self.setFormat(
+                match.capturedStart(),
+                match.capturedLength(),
+                self.token_format(line_kind, token),
+            )
 
 
 class MarkdownEditor(QPlainTextEdit):
@@ -98,7 +194,8 @@ class MarkdownEditor(QPlainTextEdit):
         """Set up auto-completion for wiki links"""
         self.completer = QCompleter(self)
         self.completer.setWidget(self)
-        self.completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
+        # The parent ranks the completions itself, so the completer shows them as given
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
         self.completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
         self.completer.setMaxVisibleItems(10)
 
@@ -109,14 +206,12 @@ class MarkdownEditor(QPlainTextEdit):
         self.completer.activated.connect(self.insert_completion)
 
         # Empty model initially
-        self.completer.setModel(QStringListModel([]))
+        self.completion_model = QStringListModel([])
+        self.completer.setModel(self.completion_model)
 
     def set_completion_items(self, items):
         """Set the list of items for auto-completion"""
-        if not items:
-            items = []
-        model = QStringListModel(items)
-        self.completer.setModel(model)
+        self.completion_model.setStringList(items or [])
 
     def set_deck_manager(self, deck_manager):
         """Set the deck manager reference directly"""
@@ -148,8 +243,7 @@ class MarkdownEditor(QPlainTextEdit):
         ):
             # If the user types '[' check if it's a second consecutive one for a wiki link
             cursor = self.textCursor()
-            pos = cursor.position()
-            if pos > 0 and self.toPlainText()[pos - 1] == "[":
+            if self.document().characterAt(cursor.position() - 1) == "[":
                 # Double bracket detected, insert closing brackets too
                 super().keyPressEvent(event)
                 self.insertPlainText("]]")
@@ -176,20 +270,20 @@ class MarkdownEditor(QPlainTextEdit):
                 return
 
         # Check for auto-completion trigger
-        if event.key() == Qt.Key.Key_BracketLeft and not self.completer.popup().isVisible():
-            cursor = self.textCursor()
-            pos = cursor.position()
-            if pos > 0 and self.toPlainText()[pos - 1] == "[":
-                # Start of a wiki link, show completion
-                self.start_link_completion()
+        if (
+            event.key() == Qt.Key.Key_BracketLeft
+            and not self.completer.popup().isVisible()
+            and self.document().characterAt(self.textCursor().position() - 1) == "["
+        ):
+            # Start of a wiki link, show completion
+            self.start_link_completion()
 
         # Regular key processing
         super().keyPressEvent(event)
 
-        # Check after processing for wiki link completion
+        # Check after processing for wiki link completion, looking at the current line only
         cursor = self.textCursor()
-        text_before_cursor = self.toPlainText()[: cursor.position()]
-        if "[[" in text_before_cursor and "]]" not in text_before_cursor[-2:]:
+        if open_link_start(cursor.block().text(), cursor.positionInBlock()) != -1:
             # We're inside a wiki link, show/update completion
             self.update_link_completion()
         else:
@@ -206,18 +300,16 @@ class MarkdownEditor(QPlainTextEdit):
 
     def check_link_at_cursor(self, cursor):
         """Check if the cursor is over a link and emit a signal if so"""
-        text = self.toPlainText()
-        pos = cursor.position()
+        # Links never span lines, so only the cursor's line is searched
+        text = cursor.block().text()
+        pos = cursor.positionInBlock()
 
         # Check for wiki links [[link]]
-        link_start = text.rfind("[[", 0, pos)
-        if link_start != -1:
-            link_end = text.find("]]", link_start)
-            if link_end != -1 and pos <= link_end:
-                # We're inside a wiki link
-                link_text = text[link_start + 2 : link_end]
-                self.linkClicked.emit(link_text)
-                return True
+        link = wiki_link_around(text, pos)
+        if link is not None:
+            # We're inside a wiki link
+            self.linkClicked.emit(text[link[0] : link[1]])
+            return True
 
         # Check for markdown links [text](link)
         link_text_start = text.rfind("[", 0, pos)
@@ -237,27 +329,18 @@ class MarkdownEditor(QPlainTextEdit):
 
     def start_link_completion(self):
         """Start the auto-completion for a wiki link"""
-        # Get all items from parent
-        if hasattr(self.parent_tab, "get_link_suggestions"):
-            items = self.parent_tab.get_link_suggestions()
-            self.set_completion_items(items)
-
-            # Show the completer
-            rect = self.cursorRect()
-            rect.setWidth(
-                self.completer.popup().sizeHintForColumn(0)
-                + self.completer.popup().verticalScrollBar().sizeHint().width()
-            )
-            self.completer.complete(rect)
+        # Let the parent catch up with cards and decks; the popup opens once [[ is typed
+        if hasattr(self.parent_tab, "sync_link_completions"):
+            self.parent_tab.sync_link_completions()
 
     def update_link_completion(self):
         """Update the auto-completion popup based on current text"""
         cursor = self.textCursor()
-        text = self.toPlainText()
-        pos = cursor.position()
+        text = cursor.block().text()
+        pos = cursor.positionInBlock()
 
         # Find the start of the current link
-        link_start = text.rfind("[[", 0, pos)
+        link_start = open_link_start(text, pos)
         if link_start == -1:
             self.completer.popup().hide()
             return
@@ -265,11 +348,13 @@ class MarkdownEditor(QPlainTextEdit):
         # Get the partial text typed so far
         partial_text = text[link_start + 2 : pos]
 
-        # Update the completer to filter based on the partial text
-        self.completer.setCompletionPrefix(partial_text)
+        # Ask the parent for the best matches of the partial text
+        if not hasattr(self.parent_tab, "link_completions"):
+            return
+        self.set_completion_items(self.parent_tab.link_completions(partial_text))
 
         # Reposition and show the completer
-        if self.completer.completionCount() > 0:
+        if self.completion_model.rowCount() > 0:
             rect = self.cursorRect()
             rect.setWidth(
                 self.completer.popup().sizeHintForColumn(0)
@@ -282,17 +367,18 @@ class MarkdownEditor(QPlainTextEdit):
     def insert_completion(self, completion):
         """Insert the selected completion text"""
         cursor = self.textCursor()
-        text = self.toPlainText()
-        pos = cursor.position()
+        text = cursor.block().text()
+        pos = cursor.positionInBlock()
 
         # Find the start of the current link
-        link_start = text.rfind("[[", 0, pos)
+        link_start = open_link_start(text, pos)
         if link_start == -1:
             return
 
         # Replace the partial text with the completion
-        cursor.setPosition(link_start + 2)
-        cursor.setPosition(pos, QTextCursor.MoveMode.KeepAnchor)
+        block_start = cursor.block().position()
+        cursor.setPosition(block_start + link_start + 2)
+        cursor.setPosition(block_start + pos, QTextCursor.MoveMode.KeepAnchor)
         cursor.removeSelectedText()
         cursor.insertText(completion)
         self.setTextCursor(cursor)
@@ -320,29 +406,20 @@ class MarkdownEditor(QPlainTextEdit):
         # Get text cursor at mouse position
         cursor = self.cursorForPosition(self.hover_position)
 
-        # Check if we're hovering over a link to a card
-        text = self.toPlainText()
-        pos = cursor.position()
+        # Check if we're hovering over a link to a card, on the hovered line only
+        text = cursor.block().text()
+        pos = cursor.positionInBlock()
 
-        logger.debug(f"Checking hover at position {pos} of {len(text)} chars")
-
-        # Check for card links specifically
-        link_start = text.rfind("[[card:", 0, pos)
-        if link_start == -1:
-            link_start = text.rfind("[[", 0, pos)
-            if link_start == -1:
-                logger.debug("No [[ link start found near hover position")
-                self.preview.hide()
-                return
+        logger.debug(f"Checking hover at line {cursor.blockNumber()}, column {pos}")
 
-        link_end = text.find("]]", link_start)
-        if link_end == -1 or pos > link_end:
-            logger.debug(f"No ]] link end found, or position {pos} is after link end {link_end}")
+        link = wiki_link_around(text, pos)
+        if link is None:
+            logger.debug("No [[link]] around hover position")
             self.preview.hide()
             return
 
         # Extract link text
-        link_text = text[link_start + 2 : link_end]
+        link_text = text[link[0] : link[1]]
         logger.debug(f"Detected hover over link: [[{link_text}]]")
 
         # If it's a card link, show preview
@@ -1,9 +1,22 @@
-from PyQt6.QtCore import QSize, Qt, pyqtSignal
+import time
+from datetime import datetime
+
+from PyQt6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QSize,
+    QSortFilterProxyModel,
+    Qt,
+    pyqtSignal,
+)
 from PyQt6.QtGui import QIcon
 from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
     QHBoxLayout,
     QLabel,
     QLineEdit,
+    QListView,
     QListWidget,
     QListWidgetItem,
     QPushButton,
@@ -50,15 +63,134 @@ class EmptyStateWidget(QWidget):
         layout.addStretch(1)
 
 
+# Roles under which the notes model gives each note's details
+FILE_PATH_ROLE = Qt.ItemDataRole.UserRole
+CARD_ID_ROLE = Qt.ItemDataRole.UserRole + 1
+MODIFIED_ROLE = Qt.ItemDataRole.UserRole + 2
+
+# Date filters offered above the list, as (label, days back; None for any time)
+DATE_FILTERS = [("Any time", None), ("Past week", 7), ("Past month", 30), ("Past year", 365)]
+
+# Sort orders offered above the list, as (label, role, order)
+SORT_ORDERS = [
+    ("Newest first", MODIFIED_ROLE, Qt.SortOrder.DescendingOrder),
+    ("Oldest first", MODIFIED_ROLE, Qt.SortOrder.AscendingOrder),
+    ("Title", Qt.ItemDataRole.DisplayRole, Qt.SortOrder.AscendingOrder),
+]
+
+
+class NotesListModel(QAbstractListModel):
+    """One card's notes, as entries of the notes index"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._notes = []
+        self._rows = None  # file path -> row, rebuilt when rows move
+
+    def rowCount(self, parent=None):
+        return 0 if parent is not None and parent.isValid() else len(self._notes)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        note = self._notes[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return note.name
+        if role == FILE_PATH_ROLE:
+            return note.file_path
+        if role == CARD_ID_ROLE:
+            return note.card_id
+        if role == MODIFIED_ROLE:
+            return note.mtime
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"Edited {datetime.fromtimestamp(note.mtime):%Y-%m-%d %H:%M}"
+        return None
+
+    def set_notes(self, notes):
+        self.beginResetModel()
+        self._notes = list(notes)
+        self._rows = None
+        self.endResetModel()
+
+    def note_at(self, row):
+        return self._notes[row]
+
+    def row_of(self, file_path):
+        """Get the row of the note stored in a file, or -1"""
+        if self._rows is None:
+            self._rows = {note.file_path: row for row, note in enumerate(self._notes)}
+        return self._rows.get(file_path, -1)
+
+    def add_note(self, note):
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._notes.insert(0, note)
+        self._rows = None
+        self.endInsertRows()
+
+    def remove_note(self, file_path):
+        row = self.row_of(file_path)
+        if row == -1:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._notes[row]
+        self._rows = None
+        self.endRemoveRows()
+
+    def replace_note(self, file_path, note):
+        """Show a note in place of another, e.g. after it was renamed or saved"""
+        row = self.row_of(file_path)
+        if row == -1:
+            return
+        self._notes[row] = note
+        if note.file_path != file_path:
+            self._rows = None
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+
+class NotesFilterProxy(QSortFilterProxyModel):
+    """Sorts the notes and keeps those matching the search text and date filter.
+
+    A note matches the search text through its title, or through its text
+    when `content_matches` lists its file, as found by a full-text search.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.search_text = ""
+        self.content_matches = set()  # file paths of notes whose text matches
+        self.modified_since = None  # oldest modification time shown, or None
+        self.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setDynamicSortFilter(True)
+
+    def set_filter(self, search_text, content_matches, modified_since):
+        self.search_text = search_text.lower()
+        self.content_matches = content_matches
+        self.modified_since = modified_since
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        note = self.sourceModel().note_at(source_row)
+        if self.modified_since is not None and note.mtime < self.modified_since:
+            return False
+        return (
+            not self.search_text
+            or self.search_text in note.name.lower()
+            or note.file_path in self.content_matches
+        )
+
+
 class NotesListWidget(QWidget):
     """Widget displaying list of notes for a card"""
 
-    noteSelected = pyqtSignal(QListWidgetItem)
-    noteDoubleClicked = pyqtSignal(QListWidgetItem)
+    noteSelected = pyqtSignal(str)  # File path
+    noteDoubleClicked = pyqtSignal(str)  # File path
     createNoteClicked = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Given the search text, returns the files of the notes whose text matches
+        self.content_search = None
         self.setup_ui()
 
     def setup_ui(self):
@@ -81,19 +213,40 @@ class NotesListWidget(QWidget):
 
         layout.addLayout(header)
 
-        # Create note list
-        self.notes_list = QListWidget()
+        # Date filter and sort order
+        options = QHBoxLayout()
+        self.date_filter = QComboBox()
+        for label, _ in DATE_FILTERS:
+            self.date_filter.addItem(label)
+        options.addWidget(self.date_filter)
+        self.sort_order = QComboBox()
+        for label, _, _ in SORT_ORDERS:
+            self.sort_order.addItem(label)
+        options.addWidget(self.sort_order)
+        options.addStretch()
+        layout.addLayout(options)
+
+        # Create note list; only the visible rows are ever laid out
+        self.model = NotesListModel(self)
+        self.proxy = NotesFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setSortRole(MODIFIED_ROLE)
+        self.proxy.sort(0, Qt.SortOrder.DescendingOrder)
+        self.notes_list = QListView()
+        self.notes_list.setModel(self.proxy)
+        self.notes_list.setUniformItemSizes(True)
+        self.notes_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.notes_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 border: 1px solid #ccc;
                 border-radius: 4px;
                 padding: 5px;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 8px;
                 border-bottom: 1px solid #eee;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #e0f0ff;
                 color: #000;
             }
@@ -117,44 +270,114 @@ class NotesListWidget(QWidget):
         layout.addLayout(actions_layout)
 
         # Connect signals
-        self.notes_list.currentItemChanged.connect(
-            lambda current, previous: self.noteSelected.emit(current) if current else None
+        self.notes_list.selectionModel().currentChanged.connect(
+            lambda current, previous: self.noteSelected.emit(current.data(FILE_PATH_ROLE))
+            if current.isValid()
+            else None
+        )
+        self.notes_list.doubleClicked.connect(
+            lambda index: self.noteDoubleClicked.emit(index.data(FILE_PATH_ROLE))
         )
-        self.notes_list.itemDoubleClicked.connect(self.noteDoubleClicked.emit)
         self.search_box.textChanged.connect(self.filter_notes)
+        self.date_filter.currentIndexChanged.connect(self.filter_notes)
+        self.sort_order.currentIndexChanged.connect(self.sort_notes)
 
-    def add_note(self, name, file_path, card_id, select=False):
-        """Add a note item to the list"""
-        item = QListWidgetItem(name)
-        item.setData(Qt.ItemDataRole.UserRole, file_path)
-        item.setData(Qt.ItemDataRole.UserRole + 1, card_id)
-        self.notes_list.insertItem(0, item)
+    def set_notes(self, notes):
+        """Show a card's notes, as entries of the notes index"""
+        self.model.set_notes(notes)
+        self.filter_notes()
 
+    def add_note(self, note, select=False):
+        """Add a note to the list"""
+        self.model.add_note(note)
         if select:
-            self.notes_list.setCurrentItem(item)
+            self.select_note(note.file_path)
+
+    def replace_note(self, file_path, note):
+        self.model.replace_note(file_path, note)
 
-        return item
+    def remove_note(self, file_path):
+        self.model.remove_note(file_path)
 
     def clear_notes(self):
         """Clear all notes from the list"""
-        self.notes_list.clear()
-
-    def get_current_item(self):
-        """Get the currently selected item"""
-        return self.notes_list.currentItem()
-
-    def filter_notes(self, text):
-        """Filter notes based on search text"""
-        search_text = text.lower()
-
-        for i in range(self.notes_list.count()):
-            item = self.notes_list.item(i)
-            if not search_text or search_text in item.text().lower():
-                item.setHidden(False)
-            else:
-                item.setHidden(True)
-
-    def remove_item(self, item):
-        """Remove an item from the list"""
-        row = self.notes_list.row(item)
-        self.notes_list.takeItem(row)
+        self.model.set_notes([])
+
+    def count(self):
+        """Get the number of notes listed, whether or not the filters show them"""
+        return self.model.rowCount()
+
+    def contains(self, file_path):
+        return self.model.row_of(file_path) != -1
+
+    def select_note(self, file_path):
+        """Make a note the current one, clearing the filters if they hide it"""
+        row = self.model.row_of(file_path)
+        if row == -1:
+            return False
+        index = self.proxy.mapFromSource(self.model.index(row))
+        if not index.isValid():
+            self.search_box.clear()
+            self.date_filter.setCurrentIndex(0)
+            index = self.proxy.mapFromSource(self.model.index(row))
+        self.notes_list.setCurrentIndex(index)
+        self.notes_list.scrollTo(index)
+        return True
+
+    def current_note(self):
+        """Get the file path of the selected note, or None"""
+        index = self.notes_list.currentIndex()
+        return index.data(FILE_PATH_ROLE) if index.isValid() else None
+
+    def filter_notes(self, *args):
+        """Filter notes by the search text, in their titles or text, and by date"""
+        text = self.search_box.text().strip()
+        content_matches = set()
+        if text and self.content_search is not None:
+            content_matches = self.content_search(text)
+        days = DATE_FILTERS[self.date_filter.currentIndex()][1]
+        since = time.time() - days * 86400 if days is not None else None
+        self.proxy.set_filter(text, content_matches, since)
+
+    def sort_notes(self, index):
+        _, role, order = SORT_ORDERS[index]
+        self.proxy.setSortRole(role)
+        self.proxy.sort(0, order)
+
+
+class BacklinksPanel(QWidget):
+    """List of the notes linking to a card or note, hidden while there are none"""
+
+    noteActivated = pyqtSignal(str, str)  # Card id, note file path
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 0, 10, 10)
+
+        self.title_label = QLabel("Linked from")
+        self.title_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(self.title_label)
+
+        self.links_list = QListWidget()
+        self.links_list.setMaximumHeight(120)
+        self.links_list.itemActivated.connect(self.on_item_activated)
+        layout.addWidget(self.links_list)
+
+        self.setVisible(False)
+
+    def set_links(self, links, card_names=None):
+        """Show backlinks as returned by the note text index"""
+        card_names = card_names or {}
+        self.links_list.clear()
+        for link in links:
+            card_name = card_names.get(link["card_id"], link["card_id"])
+            item = QListWidgetItem(f"{link['title']} ({card_name})")
+            item.setData(Qt.ItemDataRole.UserRole, (link["card_id"], link["file_path"]))
+            self.links_list.addItem(item)
+        self.title_label.setText(f"Linked from {len(links)} note{'s' if len(links) != 1 else ''}")
+        self.setVisible(bool(links))
+
+    def on_item_activated(self, item):
+        card_id, file_path = item.data(Qt.ItemDataRole.UserRole)
+        self.noteActivated.emit(card_id, file_path)
@@ -1,9 +1,10 @@
 import os
 import shutil
+import sqlite3
 import time
 from pathlib import Path
 
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import QSettings
 from PyQt6.QtGui import QAction, QIcon
 from PyQt6.QtWidgets import (
     QFileDialog,
@@ -18,11 +19,56 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from tarot_canvas.models.link_completion import LinkCompletionIndex
+from tarot_canvas.models.note_text_index import NoteTextIndex
+from tarot_canvas.models.notes_index import NotesIndex, display_name_from_filename
+from tarot_canvas.models.notes_store import NotesStore, note_id_from_key
+from tarot_canvas.ui.tabs.card_view.autosave import AutosaveCoordinator
 from tarot_canvas.ui.tabs.card_view.markdown_editor import MarkdownEditor
-from tarot_canvas.ui.tabs.card_view.notes_list import EmptyStateWidget, NotesListWidget
+from tarot_canvas.ui.tabs.card_view.notes_list import (
+    BacklinksPanel,
+    EmptyStateWidget,
+    NotesListWidget,
+)
 from tarot_canvas.utils.logger import logger
+from tarot_canvas.utils.note_writer import NoteWriter, write_atomically
 from tarot_canvas.utils.path_helper import get_data_directory
 
+# Longest the UI waits for a note to reach the disk before moving or copying it
+WRITE_WAIT_SECONDS = 0.5
+
+_indexing_writes = False
+
+
+def notes_database():
+    """Get the notes database if the user keeps notes in it rather than in markdown files"""
+    settings = QSettings("ArcanaLand", "TarotCanvas")
+    if settings.value("notes/storage", "Markdown Files") == "Notes Database":
+        return NotesStore.get_instance()
+    return None
+
+
+def notes_text_index():
+    """Get what searches the notes' text and links, the database or the note files"""
+    store = notes_database()
+    return store if store is not None else NoteTextIndex.get_instance()
+
+
+def shared_note_writer():
+    """Get the background note writer, set up to index every note once it is on disk"""
+    global _indexing_writes
+    writer = NoteWriter.get_instance()
+    if not _indexing_writes:
+        writer.saved.connect(_index_written_note)
+        _indexing_writes = True
+    return writer
+
+
+def _index_written_note(file_path, text):
+    note = NotesIndex.get_instance().note_saved(file_path)
+    if note is not None:
+        NoteTextIndex.get_instance().note_saved(note, text)
+
 
 class NotesTab(QWidget):
     """Tab for managing notes associated with a tarot card"""
@@ -31,14 +77,25 @@ class NotesTab(QWidget):
         super().__init__(parent)
         self.parent_tab = parent
         self.current_card = None
-        self.all_notes = {}  # Store info about all notes for linking
+        self.store = notes_database()  # Where notes are kept, None for markdown files
+        self.notes_index = NotesIndex.get_instance()  # Every note file, shared for linking
+        # Full-text search and backlinks, over the note files or the database
+        self.text_index = notes_text_index()
+        self.link_completion_index = (  # [[ completions
+            LinkCompletionIndex.get_instance()
+            if self.store is None
+            else LinkCompletionIndex.get_database_instance()
+        )
+        self.note_writer = shared_note_writer()  # Saves notes off the UI thread
+        self.note_writer.saved.connect(self.on_note_written)
+        self.note_writer.failed.connect(self.on_note_write_failed)
+        self._saving = set()  # Files this tab is waiting on the writer for
+        self._after_write = {}  # file path -> actions waiting for its save to finish
         self.current_file_path = None
         self.setup_ui()
 
-        # Setup auto-save timer (save every 30 seconds)
-        self.auto_save_timer = QTimer(self)
-        self.auto_save_timer.timeout.connect(self.auto_save)
-        self.auto_save_timer.start(30000)  # 30 seconds
+        # Save shortly after typing pauses
+        AutosaveCoordinator.get_instance().watch(self.note_editor.document(), self.auto_save)
 
     def setup_ui(self):
         """Set up the notes tab UI"""
@@ -103,6 +160,11 @@ class NotesTab(QWidget):
         self.note_editor.linkClicked.connect(self.handle_link_click)
         editor_layout.addWidget(self.note_editor)
 
+        # Notes linking to the open note
+        self.note_backlinks = BacklinksPanel()
+        self.note_backlinks.noteActivated.connect(self.open_linked_note)
+        editor_layout.addWidget(self.note_backlinks)
+
         # Add widgets to stack
         self.stack.addWidget(self.empty_state)  # Index 0: Empty state
         self.stack.addWidget(self.notes_list_widget)  # Index 1: Notes list
@@ -111,6 +173,12 @@ class NotesTab(QWidget):
         # Add stack to main layout
         layout.addWidget(self.stack)
 
+        # Notes linking to the card, shown with the list rather than the editor
+        self.card_backlinks = BacklinksPanel()
+        self.card_backlinks.noteActivated.connect(self.open_linked_note)
+        layout.addWidget(self.card_backlinks)
+        self.stack.currentChanged.connect(self.update_card_backlinks)
+
     def setup_manage_menu(self):
         """Set up the manage menu for the notes list"""
         manage_menu = QMenu(self)
@@ -145,38 +213,19 @@ class NotesTab(QWidget):
             self.note_editor.set_deck_manager(self.parent_tab.deck_manager)
             logger.debug("Passed deck manager to editor")
 
-        # Determine the notes directory path
-        notes_dir = get_data_directory("tarot-canvas/notes") / card_id
-        notes_dir = str(notes_dir)  # Convert Path to string for compatibility with existing code
-
-        # Create the directory if it doesn't exist
-        os.makedirs(notes_dir, exist_ok=True)
-
-        # Load all notes at startup for linking
-        self.load_all_notes()
-
-        # Clear the current list
-        self.notes_list_widget.clear_notes()
-
-        # Load all markdown files in the directory
-        note_files = []
-        if os.path.exists(notes_dir):
-            for filename in os.listdir(notes_dir):
-                if filename.endswith(".md"):
-                    file_path = os.path.join(notes_dir, filename)
-                    # Get file stats
-                    stats = os.stat(file_path)
-                    # Save tuple of (modified time, filename, full path)
-                    note_files.append((stats.st_mtime, filename, file_path))
-
-        # Sort by modified time (newest first)
-        note_files.sort(reverse=True)
+        if self.store is not None:
+            note_files = self.store.entries_for_card(card_id)
+        else:
+            # Only this card's directory is read; the index knows every other note
+            self.notes_index.refresh_card(card_id)
+            note_files = self.notes_index.notes_for_card(card_id)
 
-        # Add to list widget
-        for _, filename, file_path in note_files:
-            # Parse the filename to get a display name
-            display_name = self.get_display_name_from_filename(filename)
-            self.notes_list_widget.add_note(display_name, file_path, card_id)
+        # Show them all at once; the list only lays out the rows in view
+        self.notes_list_widget.content_search = lambda text: self.text_index.matching_paths(
+            text, card_id=card_id
+        )
+        self.notes_list_widget.set_notes(note_files)
+        self.update_card_backlinks()
 
         # Show the appropriate view
         if not note_files:
@@ -186,10 +235,10 @@ class NotesTab(QWidget):
             # Show notes list if there are notes
             self.stack.setCurrentIndex(1)  # Notes list
 
-    def on_note_selected(self, item):
+    def on_note_selected(self, file_path):
         """Handle selection of a note in the list"""
-        if not item:
-            # No item selected
+        if not file_path:
+            # No note selected
             self.note_editor.clear()
             self.note_editor.setEnabled(False)
             self.current_file_path = None
@@ -199,30 +248,28 @@ class NotesTab(QWidget):
         if self.current_file_path and self.note_editor.document().isModified():
             self.save_note_to_file(self.current_file_path)
 
-        # Get the file path from the item
-        file_path = item.data(Qt.ItemDataRole.UserRole)
         self.current_file_path = file_path
 
-    def open_note_editor(self, item):
+    def open_note_editor(self, file_path):
         """Open the editor for the selected note"""
-        if not item:
+        if not file_path:
             return
 
-        # Get the file path from the item
-        file_path = item.data(Qt.ItemDataRole.UserRole)
         self.current_file_path = file_path
 
         # Set the note title
-        self.note_title.setText(item.text())
+        name = self.note_name(file_path)
+        self.note_title.setText(name)
 
-        # Load the note content
         try:
-            with open(file_path, encoding="utf-8") as f:
-                content = f.read()
+            content = self.read_note(file_path)
 
             # Set the content in the editor
             self.note_editor.setPlainText(content)
             self.note_editor.document().setModified(False)
+            self.note_backlinks.set_links(
+                self.text_index.backlinks("note", name), self.card_names()
+            )
 
             # Switch to editor page
             self.stack.setCurrentIndex(2)  # Editor page
@@ -239,7 +286,7 @@ class NotesTab(QWidget):
             self.save_note_to_file(self.current_file_path)
 
         # Show notes list or empty state based on whether there are notes
-        if self.notes_list_widget.notes_list.count() > 0:
+        if self.notes_list_widget.count() > 0:
             self.stack.setCurrentIndex(1)  # Notes list
         else:
             self.stack.setCurrentIndex(0)  # Empty state
@@ -266,70 +313,65 @@ class NotesTab(QWidget):
         safe_name = name.replace(" ", "_").replace("/", "_").replace("\\", "_")
         filename = f"{timestamp}_{safe_name}.md"
 
-        # Create notes directory if it doesn't exist
-        notes_dir = get_data_directory("tarot-canvas/notes") / card_id
-        notes_dir = str(notes_dir)
-        try:
-            os.makedirs(notes_dir, exist_ok=True)
-            logger.info(f"Created/verified notes directory: {notes_dir}")
-        except Exception as e:
-            error_msg = f"Failed to create notes directory: {e}"
-            logger.error(error_msg)
-            QMessageBox.critical(self, "Error", error_msg)
+        if self.store is not None:
+            try:
+                note_id = self.store.create_note(card_id, name, f"# {name}\n\n", timestamp)
+            except sqlite3.Error as e:
+                QMessageBox.critical(self, "Error", f"Could not create note: {e}")
+                return
+            note = self.store.entry(note_id)
+            self.notes_list_widget.add_note(note, select=True)
+            self.open_note_editor(note.file_path)
             return
 
-        # Create the file
-        file_path = str(Path(notes_dir) / filename)
-        try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(f"# {name}\n\n")
-
-            # Add to list and select it
-            item = self.notes_list_widget.add_note(name, file_path, card_id, select=True)
+        # Create the file in the background; the writer also makes the card's directory
+        file_path = str(get_data_directory("tarot-canvas/notes") / card_id / filename)
+        self._saving.add(file_path)
+        self.note_writer.save(file_path, f"# {name}\n\n")
 
-            # Update all notes cache
-            self.all_notes[name] = {"card_id": card_id, "file_path": file_path}
+        # List the note straight away, the text index picks it up once written
+        note = self.notes_index.note_created(card_id, file_path, mtime=time.time())
+        self.notes_list_widget.add_note(note, select=True)
 
-            # Open the editor with the new note
-            self.open_note_editor(item)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not create note: {e}")
+        # Open the editor with the new note
+        self.open_note_editor(file_path)
 
     def delete_current_note(self):
         """Delete the currently selected note"""
-        current_item = self.notes_list_widget.get_current_item()
-        if not current_item:
+        file_path = self.notes_list_widget.current_note()
+        if not file_path:
             return
 
         # Confirm deletion
         reply = QMessageBox.question(
             self,
             "Delete Note",
-            f"Are you sure you want to delete the note '{current_item.text()}'?",
+            f"Are you sure you want to delete the note '{self.note_name(file_path)}'?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
         )
 
         if reply != QMessageBox.StandardButton.Yes:
             return
 
-        # Get the file path
-        file_path = current_item.data(Qt.ItemDataRole.UserRole)
+        self.when_written(file_path, lambda: self.delete_note(file_path))
 
-        # Delete the file
+    def delete_note(self, file_path):
+        """Delete a note and drop it from the list and indexes"""
         try:
-            os.remove(file_path)
+            if self.store is not None:
+                self.store.delete(note_id_from_key(file_path))
+            else:
+                os.remove(file_path)
 
-            # Remove from list
-            self.notes_list_widget.remove_item(current_item)
+                # Remove from the shared notes indexes
+                self.notes_index.note_deleted(file_path)
+                self.text_index.note_deleted(file_path)
 
-            # Remove from all notes cache
-            for name, info in list(self.all_notes.items()):
-                if info["file_path"] == file_path:
-                    del self.all_notes[name]
-                    break
+            # Remove from list
+            self.notes_list_widget.remove_note(file_path)
 
             # Show empty state if no more notes
-            if self.notes_list_widget.notes_list.count() == 0:
+            if self.notes_list_widget.count() == 0:
                 self.stack.setCurrentIndex(0)  # Empty state
                 self.current_file_path = None
         except Exception as e:
@@ -337,12 +379,12 @@ class NotesTab(QWidget):
 
     def rename_current_note(self):
         """Rename the currently selected note"""
-        current_item = self.notes_list_widget.get_current_item()
-        if not current_item:
+        file_path = self.notes_list_widget.current_note()
+        if not file_path:
             return
 
         # Get current name
-        current_name = current_item.text()
+        current_name = self.note_name(file_path)
 
         # Ask for new name
         new_name, ok = QInputDialog.getText(
@@ -352,10 +394,10 @@ class NotesTab(QWidget):
         if not ok or not new_name or new_name == current_name:
             return
 
-        # Get the file path
-        file_path = current_item.data(Qt.ItemDataRole.UserRole)
+        self.when_written(file_path, lambda: self.rename_note(file_path, new_name))
 
-        # Generate new filename
+    def renamed_file_path(self, file_path, new_name):
+        """Get the file a note file is moved to when it gets a new name"""
         dirname = os.path.dirname(file_path)
         filename = os.path.basename(file_path)
 
@@ -370,58 +412,58 @@ class NotesTab(QWidget):
             safe_name = new_name.replace(" ", "_").replace("/", "_").replace("\\", "_")
             new_filename = f"{timestamp}_{safe_name}.md"
 
-        new_file_path = str(Path(dirname) / new_filename)
+        return str(Path(dirname) / new_filename)
 
-        # Rename the file
+    def rename_note(self, file_path, new_name):
+        """Give a note a new name and follow it in the list and indexes"""
         try:
-            os.rename(file_path, new_file_path)
-
-            # Update item
-            current_item.setText(new_name)
-            current_item.setData(Qt.ItemDataRole.UserRole, new_file_path)
-
-            # Update all notes cache
-            card_id = current_item.data(Qt.ItemDataRole.UserRole + 1)
-
-            # Remove old entry
-            for name, info in list(self.all_notes.items()):
-                if info["file_path"] == file_path:
-                    del self.all_notes[name]
-                    break
+            if self.store is not None:
+                # Only the row changes; the note keeps its key
+                note_id = note_id_from_key(file_path)
+                self.store.rename(note_id, new_name)
+                new_file_path, note = file_path, self.store.entry(note_id)
+            else:
+                new_file_path = self.renamed_file_path(file_path, new_name)
+                os.rename(file_path, new_file_path)
 
-            # Add new entry
-            self.all_notes[new_name] = {"card_id": card_id, "file_path": new_file_path}
+                # Update the shared notes indexes
+                note = self.notes_index.note_renamed(file_path, new_file_path)
+                self.text_index.note_renamed(file_path, note)
+            self.notes_list_widget.replace_note(file_path, note)
 
             # Update current file path and title if this is the active note
             if self.current_file_path == file_path:
                 self.current_file_path = new_file_path
-                self.note_title.setText(new_name)
+                self.note_title.setText(self.note_name(new_file_path))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not rename note: {e}")
 
     def export_current_note(self):
         """Export the currently selected note to a file"""
-        current_item = self.notes_list_widget.get_current_item()
-        if not current_item:
+        file_path = self.notes_list_widget.current_note()
+        if not file_path:
             return
 
-        # Get the file path
-        file_path = current_item.data(Qt.ItemDataRole.UserRole)
-
         # Ask for export location
         export_path, _ = QFileDialog.getSaveFileName(
             self,
             "Export Note",
-            os.path.expanduser(f"~/Documents/{current_item.text()}.md"),
+            os.path.expanduser(f"~/Documents/{self.note_name(file_path)}.md"),
             "Markdown Files (*.md);;All Files (*)",
         )
 
         if not export_path:
             return
 
-        # Copy the file
+        self.when_written(file_path, lambda: self.export_note(file_path, export_path))
+
+    def export_note(self, file_path, export_path):
+        """Copy a note to where the user chose"""
         try:
-            shutil.copy2(file_path, export_path)
+            if self.store is not None:
+                write_atomically(export_path, self.read_note(file_path))
+            else:
+                shutil.copy2(file_path, export_path)
 
             # Show success message
             QMessageBox.information(self, "Export Successful", f"Note exported to {export_path}")
@@ -430,69 +472,93 @@ class NotesTab(QWidget):
 
     # Helper methods
 
-    def load_all_notes(self):
-        """Load information about all notes across all cards for linking"""
-        self.all_notes = {}
-
-        # Base notes directory
-        base_dir = get_data_directory("tarot-canvas/notes")
-        base_dir = str(base_dir)
-        if not os.path.exists(base_dir):
+    def card_names(self):
+        """Get the reference deck's card names by card id"""
+        if not self.parent_tab or not hasattr(self.parent_tab, "deck_manager"):
+            return {}
+        ref_deck = self.parent_tab.deck_manager.get_reference_deck()
+        if not ref_deck:
+            return {}
+        return {card["id"]: card["name"] for card in ref_deck.get_all_cards()}
+
+    def update_card_backlinks(self):
+        """Show the notes linking to the current card, unless a note is being edited"""
+        if not self.current_card or self.stack.currentIndex() == 2:
+            self.card_backlinks.setVisible(False)
             return
+        self.card_backlinks.set_links(
+            self.text_index.backlinks("card", self.current_card.get("name", "")),
+            self.card_names(),
+        )
 
-        # Loop through all card directories
-        for card_dir in os.listdir(base_dir):
-            card_path = os.path.join(base_dir, card_dir)
-            if os.path.isdir(card_path):
-                # Loop through all notes in this card directory
-                for filename in os.listdir(card_path):
-                    if filename.endswith(".md"):
-                        file_path = os.path.join(card_path, filename)
-                        display_name = self.get_display_name_from_filename(filename)
-
-                        # Store info about this note
-                        self.all_notes[display_name] = {"card_id": card_dir, "file_path": file_path}
+    def open_linked_note(self, card_id, file_path):
+        """Open a note from a backlinks panel, on this card or another one"""
+        if self.current_card and card_id == self.current_card.get("id"):
+            self.open_note(file_path)
+            return
+        if self.parent_tab and hasattr(self.parent_tab, "deck_manager"):
+            ref_deck = self.parent_tab.deck_manager.get_reference_deck()
+            card = ref_deck.get_card_by_id(card_id) if ref_deck else None
+            if card is not None:
+                self.parent_tab.navigation_requested.emit(
+                    "open_card_view", {"card": card, "deck": ref_deck, "open_note": file_path}
+                )
+
+    def note_entry(self, file_path):
+        """Get the list entry of a note, given its file path or database key, or None"""
+        if self.store is not None:
+            note_id = note_id_from_key(file_path)
+            return self.store.entry(note_id) if note_id is not None else None
+        return self.notes_index.get(file_path)
+
+    def note_name(self, file_path):
+        """Get the display name of a note"""
+        note = self.note_entry(file_path)
+        return note.name if note else display_name_from_filename(os.path.basename(file_path))
+
+    def find_note(self, name, card_id=None):
+        """Find a note by name, on one card if given, as (card id, file path), or None"""
+        if self.store is not None:
+            note = self.store.find(name, card_id)
+            return (note["card_id"], note["file_path"]) if note else None
+        if card_id is None:
+            note = self.notes_index.find(name)
+        else:
+            note = self.notes_index.find_for_card(card_id, name)
+        return (note.card_id, note.file_path) if note else None
+
+    def read_note(self, file_path):
+        """Get a note's text, including any still on its way to the disk"""
+        if self.store is not None:
+            note_id = note_id_from_key(file_path)
+            note = self.store.note(note_id) if note_id is not None else None
+            if note is None:
+                raise LookupError(f"No note {file_path} in the notes database")
+            return note["body"]
+        content = self.note_writer.latest(file_path)
+        if content is None:
+            with open(file_path, encoding="utf-8") as f:
+                content = f.read()
+        return content
 
     def get_display_name_from_filename(self, filename):
         """Extract a display name from a note filename"""
-        # Remove extension
-        name = filename.rsplit(".", 1)[0]
-
-        # Remove timestamp prefix if it exists
-        if "_" in name:
-            parts = name.split("_", 1)
-            if len(parts) > 1 and parts[0].isdigit():
-                name = parts[1]
-
-        # Replace underscores with spaces
-        name = name.replace("_", " ")
-
-        return name
-
-    def get_link_suggestions(self):
-        """Get suggestions for auto-completion when linking"""
-        suggestions = []
-
-        # Add all note names
-        suggestions.extend(list(self.all_notes.keys()))
-
-        # Add card references if deck manager is available
-        if self.parent_tab and hasattr(self.parent_tab, "deck_manager"):
-            deck_manager = self.parent_tab.deck_manager
-
-            # Add all cards from reference deck
-            ref_deck = deck_manager.get_reference_deck()
-            if ref_deck:
-                # Use _cards directly or get_all_cards() if available
-                cards = getattr(ref_deck, "get_all_cards", lambda: ref_deck._cards)()
-                for card in cards:
-                    suggestions.append(f"card:{card['name']}")
+        return display_name_from_filename(filename)
 
-            # Add all decks
-            for deck in deck_manager.get_all_decks():
-                suggestions.append(f"deck:{deck.get_name()}")
+    def sync_link_completions(self):
+        """Offer the reference deck's cards and the loaded decks as link completions"""
+        if not self.parent_tab or not hasattr(self.parent_tab, "deck_manager"):
+            return
+        deck_manager = self.parent_tab.deck_manager
+        ref_deck = deck_manager.get_reference_deck()
+        self.link_completion_index.set_cards(ref_deck.get_all_cards() if ref_deck else [])
+        self.link_completion_index.set_decks(
+            deck.get_name() for deck in deck_manager.get_all_decks()
+        )
 
-        return suggestions
+    def link_completions(self, text):
+        """Get the best completions for a wiki link being typed"""
+        return self.link_completion_index.complete(text)
 
     def save_current_note(self):
         """Save the current note content"""
@@ -500,53 +566,77 @@ class NotesTab(QWidget):
             return
 
         self.save_note_to_file(self.current_file_path)
-        self.note_editor.document().setModified(False)
 
     def save_note_to_file(self, file_path):
-        """Save note content to a specific file"""
-        content = self.note_editor.toPlainText()
-
-        try:
-            # Ensure the directory exists
-            dir_path = os.path.dirname(file_path)
-            os.makedirs(dir_path, exist_ok=True)
-
-            # Log detailed info about save location and file
-            logger.info(f"Saving note to: {file_path}")
-            logger.info(f"Directory: {dir_path} exists: {os.path.exists(dir_path)}")
-            logger.info(f"Content length: {len(content)} characters")
-
-            # Save the file with explicit encoding
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
-                # Flush to disk to ensure it's written while file is still open
-                f.flush()
-                os.fsync(f.fileno())
-
-            # Verify file was saved
-            if os.path.exists(file_path):
-                logger.info(f"File saved successfully: {os.path.getsize(file_path)} bytes")
-            else:
-                logger.error(f"File doesn't exist after save: {file_path}")
-
-            # Update modification time in file metadata
-            os.utime(file_path, None)
-
-            # Show temporary success message if main window is available
-            from PyQt6.QtWidgets import QApplication
+        """Save the editor's content, queueing files to be written in the background"""
+        if self.store is not None:
+            note_id = note_id_from_key(file_path)
+            try:
+                self.store.save(note_id, self.note_editor.toPlainText())
+            except sqlite3.Error as e:
+                QMessageBox.critical(self, "Error", f"Could not save note: {e}")
+                return
+            self.note_editor.document().setModified(False)
+            self.notes_list_widget.replace_note(file_path, self.store.entry(note_id))
+            self.show_saved_message()
+            return
 
-            main_window = QApplication.instance().activeWindow()
-            if main_window and hasattr(main_window, "statusBar"):
-                main_window.statusBar().showMessage("Note saved successfully", 3000)
+        self._saving.add(file_path)
+        self.note_writer.save(file_path, self.note_editor.toPlainText())
+        self.note_editor.document().setModified(False)
 
-        except Exception as e:
-            error_msg = f"Could not save note: {e}"
-            logger.error(error_msg)
-            # Add exception details and traceback
-            import traceback
+    def when_written(self, file_path, action):
+        """Run an action on a note file once any save queued for it is on disk.
 
-            logger.error(traceback.format_exc())
-            QMessageBox.critical(self, "Error", error_msg)
+        The UI waits briefly for the writer; if the disk is slower than that,
+        the action runs when the writer reports the save instead. Database
+        notes are saved as they go, so their actions run straight away.
+        """
+        if self.store is not None or self.note_writer.wait(file_path, WRITE_WAIT_SECONDS):
+            action()
+        else:
+            logger.info(f"Waiting for {file_path} to be saved before changing it")
+            self._after_write.setdefault(file_path, []).append(action)
+
+    def run_after_write(self, file_path):
+        """Run the actions waiting for a note's save, unless another save is queued for it"""
+        if file_path in self._after_write and self.note_writer.latest(file_path) is None:
+            for action in self._after_write.pop(file_path):
+                action()
+
+    def on_note_written(self, file_path, text):
+        """Confirm a save once the writer has put the note on disk"""
+        self.run_after_write(file_path)
+        if file_path not in self._saving:
+            return
+        self._saving.discard(file_path)
+        note = self.notes_index.get(file_path)
+        if note is not None:
+            # Re-sorts the list by the new modification time
+            self.notes_list_widget.replace_note(file_path, note)
+        self.show_saved_message()
+
+    def show_saved_message(self):
+        """Show temporary success message if main window is available"""
+        from PyQt6.QtWidgets import QApplication
+
+        main_window = QApplication.instance().activeWindow()
+        if main_window and hasattr(main_window, "statusBar"):
+            main_window.statusBar().showMessage("Note saved successfully", 3000)
+
+    def on_note_write_failed(self, file_path, error):
+        """Keep the note marked as modified and tell the user it could not be saved"""
+        self.run_after_write(file_path)
+        if file_path not in self._saving:
+            return
+        self._saving.discard(file_path)
+        if not os.path.exists(file_path) and self.notes_index.get(file_path) is not None:
+            # A new note that never reached the disk
+            self.notes_list_widget.remove_note(file_path)
+            self.notes_index.note_deleted(file_path)
+        if file_path == self.current_file_path:
+            self.note_editor.document().setModified(True)
+        QMessageBox.critical(self, "Error", f"Could not save note: {error}")
 
     # Link handling
 
@@ -597,14 +687,14 @@ class NotesTab(QWidget):
 
     def navigate_to_note(self, note_name):
         """Navigate to a specific note by name"""
-        # Check if the note exists in our cache
-        if note_name in self.all_notes:
-            note_info = self.all_notes[note_name]
-
+        # Check if the note exists in the index
+        note_info = self.find_note(note_name)
+        if note_info is not None:
+            note_card_id = note_info[0]
             # If it's a note for a different card, navigate to that card first
             if (
                 self.current_card
-                and note_info["card_id"] != self.current_card.get("id")
+                and note_card_id != self.current_card.get("id")
                 and self.parent_tab
                 and hasattr(self.parent_tab, "deck_manager")
             ):
@@ -615,7 +705,7 @@ class NotesTab(QWidget):
                     # Find the card by ID
                     cards = getattr(ref_deck, "get_all_cards", lambda: ref_deck._cards)()
                     for card in cards:
-                        if card["id"] == note_info["card_id"]:
+                        if card["id"] == note_card_id:
                             # Emit signal to navigate to this card
                             self.parent_tab.navigation_requested.emit(
                                 "open_card_view",
@@ -624,12 +714,20 @@ class NotesTab(QWidget):
                             return
 
             # If it's a note for the current card, just select it
-            for i in range(self.notes_list_widget.notes_list.count()):
-                item = self.notes_list_widget.notes_list.item(i)
-                if item.text() == note_name:
-                    self.notes_list_widget.notes_list.setCurrentItem(item)
-                    self.open_note_editor(item)
-                    return
+            self.open_note(note_name)
+
+    def open_note(self, note):
+        """Select and open one of this card's notes, given its name or file path"""
+        file_path = note
+        if not self.notes_list_widget.contains(file_path):
+            card_id = self.current_card.get("id") if self.current_card else None
+            found = self.find_note(note, card_id)
+            if found is None:
+                return False
+            file_path = found[1]
+        self.notes_list_widget.select_note(file_path)
+        self.open_note_editor(file_path)
+        return True
 
     # Add this method to ensure saving when the tab is closed
     def closeEvent(self, event):
@@ -273,6 +273,11 @@ class CardViewTab(BaseTab):
         else:
             return self.COLOR_MAP["default"]
 
+    def open_note(self, note):
+        """Show the Notes tab with one of the card's notes open, given its name or file path"""
+        self.info_tabs.setCurrentWidget(self.notes_tab)
+        return self.notes_tab.open_note(note)
+
     def navigate_back(self):
         """Navigate back to the source tab"""
         if self.source_tab_id:
@@ -0,0 +1,39 @@
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtWidgets import QDialog, QLabel, QListWidget, QListWidgetItem, QVBoxLayout
+
+from tarot_canvas.ui.tabs.card_view.notes_tab import notes_text_index
+
+# Cards listed, most linked first
+REFERENCED_CARD_LIMIT = 50
+
+
+class CardReferencesDialog(QDialog):
+    """Cards ranked by how many notes link to them with [[card:...]]"""
+
+    card_activated = pyqtSignal(str)  # Card name as written in the links
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Most Referenced Cards")
+        self.resize(400, 500)
+
+        layout = QVBoxLayout(self)
+        self.references_list = QListWidget()
+        self.references_list.itemActivated.connect(self.on_item_activated)
+        layout.addWidget(self.references_list)
+
+        references = notes_text_index().most_referenced("card", REFERENCED_CARD_LIMIT)
+        for name, count in references:
+            item = QListWidgetItem(f"{name} ({count} note{'s' if count != 1 else ''})")
+            item.setData(Qt.ItemDataRole.UserRole, name)
+            self.references_list.addItem(item)
+
+        if not references:
+            hint = QLabel("No notes link to a card yet. Link one with [[card:Card Name]].")
+            hint.setStyleSheet("color: #666; font-style: italic;")
+            hint.setWordWrap(True)
+            layout.addWidget(hint)
+
+    def on_item_activated(self, item):
+        self.card_activated.emit(item.data(Qt.ItemDataRole.UserRole))
+        self.accept()
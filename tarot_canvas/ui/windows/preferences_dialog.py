@@ -10,6 +10,7 @@ from PyQt6.QtWidgets import (
     QLabel,
     QPushButton,
     QSlider,
+    QSpinBox,
     QVBoxLayout,
     QWidget,
 )
@@ -86,6 +87,40 @@ class PreferencesDialog(QDialog):
         anim_label.setStyleSheet("color: #777; font-size: 10px;")
         layout.addRow("", anim_label)
 
+        # Card snapping options
+        self.snap_edges_check = QCheckBox("Snap cards to neighbouring edges")
+        layout.addRow("Snapping:", self.snap_edges_check)
+
+        self.snap_grid_check = QCheckBox("Snap cards to grid")
+        layout.addRow("", self.snap_grid_check)
+
+        self.kinetic_pan_check = QCheckBox("Keep panning with momentum after a drag")
+        layout.addRow("Panning:", self.kinetic_pan_check)
+
+        # Canvas rendering trade-off
+        self.rendering_combo = QComboBox()
+        self.rendering_combo.addItems(["Performance", "Quality"])
+        self.rendering_combo.setToolTip(
+            "Performance caches cards and renders faster while panning or zooming"
+        )
+        layout.addRow("Canvas Rendering:", self.rendering_combo)
+
+        # Chance of a summoned or dealt card coming out reversed
+        self.reversal_spin = QSpinBox()
+        self.reversal_spin.setRange(0, 100)
+        self.reversal_spin.setSuffix("%")
+        layout.addRow("Reversed Card Chance:", self.reversal_spin)
+
+        # Where notes are kept
+        self.notes_storage_combo = QComboBox()
+        self.notes_storage_combo.addItems(["Markdown Files", "Notes Database"])
+        self.notes_storage_combo.setToolTip(
+            "Markdown Files keeps one file per note, the Notes Database keeps every note in one "
+            "file. Card views opened afterwards use the choice, and the first switch to the "
+            "database copies the markdown notes into it."
+        )
+        layout.addRow("Notes Storage:", self.notes_storage_combo)
+
         # Enable the color picker only when "Solid Color" is selected
         self.bg_combo.currentIndexChanged.connect(self.update_color_button_state)
 
@@ -134,6 +169,24 @@ class PreferencesDialog(QDialog):
             settings.value("appearance/animation_intensity", 50, type=int)
         )
 
+        # Canvas settings
+        self.snap_edges_check.setChecked(settings.value("canvas/snap_to_edges", True, type=bool))
+        self.snap_grid_check.setChecked(settings.value("canvas/snap_to_grid", False, type=bool))
+        self.reversal_spin.setValue(settings.value("canvas/reversal_chance", 50, type=int))
+        self.kinetic_pan_check.setChecked(settings.value("canvas/kinetic_panning", True, type=bool))
+
+        rendering_index = self.rendering_combo.findText(
+            settings.value("canvas/rendering_mode", "Performance")
+        )
+        if rendering_index >= 0:
+            self.rendering_combo.setCurrentIndex(rendering_index)
+
+        storage_index = self.notes_storage_combo.findText(
+            settings.value("notes/storage", "Markdown Files")
+        )
+        if storage_index >= 0:
+            self.notes_storage_combo.setCurrentIndex(storage_index)
+
         # Update dependent states
         self.update_color_button_state()
 
@@ -150,6 +203,14 @@ class PreferencesDialog(QDialog):
         settings.setValue("appearance/enable_animations", self.animation_check.isChecked())
         settings.setValue("appearance/animation_intensity", self.animation_slider.value())
 
+        # Canvas settings
+        settings.setValue("canvas/snap_to_edges", self.snap_edges_check.isChecked())
+        settings.setValue("canvas/snap_to_grid", self.snap_grid_check.isChecked())
+        settings.setValue("canvas/reversal_chance", self.reversal_spin.value())
+        settings.setValue("canvas/kinetic_panning", self.kinetic_pan_check.isChecked())
+        settings.setValue("canvas/rendering_mode", self.rendering_combo.currentText())
+        settings.setValue("notes/storage", self.notes_storage_combo.currentText())
+
         # Apply theme immediately
         theme_type = ThemeType.SYSTEM
         if self.theme_combo.currentText() == "Light":
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap
+
+
+class ImageCache:
+    """Shared cache of decoded and scaled card images.
+
+    QPixmap is implicitly shared, so every card showing the same image at the
+    same size, on any canvas, reuses one decoded copy instead of reading the
+    file again. Images still shown somewhere are never evicted, so a card
+    added later always finds the copy already on screen.
+    """
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """Get the singleton instance"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._pixmaps = OrderedDict()  # (path, max width, max height) -> QPixmap
+
+    def __len__(self):
+        return len(self._pixmaps)
+
+    def get_scaled(self, path, max_width, max_height):
+        """Get an image scaled down to fit within the given size.
+
+        Returns a null QPixmap if the file cannot be loaded.
+        """
+        key = (str(path), max_width, max_height)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            return pixmap
+
+        pixmap = QPixmap(str(path))
+        if pixmap.isNull():
+            return pixmap
+
+        if pixmap.width() > max_width or pixmap.height() > max_height:
+            pixmap = pixmap.scaled(
+                max_width,
+                max_height,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+
+        self._pixmaps[key] = pixmap
+        self._evict()
+        return pixmap
+
+    def _evict(self):
+        """Drop the least recently used images no longer shown anywhere"""
+        excess = len(self._pixmaps) - self.max_entries
+        if excess <= 0:
+            return
+        # A detached pixmap is referenced only by the cache itself
+        unused = [key for key, pixmap in self._pixmaps.items() if pixmap.isDetached()]
+        for key in unused[:excess]:
+            del self._pixmaps[key]
+
+    def cache_keys(self):
+        """Get the cacheKey() of every cached image"""
+        return {pixmap.cacheKey() for pixmap in self._pixmaps.values()}
+
+    def size_in_bytes(self):
+        """Get the approximate memory held by cached images"""
+        return sum(pixmap_size_in_bytes(pixmap) for pixmap in self._pixmaps.values())
+
+    def clear(self):
+        self._pixmaps.clear()
+
+
+def pixmap_size_in_bytes(pixmap):
+    """Get the approximate memory a pixmap's pixel data takes"""
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
@@ -0,0 +1,132 @@
+import contextlib
+import os
+import tempfile
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from tarot_canvas.utils.logger import logger
+
+
+def write_atomically(file_path, text):
+    """Write a text file through a temporary file renamed over it, so it is never half written"""
+    dir_path = os.path.dirname(file_path)
+    os.makedirs(dir_path, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", dir=dir_path
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
+
+
+class NoteWriter(QObject):
+    """Writes note files on a background thread, so saving never waits on the disk.
+
+    A save takes a snapshot of the text and returns at once. Saves queued
+    for the same file before the thread reaches it are coalesced, only the
+    latest text being written. Each write goes to a temporary file that is
+    then renamed over the note, so a crash leaves either the old or the new
+    note. The outcome is reported through `saved` and `failed`, which are
+    delivered on the UI thread.
+    """
+
+    saved = pyqtSignal(str, str)  # File path, text written
+    failed = pyqtSignal(str, str)  # File path, error message
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """Get the singleton instance"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._condition = threading.Condition()
+        self._pending = {}  # file path -> text waiting to be written, oldest first
+        self._writing = None  # (file path, text) being written
+        self._thread = None
+
+    def save(self, file_path, text):
+        """Queue a note's text to be written, replacing any text still waiting for that file"""
+        file_path = str(file_path)
+        with self._condition:
+            self._pending.pop(file_path, None)
+            self._pending[file_path] = text
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="NoteWriter", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def latest(self, file_path):
+        """Get the text queued or being written for a file, or None if it is up to date on disk"""
+        file_path = str(file_path)
+        with self._condition:
+            if file_path in self._pending:
+                return self._pending[file_path]
+            if self._writing is not None and self._writing[0] == file_path:
+                return self._writing[1]
+            return None
+
+    def is_idle(self):
+        with self._condition:
+            return not self._pending and self._writing is None
+
+    def wait(self, file_path, timeout=None):
+        """Wait until the text queued for one file is written.
+
+        Returns:
+            bool: False if the timeout ran out first
+        """
+        file_path = str(file_path)
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: file_path not in self._pending
+                and (self._writing is None or self._writing[0] != file_path),
+                timeout,
+            )
+
+    def flush(self, timeout=None):
+        """Wait until every queued save is written, e.g. before moving a file or quitting.
+
+        Returns:
+            bool: False if the timeout ran out first
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and self._writing is None, timeout
+            )
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                file_path = next(iter(self._pending))
+                self._writing = (file_path, self._pending.pop(file_path))
+
+            text = self._writing[1]
+            error = None
+            try:
+                write_atomically(file_path, text)
+                logger.debug(f"Saved note: {file_path} ({len(text)} characters)")
+            except Exception as e:
+                error = str(e)
+                logger.error(f"Could not save note {file_path}: {e}")
+
+            with self._condition:
+                self._writing = None
+                self._condition.notify_all()
+            if error is None:
+                self.saved.emit(file_path, text)
+            else:
+                self.failed.emit(file_path, error)
@@ -0,0 +1,88 @@
+import math
+
+from PyQt6.QtGui import QColor, QImage, QTransform
+
+from tarot_canvas.ui.canvas import export
+from tarot_canvas.ui.main_window import MainWindow
+
+
+def _dealt_canvas(qtbot):
+    window = MainWindow()
+    qtbot.addWidget(window)
+    canvas_tab = window.new_canvas_tab()
+    canvas_tab.deal_cards(layout="grid")
+    return window, canvas_tab
+
+
+def test_png_export_is_streamed_in_strips(qtbot, tmp_path, monkeypatch):
+    _window, canvas_tab = _dealt_canvas(qtbot)
+    # Force many small strips
+    monkeypatch.setattr(export, "STRIP_BYTES", 64 * 1024)
+    strips = []
+
+    path = tmp_path / "spread.png"
+    rect = export.content_rect(canvas_tab.scene)
+    export.export_png(
+        canvas_tab.scene, path, dpi=192, progress=lambda done, total: strips.append(total)
+    )
+
+    image = QImage(str(path))
+    assert image.width() == math.ceil(rect.width() * 2)
+    assert image.height() == math.ceil(rect.height() * 2)
+    assert strips[-1] > 1
+    # The centre of the first card is painted, not left transparent
+    card = canvas_tab.scene.items()[0].sceneBoundingRect()
+    assert (
+        image.pixelColor(
+            round((card.center().x() - rect.left()) * 2),
+            round((card.center().y() - rect.top()) * 2),
+        ).alpha()
+        > 0
+    )
+
+    qtbot.wait(1100)
+
+
+def test_png_export_draws_zoomed_out_wobbling_cards_at_full_resolution(qtbot, tmp_path):
+    _window, canvas_tab = _dealt_canvas(qtbot)
+    # Two-pixel stripes, which blur away in a card cached at its zoomed-out size
+    stripes = QImage(300, 500, QImage.Format.Format_RGB32)
+    for x in range(300):
+        color = QColor("black") if x // 2 % 2 else QColor("white")
+        for y in range(500):
+            stripes.setPixelColor(x, y, color)
+    stripes.save(str(tmp_path / "stripes.png"))
+
+    card = canvas_tab.add_specific_card({"name": "Stripes", "image": str(tmp_path / "stripes.png")})
+    card.setZValue(1000)
+    card.start_animations()
+    canvas_tab.view.setTransform(QTransform.fromScale(0.5, 0.5))
+    card.update_cache_mode()
+    assert card.cacheMode() == card.CacheMode.ItemCoordinateCache
+
+    rect = card.sceneBoundingRect()
+    export.export_png(canvas_tab.scene, tmp_path / "card.png", dpi=192, source_rect=rect)
+
+    image = QImage(str(tmp_path / "card.png"))
+    y = image.height() // 2
+    # Each stripe is four pixels wide at 2x; sample the middle of each
+    row = [image.pixelColor(x, y).lightness() for x in range(102, 502, 4)]
+    assert all(value < 55 for value in row[0::2])
+    assert all(value > 200 for value in row[1::2])
+    # Caching is back to what the zoom calls for
+    assert card.cacheMode() == card.CacheMode.ItemCoordinateCache
+
+    qtbot.wait(1100)
+
+
+def test_layout_exports_headless_to_pdf_and_svg(qtbot, tmp_path):
+    _window, canvas_tab = _dealt_canvas(qtbot)
+    canvas_tab.export_canvas(tmp_path / "spread.json")
+
+    export.main([str(tmp_path / "spread.json"), "--format", "pdf", "--output-dir", str(tmp_path)])
+    export.main([str(tmp_path / "spread.json"), "--format", "svg", "--output-dir", str(tmp_path)])
+
+    assert (tmp_path / "spread.pdf").read_bytes().startswith(b"%PDF")
+    assert b"<image" in (tmp_path / "spread.svg").read_bytes()
+
+    qtbot.wait(1100)
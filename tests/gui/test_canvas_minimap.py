@@ -0,0 +1,82 @@
+from PyQt6.QtCore import QPointF
+from PyQt6.QtGui import QColor, QImage, QPainter
+
+from tarot_canvas.ui.canvas.minimap import MINIMAP_BACKGROUND, MINIMAP_REFRESH_MS
+from tarot_canvas.ui.main_window import MainWindow
+
+
+def _shown_canvas(qtbot):
+    window = MainWindow()
+    qtbot.addWidget(window)
+    window.show()
+    canvas_tab = window.new_canvas_tab()
+    canvas_tab.minimap.show()
+    return window, canvas_tab
+
+
+def test_minimap_patches_dirty_regions_without_refitting(qtbot):
+    _window, canvas_tab = _shown_canvas(qtbot)
+    minimap = canvas_tab.minimap
+    first, second = canvas_tab.deal_cards(layout="grid")
+    minimap.refresh()
+
+    fits, redraws = [], []
+    minimap._fit = fits.append
+    redraw = minimap._redraw
+    minimap._redraw = lambda rect: (redraws.append(rect), redraw(rect))
+    second.setPos(second.pos() + QPointF(0.5, 0))
+    qtbot.waitUntil(lambda: bool(redraws))
+
+    assert not fits
+    center = minimap._to_minimap.map(canvas_tab.spatial_index.rect(first).center()).toPoint()
+    assert minimap._image.pixelColor(center) != MINIMAP_BACKGROUND
+
+    qtbot.wait(1100)
+
+
+def test_minimap_click_centres_view(qtbot):
+    _window, canvas_tab = _shown_canvas(qtbot)
+    card = canvas_tab.add_specific_card(canvas_tab.deck.get_all_cards()[0])
+    canvas_tab.minimap.refresh()
+
+    target = canvas_tab.spatial_index.rect(card).center()
+    canvas_tab.minimap.navigate_to(canvas_tab.minimap._to_minimap.map(target))
+
+    visible = canvas_tab.view.mapToScene(canvas_tab.view.viewport().rect()).boundingRect()
+    assert visible.contains(target)
+
+    qtbot.wait(1100)
+
+
+def test_minimap_ignores_the_wobble_and_draws_turned_cards_turned(qtbot, tmp_path):
+    _window, canvas_tab = _shown_canvas(qtbot)
+    minimap = canvas_tab.minimap
+    # Red at the top of the card, blue at the bottom
+    image = QImage(200, 400, QImage.Format.Format_RGB32)
+    image.fill(QColor("blue"))
+    painter = QPainter(image)
+    painter.fillRect(0, 0, 200, 200, QColor("red"))
+    painter.end()
+    image.save(str(tmp_path / "card.png"))
+    card = canvas_tab.add_specific_card({"name": "Halves", "image": str(tmp_path / "card.png")})
+    minimap.refresh()
+
+    redraws = []
+    redraw = minimap._redraw
+    minimap._redraw = lambda rect: (redraws.append(rect), redraw(rect))
+    # A wobble tick leaves the card's footprint alone
+    card.setRotation(card.base_rotation + 1.5)
+    qtbot.wait(MINIMAP_REFRESH_MS * 2)
+    assert not redraws
+
+    # A quarter turn clockwise puts the top of the card on the right
+    card.set_base_rotation(90)
+    qtbot.waitUntil(lambda: bool(redraws))
+    rect = minimap._to_minimap.mapRect(canvas_tab.spatial_index.rect(card))
+    y = round(rect.center().y())
+    left = minimap._image.pixelColor(round(rect.left() + rect.width() / 4), y)
+    right = minimap._image.pixelColor(round(rect.right() - rect.width() / 4), y)
+    assert left.blue() > left.red()
+    assert right.red() > right.blue()
+
+    qtbot.wait(1100)
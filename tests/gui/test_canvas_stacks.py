@@ -0,0 +1,113 @@
+from PyQt6.QtCore import QPointF
+from PyQt6.QtWidgets import QGraphicsItem
+
+from tarot_canvas.ui.canvas import CardStack
+from tarot_canvas.ui.main_window import MainWindow
+
+
+def _canvas_with_cards(qtbot):
+    window = MainWindow()
+    qtbot.addWidget(window)
+    canvas_tab = window.new_canvas_tab()
+    items = [canvas_tab.add_specific_card(card) for card in canvas_tab.deck.get_all_cards()]
+    for i, item in enumerate(items):
+        item.setPos(i * 250, i * 40)
+        item.setSelected(True)
+    return window, canvas_tab, items
+
+
+def test_group_moves_and_flips_as_one_item(qtbot):
+    _window, canvas_tab, items = _canvas_with_cards(qtbot)
+    before = [item.scenePos() for item in items]
+
+    canvas_tab.on_group_cards()
+    (stack,) = canvas_tab.selected_card_items()
+    assert isinstance(stack, CardStack)
+    assert list(canvas_tab.spatial_index.items()) == [stack]
+
+    canvas_tab.begin_card_drag()
+    stack.setPos(stack.pos() + QPointF(100, 0))
+    canvas_tab.end_card_drag()
+    assert [item.scenePos() for item in items] == [pos + QPointF(100, 0) for pos in before]
+
+    # Flipping the stack turns the whole layout, not each card in place
+    canvas_tab.on_flip_card()
+    canvas_tab.on_ungroup_cards()
+    assert stack.scene() is None
+    assert all(item.base_rotation == 180 for item in items)
+    assert items[0].pos().x() > items[1].pos().x()
+
+    # Ungroup, flip, move and group each undo in one step
+    for _ in range(4):
+        canvas_tab.on_undo()
+    assert [item.pos() for item in items] == before
+    assert all(item.base_rotation == 0 for item in items)
+
+    qtbot.wait(1100)
+
+
+def test_collapsed_stack_takes_cards_off_the_scene(qtbot):
+    _window, canvas_tab, items = _canvas_with_cards(qtbot)
+    before = [item.pos() for item in items]
+
+    canvas_tab.on_stack_cards()
+    (stack,) = canvas_tab.selected_card_items()
+    assert stack.collapsed
+    assert all(item.scene() is None for item in items)
+    assert len(canvas_tab.spatial_index) == 1
+    # The pile sits where the top card was
+    top = stack.cards[-1]
+    assert stack.sceneBoundingRect().contains(
+        before[items.index(top)] + top.boundingRect().center()
+    )
+
+    stack.set_collapsed(False)
+    assert all(item.parentItem() is stack for item in items)
+    assert [stack.mapToScene(item.pos()) for item in items] == before
+
+    canvas_tab.on_undo()
+    assert all(item.scene() is canvas_tab.scene for item in items)
+    assert [item.pos() for item in items] == before
+
+    qtbot.wait(1100)
+
+
+def test_find_follows_cards_into_and_out_of_stacks(qtbot):
+    _window, canvas_tab, items = _canvas_with_cards(qtbot)
+    fool, magician = items
+
+    assert canvas_tab.find_cards("fo") == [(fool, fool)]
+    assert canvas_tab.find_cards("the") == [(fool, fool), (magician, magician)]
+
+    canvas_tab.on_stack_cards()
+    (stack,) = canvas_tab.selected_card_items()
+    assert canvas_tab.find_cards("magic") == [(magician, stack)]
+
+    stack.set_collapsed(False)
+    assert canvas_tab.find_cards("magic") == [(magician, magician)]
+
+    canvas_tab.on_delete_card()
+    assert canvas_tab.find_cards("the") == []
+    canvas_tab.on_undo()
+    assert canvas_tab.find_cards("the fool") == [(fool, fool)]
+
+    canvas_tab.highlight_cards([stack])
+    assert canvas_tab._search_highlight.scene() is canvas_tab.scene
+
+    qtbot.wait(1100)
+
+
+def test_cards_released_on_a_locked_layer_stay_locked(qtbot):
+    _window, canvas_tab, items = _canvas_with_cards(qtbot)
+    canvas_tab.on_group_cards()
+    background = canvas_tab.layers.active
+    canvas_tab.layers.add_layer("Reading")
+    canvas_tab.layers.set_locked(background, True)
+
+    # Undoing the group breaks the stack up on the locked layer
+    canvas_tab.on_undo()
+    assert all(canvas_tab.layers.is_locked(item) for item in items)
+    assert not any(item.rotation_anim or item.isSelected() for item in items)
+    assert not any(item.flags() & QGraphicsItem.GraphicsItemFlag.ItemIsMovable for item in items)
+
+    qtbot.wait(1100)
@@ -0,0 +1,119 @@
+from PyQt6.QtCore import QPointF, QSettings
+
+from tarot_canvas.ui.canvas import DraggableCardItem
+from tarot_canvas.ui.main_window import MainWindow
+
+
+def _card_items(canvas_tab):
+    return [item for item in canvas_tab.scene.items() if isinstance(item, DraggableCardItem)]
+
+
+def _new_canvas(qtbot):
+    # Callers must keep the window: collecting it deletes the canvas mid-test
+    window = MainWindow()
+    qtbot.addWidget(window)
+    return window, window.new_canvas_tab()
+
+
+def test_layout_change_is_one_undo_step(qtbot):
+    _window, canvas_tab = _new_canvas(qtbot)
+    cards = canvas_tab.deck.get_all_cards()
+    items = [canvas_tab.add_specific_card(card) for card in cards]
+    for i, item in enumerate(items):
+        item.setPos(i * 50, i * 30)
+    before = [item.pos() for item in items]
+    steps = canvas_tab.undo_stack.count()
+
+    canvas_tab.push_layout_change(
+        "Align", items, lambda items: [item.setPos(0, 0) for item in items]
+    )
+    assert canvas_tab.undo_stack.count() == steps + 1
+    assert all(item.pos() == QPointF(0, 0) for item in items)
+
+    canvas_tab.on_undo()
+    assert [item.pos() for item in items] == before
+
+    qtbot.wait(1100)
+
+
+def test_consecutive_drags_merge(qtbot):
+    _window, canvas_tab = _new_canvas(qtbot)
+    item = canvas_tab.add_specific_card(canvas_tab.deck.get_all_cards()[0])
+    start = item.pos()
+    steps = canvas_tab.undo_stack.count()
+
+    for offset in (10, 20, 30):
+        canvas_tab.begin_card_drag()
+        item.setPos(start + QPointF(offset, 0))
+        canvas_tab.end_card_drag()
+
+    assert canvas_tab.undo_stack.count() == steps + 1
+    canvas_tab.on_undo()
+    assert item.pos() == start
+
+    qtbot.wait(1100)
+
+
+def test_flip_and_delete_are_undoable(qtbot):
+    _window, canvas_tab = _new_canvas(qtbot)
+    card = canvas_tab.deck.get_all_cards()[0]
+    item = canvas_tab.add_specific_card(card)
+    QSettings("ArcanaLand", "TarotCanvas").setValue("appearance/animation_intensity", 100)
+
+    canvas_tab.on_flip_card()
+    assert item.base_rotation == 180
+    assert item.card_data["reversed"]
+    # The restarted wobble keeps the configured intensity
+    assert item.rotation_anim.animationAt(0).endValue() == 180 + 1.6
+    # The deck's own card is left as it was
+    assert not card.get("reversed")
+
+    canvas_tab.on_delete_card()
+    assert item not in _card_items(canvas_tab)
+
+    canvas_tab.on_undo()
+    assert item in _card_items(canvas_tab)
+
+    canvas_tab.on_undo()
+    assert item.base_rotation == 0
+    assert not item.card_data["reversed"]
+
+    qtbot.wait(1100)
+
+
+def test_turning_a_duplicate_leaves_the_original_upright(qtbot):
+    _window, canvas_tab = _new_canvas(qtbot)
+    item = canvas_tab.add_specific_card(canvas_tab.deck.get_all_cards()[0])
+    item.setSelected(True)
+    canvas_tab.on_duplicate_card()
+    (copy,) = (other for other in _card_items(canvas_tab) if other is not item)
+
+    item.setSelected(False)
+    copy.setSelected(True)
+    canvas_tab.on_flip_card()
+    assert copy.card_data["reversed"]
+    assert not item.card_data["reversed"]
+
+    qtbot.wait(1100)
+
+
+def test_deal_entire_deck_is_one_undo_step(qtbot):
+    _window, canvas_tab = _new_canvas(qtbot)
+    steps = canvas_tab.undo_stack.count()
+
+    items = canvas_tab.deal_cards(layout="fan")
+    names = [item.card_data["name"] for item in items]
+
+    assert len(items) == len(canvas_tab.deck.get_all_cards())
+    assert len(set(names)) == len(names)
+    assert canvas_tab.undo_stack.count() == steps + 1
+    # Cards showing the same image share one decoded pixmap
+    assert (
+        items[0].pixmap().cacheKey()
+        == canvas_tab.create_card_item(items[0].card_data).pixmap().cacheKey()
+    )
+
+    canvas_tab.on_undo()
+    assert not _card_items(canvas_tab)
+
+    qtbot.wait(1100)
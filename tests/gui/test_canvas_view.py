@@ -0,0 +1,148 @@
+import json
+
+from PyQt6.QtCore import QPoint, QPointF, QSettings, Qt
+from PyQt6.QtGui import QWheelEvent
+
+from tarot_canvas.ui.canvas import DraggableCardItem
+from tarot_canvas.ui.canvas.view import WHEEL_ZOOM_FACTOR
+from tarot_canvas.ui.main_window import MainWindow
+
+
+def _wheel(position, angle, pixels=None):
+    return QWheelEvent(
+        QPointF(position),
+        QPointF(position),
+        pixels or QPoint(),
+        angle,
+        Qt.MouseButton.NoButton,
+        Qt.KeyboardModifier.NoModifier,
+        Qt.ScrollPhase.NoScrollPhase,
+        False,
+    )
+
+
+def test_wheel_bursts_zoom_once_per_frame_under_the_cursor(qtbot, monkeypatch):
+    window = MainWindow()
+    qtbot.addWidget(window)
+    canvas_tab = window.new_canvas_tab()
+    window.show()
+    qtbot.waitExposed(window)
+    view = canvas_tab.view
+    view.scene().setSceneRect(-5000, -5000, 10000, 10000)
+
+    zooms = []
+    original_zoom = view.zoom
+    monkeypatch.setattr(view, "zoom", lambda factor: zooms.append(factor) or original_zoom(factor))
+
+    cursor = QPoint(view.viewport().width() // 4, view.viewport().height() // 4)
+    under_cursor = view.mapToScene(cursor)
+    # A high-resolution wheel sends many small steps adding up to two notches
+    for _ in range(16):
+        view.wheelEvent(_wheel(cursor, angle=QPoint(0, 15)))
+    qtbot.waitUntil(lambda: not view._frame_timer.isActive())
+
+    assert len(zooms) == 1
+    assert abs(view.transform().m11() - WHEEL_ZOOM_FACTOR**2) < 1e-9
+    drift = view.mapFromScene(under_cursor) - cursor
+    assert abs(drift.x()) <= 1 and abs(drift.y()) <= 1
+
+    # Trackpad scrolling pans instead
+    scroll = view.horizontalScrollBar().value()
+    view.wheelEvent(_wheel(cursor, angle=QPoint(30, 0), pixels=QPoint(30, 0)))
+    qtbot.waitUntil(lambda: not view._frame_timer.isActive())
+    assert view.horizontalScrollBar().value() == scroll - 30
+    assert len(zooms) == 1
+
+    qtbot.wait(1100)
+
+
+def test_locked_layer_is_painted_from_its_cache_while_dragging(qtbot):
+    window = MainWindow()
+    qtbot.addWidget(window)
+    canvas_tab = window.new_canvas_tab()
+    window.show()
+    qtbot.waitExposed(window)
+    view = canvas_tab.view
+    card = canvas_tab.deck.get_all_cards()[0]
+
+    # A static layout of cards underneath the view
+    static = []
+    for i in range(100):
+        item = canvas_tab.create_card_item(card, autostart=False)
+        item.setPos((i % 10) * 40 - 200, (i // 10) * 60 - 300)
+        canvas_tab.scene.addItem(item)
+        static.append(item)
+    background = canvas_tab.layers.active
+    canvas_tab.layers.add_layer("Reading")
+    canvas_tab.layers.set_locked(background, True)
+    assert canvas_tab.layers.is_cached(background)
+    assert not any(item.isVisible() or item.isSelected() for item in static)
+
+    live = canvas_tab.add_specific_card(card)
+    assert canvas_tab.layers.layer_of(live) is canvas_tab.layers.active
+    qtbot.waitUntil(lambda: background.cache is not None)
+
+    view.set_diagnostics_visible(True)
+    painted = DraggableCardItem.paint_count
+    for _ in range(10):
+        live.setPos(live.pos() + QPointF(15, 10))
+        view.viewport().repaint()
+    assert 10 <= DraggableCardItem.paint_count - painted <= 20
+    view.set_diagnostics_visible(False)
+
+    # Moving a locked card, as an undo would, redraws the layer
+    static[0].setPos(static[0].pos() + QPointF(5, 5))
+    assert background.cache is None
+
+    # Unlocked cards wobble again, as much as the user chose
+    QSettings("ArcanaLand", "TarotCanvas").setValue("appearance/animation_intensity", 100)
+    canvas_tab.layers.set_locked(background, False)
+    assert all(item.isVisible() for item in static)
+    assert static[0].rotation_anim.animationAt(0).endValue() == 1.6
+
+    qtbot.wait(1100)
+
+
+def test_cards_on_a_hidden_layer_are_not_snapped_to_or_found(qtbot):
+    window = MainWindow()
+    qtbot.addWidget(window)
+    canvas_tab = window.new_canvas_tab()
+    card = canvas_tab.deck.get_all_cards()[0]
+    hidden = canvas_tab.add_specific_card(card)
+    hidden.setPos(0, 0)
+    background = canvas_tab.layers.active
+    canvas_tab.layers.add_layer("Reading")
+    canvas_tab.layers.set_visible(background, False)
+
+    dragged = canvas_tab.add_specific_card(card)
+    canvas_tab.snap_to_edges, canvas_tab.snap_to_grid = True, False
+    beside = QPointF(hidden.boundingRect().width() + 3, 0)
+    assert canvas_tab.snap_card_position(dragged, beside) == beside
+    assert not canvas_tab.card_items_at(hidden.sceneBoundingRect().center())
+    assert [item for _, item in canvas_tab.find_cards(card["name"])] == [dragged]
+
+    # Shown again, the layer's cards are snapped to as before
+    canvas_tab.layers.set_visible(background, True)
+    assert canvas_tab.snap_card_position(dragged, beside) == QPointF(beside.x() - 3, 0)
+    assert len(canvas_tab.find_cards(card["name"])) == 2
+
+    qtbot.wait(1100)
+
+
+def test_trace_records_counters_with_the_overlay_hidden(qtbot, tmp_path):
+    window = MainWindow()
+    qtbot.addWidget(window)
+    canvas_tab = window.new_canvas_tab()
+    canvas_tab.add_specific_card(canvas_tab.deck.get_all_cards()[0])
+    overlay = canvas_tab.view.diagnostics_overlay
+    assert not overlay.isVisible()
+
+    overlay.start_recording()
+    qtbot.wait(600)
+    overlay.stop_recording(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    counters = [event["args"] for event in events if event["ph"] == "C"]
+    assert len(counters) >= 2
+    assert counters[-1]["cards"] == 1
+
+    qtbot.wait(1100)
@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import QTabWidget
 
 from tarot_canvas.ui.main_window import MainWindow
+from tarot_canvas.utils.image_cache import ImageCache
 
 
 def test_main_window_opens_with_welcome_tab(qtbot):
@@ -13,3 +14,30 @@ def test_main_window_opens_with_welcome_tab(qtbot):
     assert tab_widget is not None
     assert tab_widget.count() >= 1
     assert tab_widget.tabText(0) == "Welcome"
+
+
+def test_canvas_tabs_share_card_images_and_background(qtbot):
+    window = MainWindow()
+    qtbot.addWidget(window)
+    image_cache = ImageCache.get_instance()
+
+    tabs = []
+    for _ in range(3):
+        canvas_tab = window.new_canvas_tab()
+        for card in canvas_tab.deck.get_all_cards() * 3:
+            canvas_tab.add_specific_card(card)
+        tabs.append(canvas_tab)
+        if len(tabs) == 1:
+            cached = image_cache.size_in_bytes()
+
+    # Later canvases reuse the images the first one decoded
+    assert image_cache.size_in_bytes() == cached
+    usages = [canvas_tab.memory_usage() for canvas_tab in tabs]
+    assert all(usage == usages[0] for usage in usages)
+    assert usages[0]["cards"] == 3 * len(tabs[0].deck.get_all_cards())
+    assert 0 < usages[0]["shared_bytes"] <= cached
+
+    brushes = {canvas_tab.view.backgroundBrush().texture().cacheKey() for canvas_tab in tabs}
+    assert len(brushes) == 1
+
+    qtbot.wait(1100)
@@ -0,0 +1,54 @@
+from PyQt6.QtGui import QTextCursor
+
+from tarot_canvas.ui.tabs.card_view.markdown_editor import IN_CODE, MarkdownEditor
+
+
+def test_links_are_found_and_completed_on_the_cursor_line(qtbot):
+    editor = MarkdownEditor()
+    qtbot.addWidget(editor)
+    # An earlier, unclosed [[ on another line must not count as the link being typed
+    editor.setPlainText("Unclosed [[ here\n" + "filler line\n" * 5000 + "See [[card:The F")
+    editor.moveCursor(QTextCursor.MoveOperation.End)
+
+    editor.insert_completion("card:The Fool")
+    assert editor.document().lastBlock().text() == "See [[card:The Fool]]"
+
+    clicked = []
+    editor.linkClicked.connect(clicked.append)
+    cursor = editor.textCursor()
+    cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock)
+    cursor.movePosition(QTextCursor.MoveOperation.Right, n=8)
+    assert editor.check_link_at_cursor(cursor)
+    assert clicked == ["card:The Fool"]
+
+    # Outside any link on its own line
+    cursor.movePosition(QTextCursor.MoveOperation.Start)
+    cursor.movePosition(QTextCursor.MoveOperation.Down)
+    assert not editor.check_link_at_cursor(cursor)
+
+
+def test_fenced_code_and_front_matter_span_lines(qtbot):
+    editor = MarkdownEditor()
+    qtbot.addWidget(editor)
+    document, highlighter = editor.document(), editor.highlighter
+    editor.setPlainText("---\ntags: fool\n---\n```\n# not a header\n```\n# Header **bold**")
+
+    def formats(line):
+        block = document.findBlockByNumber(line)
+        return [(r.start, r.length, r.format) for r in block.layout().formats()]
+
+    front_matter = highlighter.formats["front_matter"]
+    assert all(fmt == front_matter for line in range(3) for _, _, fmt in formats(line))
+    assert formats(4) == [(0, 14, highlighter.formats["code"])]
+    assert document.findBlockByNumber(4).userState() == IN_CODE
+
+    # Inline tokens on a header keep the header's look
+    header = formats(6)
+    assert header[0][2] == highlighter.formats["header"]
+    assert header[-1][2] == highlighter.token_format("header", "bold")
+    assert header[-1][2].foreground() == highlighter.formats["header"].foreground()
+
+    # Closing the fence elsewhere re-highlights the lines after it
+    cursor = QTextCursor(document.findBlockByNumber(5))
+    cursor.insertText("text ")
+    assert document.findBlockByNumber(6).userState() == IN_CODE
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from PyQt6.QtCore import QSettings
+from PyQt6.QtWidgets import QInputDialog, QMessageBox
+
+from tarot_canvas.models.link_completion import LinkCompletionIndex
+from tarot_canvas.models.notes_store import NotesStore
+from tarot_canvas.ui.tabs.card_view.notes_tab import NotesTab
+
+
+def test_notes_tab_keeps_notes_in_the_database_when_chosen(qtbot, tmp_path, monkeypatch):
+    QSettings("ArcanaLand", "TarotCanvas").setValue("notes/storage", "Notes Database")
+    store = NotesStore(tmp_path / "notes.sqlite3")
+    monkeypatch.setattr(NotesStore, "_instance", store)
+    monkeypatch.setattr(LinkCompletionIndex, "_database_instance", None)
+    names = iter(["Moon Walk", "Tides", "Night Walk"])
+    monkeypatch.setattr(QInputDialog, "getText", lambda *args, **kwargs: (next(names), True))
+    monkeypatch.setattr(
+        QMessageBox, "question", lambda *args, **kwargs: QMessageBox.StandardButton.Yes
+    )
+
+    tab = NotesTab()
+    qtbot.addWidget(tab)
+    tab.load_card_notes({"id": "major_arcana.18", "name": "The Moon"})
+    assert tab.store is store
+
+    tab.create_new_note()
+    walk = tab.current_file_path
+    tab.note_editor.setPlainText("# Moon Walk\n\nSilver light on the water")
+    tab.save_current_note()
+    tab.create_new_note()
+    tab.note_editor.setPlainText("Pulled by [[Moon Walk]]")
+    tab.save_current_note()
+    assert len(store) == 2
+    assert tab.notes_list_widget.count() == 2
+    assert tab.link_completions("moon") == ["Moon Walk"]
+
+    # Searched, opened and linked through the database
+    tab.notes_list_widget.search_box.setText("silver")
+    assert tab.notes_list_widget.proxy.rowCount() == 1
+    tab.notes_list_widget.search_box.clear()
+    assert tab.open_note("Moon Walk")
+    assert tab.current_file_path == walk
+    assert tab.note_editor.toPlainText().startswith("# Moon Walk")
+    assert tab.note_backlinks.links_list.count() == 1
+
+    # Renaming updates the row, and the note keeps its place in the list
+    tab.notes_list_widget.select_note(walk)
+    tab.rename_current_note()
+    assert tab.note_name(walk) == "Night Walk"
+    assert store.find("Night Walk")["card_id"] == "major_arcana.18"
+
+    tab.delete_current_note()
+    assert len(store) == 1
+    assert not tab.notes_list_widget.contains(walk)
+    # Nothing was written as a markdown file
+    assert not list(Path(tab.notes_index.base_dir).rglob("*.md"))
+    store.close()
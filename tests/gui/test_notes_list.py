@@ -0,0 +1,40 @@
+import time
+
+from tarot_canvas.models.notes_index import NoteEntry
+from tarot_canvas.ui.tabs.card_view.notes_list import NotesListWidget
+
+
+def test_notes_list_filters_sorts_and_selects_through_its_model(qtbot):
+    widget = NotesListWidget()
+    qtbot.addWidget(widget)
+    now = time.time()
+    notes = [
+        NoteEntry("major_arcana.00", f"/notes/{i}_Entry_{i}.md", f"Entry {i}", now - i * 86400)
+        for i in range(5000)
+    ]
+    widget.content_search = lambda text: {"/notes/4000_Entry_4000.md"} if text == "dream" else set()
+    widget.set_notes(notes)
+    assert widget.proxy.rowCount() == 5000
+    # Newest first
+    assert widget.proxy.index(0, 0).data() == "Entry 0"
+
+    widget.search_box.setText("entry 12")
+    assert widget.proxy.rowCount() == 111  # 12, 120-129 and 1200-1299
+    widget.date_filter.setCurrentIndex(1)  # Past week
+    assert widget.proxy.rowCount() == 0
+
+    # Selecting a hidden note clears the filters that hide it
+    assert widget.select_note("/notes/1234_Entry_1234.md")
+    assert widget.current_note() == "/notes/1234_Entry_1234.md"
+    assert widget.proxy.rowCount() == 5000
+
+    # Notes whose text matches are listed along with title matches
+    widget.search_box.setText("dream")
+    assert widget.proxy.rowCount() == 1
+
+    widget.search_box.clear()
+    widget.sort_order.setCurrentIndex(2)  # Title
+    assert widget.proxy.index(0, 0).data() == "Entry 0"
+    assert widget.proxy.index(1, 0).data() == "Entry 1"
+    widget.remove_note("/notes/0_Entry_0.md")
+    assert widget.count() == 4999
@@ -0,0 +1,48 @@
+import random
+from array import array
+
+from tarot_canvas.ui.canvas.auto_arrange import RECT_STRIDE, pack_rects, remove_overlaps
+
+
+def _overlapping_pairs(rects, lefts, tops):
+    count = len(lefts)
+    pairs = 0
+    for a in range(count):
+        for b in range(a + 1, count):
+            wa, ha = rects[a * RECT_STRIDE + 2], rects[a * RECT_STRIDE + 3]
+            wb, hb = rects[b * RECT_STRIDE + 2], rects[b * RECT_STRIDE + 3]
+            if (
+                lefts[a] < lefts[b] + wb - 0.01
+                and lefts[b] < lefts[a] + wa - 0.01
+                and tops[a] < tops[b] + hb - 0.01
+                and tops[b] < tops[a] + ha - 0.01
+            ):
+                pairs += 1
+    return pairs
+
+
+def test_packing_never_overlaps_mixed_orientations():
+    rng = random.Random(3)
+    rects = array("d")
+    for _ in range(60):
+        w, h = (300, 500) if rng.random() < 0.7 else (500, 300)
+        rects.extend((rng.uniform(-2000, 2000), rng.uniform(-2000, 2000), w, h))
+    order = list(range(60))
+
+    for skyline in (False, True):
+        lefts, tops = pack_rects(rects, order, skyline=skyline)
+        assert _overlapping_pairs(rects, lefts, tops) == 0
+
+
+def test_declutter_separates_piles_and_keeps_order():
+    rects = array("d")
+    # A row of overlapping cards, plus a pile dropped on one spot
+    for i in range(10):
+        rects.extend((i * 100, 0, 300, 500))
+    for _ in range(10):
+        rects.extend((3000, 3000, 300, 500))
+
+    lefts, tops = remove_overlaps(rects)
+
+    assert _overlapping_pairs(rects, lefts, tops) == 0
+    assert list(lefts[:10]) == sorted(lefts[:10])
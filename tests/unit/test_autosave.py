@@ -0,0 +1,37 @@
+import time
+
+from PyQt6.QtGui import QTextCursor, QTextDocument
+
+from tarot_canvas.ui.tabs.card_view.autosave import AutosaveCoordinator
+
+
+def test_documents_are_saved_after_a_pause_or_the_maximum_delay(qtbot):
+    autosave = AutosaveCoordinator(idle_ms=100, max_delay_ms=400)
+    document = QTextDocument()
+    saves = []
+
+    def save():
+        saves.append(document.toPlainText())
+        document.setModified(False)
+
+    autosave.watch(document, save)
+    assert not autosave.is_active()
+
+    # Typing without a pause is still saved once the maximum delay is reached
+    start = time.monotonic()
+    while time.monotonic() - start < 0.6:
+        QTextCursor(document).insertText("a")
+        qtbot.wait(30)
+    assert saves
+
+    # Then a pause saves the rest, after which nothing is waiting
+    qtbot.waitUntil(lambda: not autosave.is_active())
+    assert saves[-1] == document.toPlainText()
+    assert not document.isModified()
+
+    # Changes that were saved some other way are not saved again
+    QTextCursor(document).insertText("b")
+    document.setModified(False)
+    count = len(saves)
+    qtbot.waitUntil(lambda: not autosave.is_active())
+    assert len(saves) == count
@@ -0,0 +1,37 @@
+import json
+
+from tarot_canvas.models.draw_pile import DrawPile, simulate_draws
+
+
+def test_seeded_piles_draw_every_card_once_in_the_same_order(minimal_deck):
+    first = DrawPile(minimal_deck, seed=7)
+    second = DrawPile(minimal_deck, seed=7)
+    for pile in (first, second):
+        pile.riffle(3)
+        pile.cut()
+
+    draws = first.draw_many(10)
+
+    assert draws == second.draw_many(10)
+    assert sorted(card["id"] for card, _ in draws) == ["major_arcana.00", "major_arcana.01"]
+    assert first.draw() is None
+
+
+def test_saved_state_continues_identically(minimal_deck):
+    pile = DrawPile(minimal_deck, seed=3, reversal_probability=0.25)
+    pile.draw()
+
+    restored = DrawPile.from_dict(minimal_deck, json.loads(json.dumps(pile.to_dict())))
+
+    assert restored.remaining() == 1
+    assert restored.draw() == pile.draw()
+
+
+def test_simulation_counts_every_drawn_card():
+    appearances, reversals = simulate_draws(5, 1000, hand_size=3, seed=1)
+
+    assert sum(appearances) == 3000
+    assert all(
+        0 <= reversed_count <= count
+        for count, reversed_count in zip(appearances, reversals, strict=True)
+    )
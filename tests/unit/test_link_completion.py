@@ -0,0 +1,32 @@
+from tarot_canvas.models.link_completion import LinkCompletionIndex
+from tarot_canvas.models.notes_index import NotesIndex
+
+
+def test_completions_are_ranked_fuzzy_and_follow_the_notes(tmp_path):
+    card_dir = tmp_path / "notes" / "major_arcana.00"
+    card_dir.mkdir(parents=True)
+    (card_dir / "1_Fool_Journey.md").write_text("", encoding="utf-8")
+    (card_dir / "2_Morning_Reading.md").write_text("", encoding="utf-8")
+    notes = NotesIndex(tmp_path / "notes")
+    index = LinkCompletionIndex(notes)
+    index.set_cards(
+        [
+            {"id": "major_arcana.00", "name": "The Fool"},
+            {"id": "major_arcana.18", "name": "The Moon"},
+        ]
+    )
+    index.set_decks(["Rider Waite Smith"])
+
+    # Whole-text prefixes first, then word prefixes, shorter first
+    assert index.complete("fool") == ["Fool Journey", "card:The Fool"]
+    assert index.complete("card:the") == ["card:The Fool", "card:The Moon"]
+    assert index.complete("rider") == ["deck:Rider Waite Smith"]
+    # Cards are also found by id, and misspellings still find close matches
+    assert index.complete("major_arcana.18") == ["card:The Moon"]
+    assert index.complete("mornnig reading") == ["Morning Reading"]
+
+    # New note names are picked up from the notes index
+    notes.note_created("major_arcana.00", str(card_dir / "3_Fool_Again.md"))
+    assert index.complete("fool")[:2] == ["Fool Again", "Fool Journey"]
+    index.set_cards([])
+    assert "card:The Fool" not in index.complete("fool")
@@ -0,0 +1,96 @@
+import os
+
+from tarot_canvas.models.note_text_index import NoteTextIndex
+from tarot_canvas.models.notes_index import NotesIndex
+
+
+def _write_note(base, card_id, filename, text, mtime=100):
+    path = base / "notes" / card_id / filename
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_search_ranks_titles_and_follows_saves_renames_and_deletes(tmp_path):
+    moon = _write_note(tmp_path, "major_arcana.18", "1_Moon_Dream.md", "Fog over water.")
+    _write_note(tmp_path, "major_arcana.00", "2_Journey.md", "A dream about the moon at sea.")
+    notes = NotesIndex(tmp_path / "notes")
+    index = NoteTextIndex(notes, tmp_path / "index.sqlite3")
+
+    results = index.search("moon")
+    assert [result["title"] for result in results] == ["Moon Dream", "Journey"]
+    assert "<b>moon</b>" in results[1]["snippet"]
+    # Words match as prefixes, in any order, and odd punctuation is harmless
+    assert [result["title"] for result in index.search('sea" dre')] == ["Journey"]
+
+    with open(moon, "w", encoding="utf-8") as f:
+        f.write("Crayfish crawling out of the pool.")
+    index.note_saved(notes.note_saved(moon), "Crayfish crawling out of the pool.")
+    assert [result["title"] for result in index.search("crayfish")] == ["Moon Dream"]
+
+    renamed = moon.replace("Moon_Dream", "Pool")
+    os.rename(moon, renamed)
+    index.note_renamed(moon, notes.note_renamed(moon, renamed))
+    assert index.search("crayfish")[0]["file_path"] == renamed
+
+    os.remove(renamed)
+    notes.note_deleted(renamed)
+    index.note_deleted(renamed)
+    assert index.search("crayfish") == []
+    index.close()
+
+
+def test_reopened_index_only_reads_notes_changed_since(tmp_path):
+    first = _write_note(tmp_path, "major_arcana.01", "1_Tools.md", "wand cup sword coin")
+    _write_note(tmp_path, "major_arcana.02", "2_Veil.md", "scroll")
+    index = NoteTextIndex(NotesIndex(tmp_path / "notes"), tmp_path / "index.sqlite3")
+    assert len(index.search("wand")) == 1
+    index.close()
+
+    # Edited while the app was closed
+    with open(first, "w", encoding="utf-8") as f:
+        f.write("pentacle")
+    os.utime(first, (200, 200))
+
+    reopened = NoteTextIndex(NotesIndex(tmp_path / "notes"), tmp_path / "index.sqlite3")
+    assert reopened.search("wand") == []
+    assert len(reopened.search("pentacle")) == 1
+    assert len(reopened.search("scroll")) == 1
+    reopened.close()
+
+
+def test_links_are_indexed_by_target_and_follow_saves(tmp_path):
+    reading = _write_note(
+        tmp_path,
+        "major_arcana.00",
+        "1_Reading.md",
+        "Drew [[card:The Fool]] then [[card:the fool]] and [[card:The Moon]], see [[Dreams]].",
+    )
+    _write_note(tmp_path, "major_arcana.18", "2_Dreams.md", "Back to [[card:The Fool]].")
+    notes = NotesIndex(tmp_path / "notes")
+    index = NoteTextIndex(notes, tmp_path / "index.sqlite3")
+
+    assert [link["title"] for link in index.backlinks("card", "THE FOOL")] == ["Dreams", "Reading"]
+    assert [link["file_path"] for link in index.backlinks("note", "dreams")] == [reading]
+    assert index.most_referenced("card") == [("The Fool", 2), ("The Moon", 1)]
+
+    index.note_saved(notes.note_saved(reading), "Nothing linked any more.")
+    assert [link["title"] for link in index.backlinks("card", "The Fool")] == ["Dreams"]
+    assert index.backlinks("note", "Dreams") == []
+    index.close()
+
+
+def test_matching_paths_finds_every_match_of_one_card(tmp_path):
+    for i in range(80):
+        _write_note(tmp_path, "major_arcana.17", f"{i}_Star_{i}.md", f"hope number {i}")
+    _write_note(tmp_path, "major_arcana.18", "1_Moon.md", "hope in the dark")
+    index = NoteTextIndex(NotesIndex(tmp_path / "notes"), tmp_path / "index.sqlite3")
+
+    assert len(index.search("hope")) == 50
+    assert len(index.matching_paths("hope")) == 81
+    star_paths = index.matching_paths("hope", card_id="major_arcana.17")
+    assert len(star_paths) == 80
+    assert all("major_arcana.17" in path for path in star_paths)
+    assert index.matching_paths("") == set()
+    index.close()
@@ -0,0 +1,31 @@
+import os
+
+from tarot_canvas.utils.note_writer import NoteWriter
+
+
+def test_saves_are_coalesced_written_atomically_and_reported(qtbot, tmp_path):
+    writer = NoteWriter()
+    note = tmp_path / "notes" / "major_arcana.00" / "1_Journey.md"
+    written = []
+    writer.saved.connect(lambda path, text: written.append((path, text)))
+
+    # Saves queued before the writer gets to the file collapse into the last one
+    with writer._condition:
+        for text in ("a", "ab", "abc"):
+            writer.save(note, text)
+        assert writer.latest(note) == "abc"
+    assert writer.wait(note, timeout=5)
+    qtbot.waitUntil(lambda: len(written) == 1)
+    assert writer.flush(timeout=5)
+    assert written == [(str(note), "abc")]
+    assert note.read_text(encoding="utf-8") == "abc"
+    assert writer.latest(note) is None
+    assert os.listdir(note.parent) == [note.name]
+
+    # A failed write is reported and leaves nothing behind
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    with qtbot.waitSignal(writer.failed, timeout=5000) as failure:
+        writer.save(blocker / "note.md", "text")
+    assert failure.args[0] == str(blocker / "note.md")
+    assert writer.is_idle()
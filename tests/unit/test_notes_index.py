@@ -0,0 +1,44 @@
+import os
+
+from tarot_canvas.models.notes_index import NotesIndex
+
+
+def _write_note(base, card_id, filename, mtime):
+    path = base / card_id / filename
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"# {filename}\n", encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_index_lists_notes_newest_first_and_follows_changes(tmp_path, monkeypatch):
+    _write_note(tmp_path, "major_arcana.00", "100_Old_Reading.md", 100)
+    _write_note(tmp_path, "major_arcana.00", "300_New_Reading.md", 300)
+    middle = _write_note(tmp_path, "major_arcana.00", "200_Middle.md", 200)
+    _write_note(tmp_path, "major_arcana.01", "400_Magician.md", 400)
+    index = NotesIndex(tmp_path)
+
+    names = [note.name for note in index.notes_for_card("major_arcana.00")]
+    assert names == ["New Reading", "Middle", "Old Reading"]
+    assert index.find("Magician").card_id == "major_arcana.01"
+
+    # Once scanned, lookups never list a directory again
+    def no_scandir(path):
+        raise AssertionError(f"listed {path}")
+
+    monkeypatch.setattr(os, "scandir", no_scandir)
+
+    renamed = str(tmp_path / "major_arcana.00" / "200_Renamed.md")
+    os.rename(middle, renamed)
+    os.utime(renamed, (500, 500))
+    index.note_renamed(middle, renamed)
+    assert index.find("Middle") is None
+    assert index.notes_for_card("major_arcana.00")[0].name == "Renamed"
+
+    os.remove(renamed)
+    index.note_deleted(renamed)
+    assert [note.name for note in index.notes_for_card("major_arcana.00")] == [
+        "New Reading",
+        "Old Reading",
+    ]
+    assert len(index) == 3
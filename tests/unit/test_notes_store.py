@@ -0,0 +1,78 @@
+import os
+
+from tarot_canvas.models.notes_store import NotesStore
+
+
+def test_markdown_tree_round_trips_through_the_store(tmp_path):
+    tree = tmp_path / "notes"
+    (tree / "major_arcana.00").mkdir(parents=True)
+    (tree / "major_arcana.18").mkdir()
+    files = {
+        "major_arcana.00/1700000000_First_Steps.md": "# First\r\nWindows line endings\r\n",
+        "major_arcana.00/1700000100_Café.md": "Ünïcode, no trailing newline",
+        "major_arcana.18/untimed.md": "",
+    }
+    for name, text in files.items():
+        with open(tree / name, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        os.utime(tree / name, (1700000500, 1700000500))
+
+    store = NotesStore(tmp_path / "notes.sqlite3")
+    assert store.import_markdown(tree) == 3
+    # Importing again updates the same notes
+    assert store.import_markdown(tree) == 3
+    assert len(store) == 3
+
+    fool_notes = store.notes_for_card("major_arcana.00")
+    assert [note["title"] for note in fool_notes] == ["Café", "First Steps"]
+    assert store.find("first steps")["created"] == 1700000000
+    assert [note["title"] for note in store.search("windows")] == ["First Steps"]
+
+    exported = tmp_path / "exported"
+    assert store.export_markdown(exported) == 3
+    for name, text in files.items():
+        with open(exported / name, encoding="utf-8", newline="") as f:
+            assert f.read() == text
+        assert os.path.getmtime(exported / name) == 1700000500
+
+    # Renaming is a row update, and the export follows the new title
+    note_id = store.find("Café")["id"]
+    store.rename(note_id, "Morning Café")
+    store.save(note_id, "Edited")
+    assert store.find("Café") is None
+    assert store.note(note_id)["filename"] == "1700000100_Morning_Café.md"
+    assert [note["id"] for note in store.search("edited")] == [note_id]
+    store.delete(note_id)
+    assert store.search("edited") == []
+    store.close()
+
+
+def test_store_answers_list_queries_and_links_without_files(tmp_path):
+    store = NotesStore(tmp_path / "notes.sqlite3")
+    moon = store.create_note("major_arcana.18", "Moon", "Tides. See [[card:The Fool]].")
+    for i in range(60):
+        store.create_note("major_arcana.00", f"Step {i}", f"[[Moon]] tide {i}")
+    generation = store.generation
+
+    # Every match, for filtering a list, not just the best ones
+    assert len(store.search("tide")) == 50
+    assert len(store.matching_paths("tide", card_id="major_arcana.00")) == 60
+    assert store.find("moon", card_id="major_arcana.00") is None
+    assert store.find("moon")["file_path"] == f"notes-db:{moon}"
+    assert len(store.backlinks("note", "moon")) == 60
+    assert store.most_referenced("card") == [("The Fool", 1)]
+
+    store.save(moon, "No links now")
+    assert store.backlinks("card", "The Fool") == []
+    assert store.generation == generation
+    store.rename(moon, "Night")
+    assert "Night" in store.names()
+    assert store.generation == generation + 1
+    store.close()
+
+
+def test_importing_a_missing_notes_folder_finds_no_notes(tmp_path):
+    store = NotesStore(tmp_path / "notes.sqlite3")
+    assert store.import_markdown(tmp_path / "never-written") == 0
+    assert len(store) == 0
+    store.close()
@@ -0,0 +1,41 @@
+from PyQt6.QtCore import QPointF, QRectF
+
+from tarot_canvas.ui.canvas.spatial_index import SpatialGridIndex
+
+
+def test_query_follows_incremental_updates():
+    index = SpatialGridIndex(cell_size=100)
+    card = object()
+
+    index.insert(card, QRectF(0, 0, 50, 80))
+    assert index.query(QRectF(10, 10, 5, 5)) == {card}
+
+    index.update(card, QRectF(1000, 1000, 50, 80))
+    assert not index.query(QRectF(10, 10, 5, 5))
+    assert index.items_at(QPointF(1020, 1020)) == [card]
+
+    index.remove(card)
+    assert len(index) == 0
+    assert not index.query(QRectF(900, 900, 300, 300))
+
+
+def test_free_slot_avoids_existing_cards():
+    index = SpatialGridIndex(cell_size=100)
+    index.insert(object(), QRectF(-25, -40, 50, 80))
+
+    slot = QRectF(index.find_free_slot(50, 80, QPointF(0, 0)), QRectF(0, 0, 50, 80).size())
+
+    assert not index.query(slot)
+    assert slot.center() != QPointF(0, 0)
+
+
+def test_snap_prefers_neighbour_edges_over_grid():
+    index = SpatialGridIndex(cell_size=100)
+    neighbour = object()
+    index.insert(neighbour, QRectF(0, 0, 50, 80))
+
+    # Dragged card sits 3px right of the neighbour's right edge
+    dx, dy = index.snap_offset(QRectF(53, 7, 50, 80), threshold=8, grid_size=25)
+
+    assert dx == -3
+    assert dy == -7